@@ -0,0 +1,242 @@
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # If src code is moved, the path input must be changed here
+
+from Analytics import Analytics
+import Checkpoint
+import Config
+import Engine
+import Instrumentation
+import constants
+
+"""
+Benchmarks simulation throughput with fixed seeds and writes machine-readable (JSON) results that can be compared across commits.
+
+For each building size this times Building construction, each phase of the simulation loop (Engine.simulate_step) one step at a time,
+and whole runs of both Engines (Instrumentation records the phase times). All times are wall clock seconds, lower is better.
+
+Usage (from the repository root):
+python benchmarks/benchmark.py -o before.json
+python benchmarks/benchmark.py -o after.json --compare before.json
+python benchmarks/benchmark.py -p my_policies -a my_policy -o my_policy.json --compare before.json (my_policies registers my_policy with ElevatorAlgorithm.register_elevator_algorithm)
+
+    build(config, seed)
+    time_phases(checkpoint, num_steps)
+    time_engine(checkpoint, num_steps, engine)
+run_benchmark(name, seed, elevator_algorithm)
+compare_results(old_results, new_results, threshold)
+"""
+
+steps_per_day = int(constants.steps_per_day)
+steps_per_hour = int(constants.steps_per_hour)
+
+small_config = dict(Config.HERE_config,
+    floor_populations=[0, 3, 3, 3, 3],
+    dest_floors_by_state_name=dict(Config.HERE_config["dest_floors_by_state_name"], freetime=[0, 1, 2, 3, 4], study=[0]),
+    elevator_starting_floors=[0, 0],
+    elevator_capacities=[10, 10],
+    elevator_steps_per_loads=[2, 2],
+    elevator_return_to_floors=[0, 2],
+)
+
+large_config = dict(Config.HERE_config,
+    floor_populations=[0] + [2000] * 25, # 50,000 residents
+    dest_floors_by_state_name=dict(Config.HERE_config["dest_floors_by_state_name"], freetime=list(range(26))),
+    elevator_starting_floors=[0] * 8,
+    elevator_capacities=[10] * 8,
+    elevator_steps_per_loads=[2] * 8,
+    elevator_return_to_floors=[0, 0, 1, 4, 10, 15, 20, 25],
+)
+
+# Keys are benchmark names, values are the configuration and number of steps (from the start of the week) to simulate
+benchmarks = {
+    "small": {"config": small_config, "num_steps": steps_per_day},
+    "here": {"config": Config.HERE_config, "num_steps": 7 * steps_per_day}, # Persons' Schedules are weekly
+    "50k": {"config": large_config, "num_steps": 10 * steps_per_hour}, # Midnight to 10am covers the quiet night and the morning rush
+}
+
+# assign_stop runs within handle_new_button_presses
+phase_names = ["evaluate_simulation", "handle_state_changes_scheduled", "handle_new_button_presses", "assign_stop", "update_elevators", "increment_counters"]
+
+"""
+Builds the Building described by a configuration from a fixed seed.
+
+Returns:
+Tuple (Building class, float seconds taken)
+"""
+def build(config, seed):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()): # Silence debug prints
+        building = Config.build_building(config, seed)
+    return building, time.perf_counter() - start
+
+"""
+Runs the tick engine with instrumentation enabled, timing each phase of Engine.simulate_step separately.
+
+Takes:
+checkpoint - bytes object from Checkpoint.save_checkpoint of a freshly built Building (restoring is much faster than building again)
+
+Returns:
+Tuple (dictionary where keys are phase_names and values are float seconds spent in that phase, dictionary of Instrumentation event counts)
+"""
+def time_phases(checkpoint, num_steps):
+    building, analytics = Checkpoint.restore_checkpoint(checkpoint)
+    instrumentation = Instrumentation.enable_instrumentation(building)
+    with contextlib.redirect_stdout(io.StringIO()):
+        Engine.run_simulation(building, analytics, num_days=7, engine="tick", progress=False, stop_step=num_steps)
+    return {name: instrumentation.phase_seconds[name] for name in phase_names}, dict(instrumentation.event_counts)
+
+"""
+Takes:
+checkpoint - bytes object from Checkpoint.save_checkpoint of a freshly built Building (restoring is much faster than building again)
+
+Returns:
+Float seconds taken by Engine.run_simulation to simulate num_steps steps of the Building
+"""
+def time_engine(checkpoint, num_steps, engine):
+    building, analytics = Checkpoint.restore_checkpoint(checkpoint)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        Engine.run_simulation(building, analytics, num_days=7, engine=engine, progress=False, stop_step=num_steps)
+    return time.perf_counter() - start
+
+"""
+Runs one benchmark from benchmarks.
+
+Takes:
+elevator_algorithm - optional name of a registered ElevatorAlgorithm to use instead of the benchmark configuration's
+
+Returns:
+Dictionary of results, all times in seconds
+"""
+def run_benchmark(name, seed, elevator_algorithm=None):
+    config = benchmarks[name]["config"]
+    if elevator_algorithm is not None:
+        config = dict(config, elevator_algorithm=elevator_algorithm)
+    num_steps = benchmarks[name]["num_steps"]
+
+    building, construction_seconds = build(config, seed)
+    analytics = Analytics()
+    checkpoint = Checkpoint.save_checkpoint(building, analytics)
+
+    phase_seconds, event_counts = time_phases(checkpoint, num_steps)
+    loop_seconds = sum(seconds for name, seconds in phase_seconds.items() if name != "assign_stop")
+    tick_seconds = time_engine(checkpoint, num_steps, "tick")
+    event_seconds = time_engine(checkpoint, num_steps, "event")
+
+    return {
+        "population": building.population,
+        "num_floors": len(building.floors),
+        "num_elevators": len(building.elevators),
+        "num_steps": num_steps,
+        "seed": seed,
+        "elevator_algorithm": config["elevator_algorithm"],
+        "construction_seconds": construction_seconds,
+        "phase_seconds": phase_seconds,
+        "event_counts": event_counts,
+        "loop_seconds": loop_seconds,
+        "tick_engine_seconds": tick_seconds,
+        "event_engine_seconds": event_seconds,
+        "tick_steps_per_second": num_steps / tick_seconds,
+        "event_steps_per_second": num_steps / event_seconds,
+    }
+
+def get_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+"""
+Flattens a benchmark result into (metric name, seconds) pairs for comparison.
+"""
+def get_timings(result):
+    timings = {"construction_seconds": result["construction_seconds"], "loop_seconds": result["loop_seconds"],
+               "tick_engine_seconds": result["tick_engine_seconds"], "event_engine_seconds": result["event_engine_seconds"]}
+    for phase, seconds in result["phase_seconds"].items():
+        timings["phase_seconds." + phase] = seconds
+    return timings
+
+"""
+Compares two benchmark outputs and prints the ratio (new / old) of every timing present in both.
+
+Takes:
+old_results, new_results - dictionaries written by this script
+threshold - float fraction a timing may grow by before it counts as a regression
+min_seconds - float timings shorter than this (in both results) are too noisy to count as regressions
+
+Returns:
+List of strings "benchmark metric" that regressed
+"""
+def compare_results(old_results, new_results, threshold, min_seconds):
+    regressions = []
+    print("Comparing", new_results.get("commit"), "against", old_results.get("commit"))
+    for name, new_result in new_results["results"].items():
+        old_result = old_results["results"].get(name)
+        if old_result is None:
+            continue
+        if old_result["num_steps"] != new_result["num_steps"] or old_result["population"] != new_result["population"]:
+            print(name + ": benchmark definition changed, not comparable")
+            continue
+        old_timings = get_timings(old_result)
+        for metric, new_seconds in get_timings(new_result).items():
+            old_seconds = old_timings.get(metric)
+            if old_seconds is None or old_seconds == 0:
+                continue
+            ratio = new_seconds / old_seconds
+            flag = ""
+            if ratio > 1 + threshold and max(old_seconds, new_seconds) >= min_seconds:
+                flag = "  REGRESSION"
+                regressions.append(name + " " + metric)
+            print(name.ljust(6) + " " + metric.ljust(48) + " " + "{:10.4f}".format(old_seconds) + " -> " + "{:10.4f}".format(new_seconds) + "  x" + "{:.2f}".format(ratio) + flag)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark simulation throughput and write JSON results.")
+    parser.add_argument("-b", "--benchmarks", nargs="+", choices=list(benchmarks.keys()), default=list(benchmarks.keys()))
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=None, help="Path to write JSON results to (printed if not given)")
+    parser.add_argument("-c", "--compare", default=None, help="Path of earlier JSON results to compare against")
+    parser.add_argument("-t", "--threshold", type=float, default=0.25, help="Allowed slowdown before a timing counts as a regression when comparing")
+    parser.add_argument("-m", "--min-seconds", type=float, default=0.05, help="Timings shorter than this are too noisy to count as regressions when comparing")
+    parser.add_argument("-a", "--elevator-algorithm", default=None, help="Name of the ElevatorAlgorithm to benchmark instead of each benchmark's own")
+    parser.add_argument("-p", "--plugins", nargs="+", default=[], help="Modules to import first, e.g. ones that register more ElevatorAlgorithms")
+    args = parser.parse_args()
+
+    for plugin in args.plugins:
+        importlib.import_module(plugin)
+
+    results = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "results": {},
+    }
+    for name in args.benchmarks:
+        print("Running", name, "benchmark...", file=sys.stderr)
+        results["results"][name] = run_benchmark(name, args.seed, args.elevator_algorithm)
+
+    text = json.dumps(results, indent=4)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as file:
+            file.write(text)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            regressions = compare_results(json.load(file), results, args.threshold, args.min_seconds)
+        if len(regressions) != 0:
+            sys.exit(1)
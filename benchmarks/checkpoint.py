@@ -0,0 +1,83 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import pickle
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # If src code is moved, the path input must be changed here
+
+from Analytics import Analytics
+import Checkpoint
+import Engine
+
+from benchmark import benchmarks, build, get_commit, steps_per_day
+
+"""
+Compares Checkpoint.save_checkpoint and restore_checkpoint with pickling the same Building and Analytics (protocol 5), for the benchmark building sizes (see benchmark.py).
+Each Building is simulated until noon of the first day (or the end of its benchmark's steps, if sooner) so Persons are spread over Floor queues and Elevators.
+Times are wall clock seconds, the best of --repeat runs. Sizes are bytes.
+
+Usage (from the repository root):
+python benchmarks/checkpoint.py -o checkpoint.json
+
+    get_best_seconds(function, repeat)
+get_checkpoint_report(config, num_steps, seed, repeat)
+"""
+
+"""
+Returns:
+Tuple (fewest seconds a call of function took, what the last call returned)
+"""
+def get_best_seconds(function, repeat):
+    seconds = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds), result
+
+"""
+Returns:
+Dictionary with keys "population", "checkpoint" and "pickle", each of the last two a dictionary with keys "save_seconds", "restore_seconds", and "bytes"
+"""
+def get_checkpoint_report(config, num_steps, seed, repeat):
+    building = build(config, seed)[0]
+    analytics = Analytics()
+    with contextlib.redirect_stdout(io.StringIO()):
+        Engine.run_simulation(building, analytics, num_days=1, engine="event", progress=False, stop_step=min(num_steps, steps_per_day // 2))
+
+    save_seconds, data = get_best_seconds(lambda: Checkpoint.save_checkpoint(building, analytics), repeat)
+    restore_seconds = get_best_seconds(lambda: Checkpoint.restore_checkpoint(data), repeat)[0]
+    dump_seconds, pickled = get_best_seconds(lambda: pickle.dumps((building, analytics), protocol=5), repeat)
+    load_seconds = get_best_seconds(lambda: pickle.loads(pickled), repeat)[0]
+
+    return {
+        "population": building.population,
+        "checkpoint": {"save_seconds": save_seconds, "restore_seconds": restore_seconds, "bytes": len(data)},
+        "pickle": {"save_seconds": dump_seconds, "restore_seconds": load_seconds, "bytes": len(pickled)},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare checkpoint save, restore, and size with pickle for each benchmark building size.")
+    parser.add_argument("-b", "--benchmarks", nargs="+", default=list(benchmarks.keys()), choices=list(benchmarks.keys()))
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of times to save and restore (the fastest is reported)")
+    parser.add_argument("-o", "--output", default=None, help="Path to write JSON results to")
+    args = parser.parse_args()
+
+    results = {"commit": get_commit(), "seed": args.seed, "benchmarks": {}}
+    for name in args.benchmarks:
+        report = get_checkpoint_report(benchmarks[name]["config"], benchmarks[name]["num_steps"], args.seed, args.repeat)
+        results["benchmarks"][name] = report
+        print(name.ljust(8) + str(report["population"]).rjust(8) + " residents")
+        for method in ["checkpoint", "pickle"]:
+            stats = report[method]
+            print("    " + method.ljust(12) + "save" + "{:9.3f}".format(stats["save_seconds"]) + " s    restore" + "{:9.3f}".format(stats["restore_seconds"]) + " s" + "{:10.2f}".format(stats["bytes"] / 1e6) + " MB")
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4)
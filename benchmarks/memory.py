@@ -0,0 +1,95 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # If src code is moved, the path input must be changed here
+
+from Building import Building
+from RandomStreams import RandomStreams
+import Config
+
+from benchmark import benchmarks, get_commit
+
+"""
+Reports how much memory a Building's residents take, in bytes per resident, for the benchmark building sizes (see benchmark.py).
+Memory is measured with tracemalloc (Python objects and NumPy array data), so results are the same on any machine for a given commit and seed.
+
+"residents" counts the Floors and every Person on them (schedules, state change data, destination tables).
+"building" counts the whole Building, adding the state change calendar and Elevators.
+
+Usage (from the repository root):
+python benchmarks/memory.py -o memory.json
+
+    measure_bytes(function)
+get_memory_report(config, seed)
+"""
+
+"""
+Takes:
+function - function taking no arguments
+
+Returns:
+Tuple (return value of function, integer bytes allocated by function that are still allocated after it returns)
+"""
+def measure_bytes(function):
+    gc.collect()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()): # Silence debug prints
+        value = function()
+    gc.collect()
+    allocated_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, allocated_bytes
+
+"""
+Returns:
+Dictionary with keys "population", "residents_bytes_per_resident", and "building_bytes_per_resident"
+"""
+def get_memory_report(config, seed):
+    def generate_residents():
+        building = Building.__new__(Building)
+        building.floors = []
+        building.population = 0
+        building.generate_floors(config["floor_populations"], config["dest_floors_by_state_name"], config.get("use_batch_schedules", False),
+                                 rng=RandomStreams(seed).population)
+        return building
+
+    building, residents_bytes = measure_bytes(generate_residents)
+    population = building.population
+    del building
+
+    building, building_bytes = measure_bytes(lambda: Config.build_building(config, seed))
+    del building
+
+    return {
+        "population": population,
+        "residents_bytes_per_resident": residents_bytes / population,
+        "building_bytes_per_resident": building_bytes / population,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report memory used per resident for each benchmark building size.")
+    parser.add_argument("-b", "--benchmarks", nargs="+", default=list(benchmarks.keys()), choices=list(benchmarks.keys()))
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=None, help="Path to write JSON results to")
+    args = parser.parse_args()
+
+    # One-time allocations (e.g. caches NumPy fills on first use) would otherwise be counted against the first benchmark
+    get_memory_report(benchmarks["small"]["config"], args.seed)
+
+    results = {"commit": get_commit(), "seed": args.seed, "benchmarks": {}}
+    for name in args.benchmarks:
+        report = get_memory_report(benchmarks[name]["config"], args.seed)
+        results["benchmarks"][name] = report
+        print(name.ljust(8) + str(report["population"]).rjust(8) + " residents" + "{:10.0f}".format(report["residents_bytes_per_resident"]) + " bytes/resident (residents)"
+              + "{:10.0f}".format(report["building_bytes_per_resident"]) + " bytes/resident (building)")
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4)
@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # If src code is moved, the path input must be changed here
+
+import Config
+import DestinationDispatch
+import Instrumentation
+import Simulation
+import TripRecords
+import constants
+
+from benchmark import build, get_commit
+
+"""
+Measures how fast Elevators clear a class-change rush at the ground floor, with and without destination dispatch (see DestinationDispatch).
+A class lets out: the given number of residents (chosen at random from a seed) are all on the ground floor and head home at the same step. With --direction down they all head from home to the ground floor instead.
+Only the rush is simulated (no scheduled state changes), one step at a time until everyone has arrived.
+Throughput is residents delivered per hour of simulated time from the start of the rush until the last one arrives. Times are in simulated minutes.
+Elevators board no more than their capacity. load_factor is the average fraction of capacity in use as Elevators left their stops, left_behind the number of times a waiting resident didn't fit.
+
+Usage (from the repository root):
+python benchmarks/rush.py -n 200 -o rush.json
+
+run_rush(config, seed, num_people, direction, destination_dispatch)
+"""
+
+steps_per_hour = int(constants.steps_per_hour)
+
+rush_config = dict(Config.HERE_config,
+    floor_populations=[0] + [100] * 20, # 2,000 residents
+    dest_floors_by_state_name=dict(Config.HERE_config["dest_floors_by_state_name"], freetime=list(range(21))),
+    elevator_starting_floors=[0] * 4,
+    elevator_capacities=[10] * 4,
+    elevator_steps_per_loads=[2] * 4,
+    elevator_return_to_floors=[0] * 4,
+)
+
+"""
+Takes:
+config - configuration dictionary (see Config)
+seed - integer random seed of the Building and of the choice of residents in the rush
+num_people - integer number of residents in the rush
+direction - String "up" for residents going home from the ground floor, "down" for residents going from home to the ground floor
+destination_dispatch - boolean representing whether to enable destination dispatch
+
+Returns:
+Dictionary of the rush's results
+"""
+def run_rush(config, seed, num_people, direction, destination_dispatch):
+    building, construction_seconds = build(config, seed)
+    if destination_dispatch:
+        DestinationDispatch.enable_destination_dispatch(building)
+    instrumentation = Instrumentation.enable_instrumentation(building)
+
+    residents = [person for floor in building.floors[1:] for person in floor.people_on_floor]
+    rng = np.random.default_rng(seed)
+    people = [residents[i] for i in rng.choice(len(residents), num_people, replace=False).tolist()]
+
+    # Everyone starts waiting on the first step of the rush
+    for person in people:
+        building.floors[person.cur_floor].remove_person(person)
+        if direction == "up":
+            person.cur_floor = 0
+            person.dest_floor = person.home_floor
+            building.floors[0].add_person(person)
+            Simulation.state_change_going_up(building, 0, person)
+        else:
+            person.dest_floor = 0
+            building.floors[person.cur_floor].add_person(person)
+            Simulation.state_change_going_down(building, person.cur_floor, person)
+
+    while len(building.trip_records) < num_people:
+        Simulation.handle_new_button_presses(building)
+        Simulation.update_elevators(building)
+        Simulation.increment_counters(building, 0)
+        building.cur_step += 1
+
+    minutes_per_step = 60 / steps_per_hour
+    trips = building.trip_records.get_records()
+    wait_steps = trips[:, TripRecords.board_column] - trips[:, TripRecords.wait_start_column]
+    ride_steps = trips[:, TripRecords.arrival_column] - trips[:, TripRecords.board_column]
+    return {
+        "destination_dispatch": destination_dispatch,
+        "elevator_algorithm": building.elevator_algorithm.algorithm,
+        "rush_minutes": building.cur_step * minutes_per_step,
+        "trips_per_hour": num_people / (building.cur_step / steps_per_hour),
+        "avg_wait_minutes": float(np.mean(wait_steps)) * minutes_per_step,
+        "p95_wait_minutes": float(np.percentile(wait_steps, 95)) * minutes_per_step,
+        "avg_ride_minutes": float(np.mean(ride_steps)) * minutes_per_step,
+        "stops": instrumentation.event_counts["stops"],
+        "load_factor": float(np.mean([elevator.get_load_factor() for elevator in building.elevators])),
+        "left_behind": instrumentation.event_counts["left_behind"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure how fast Elevators clear a ground floor class-change rush, with and without destination dispatch.")
+    parser.add_argument("-n", "--num-people", type=int, default=200)
+    parser.add_argument("-d", "--direction", default="up", choices=["up", "down"])
+    parser.add_argument("-a", "--elevator-algorithm", default="stay_where_stopped", help="Name of a registered ElevatorAlgorithm")
+    parser.add_argument("-s", "--seeds", type=int, nargs="+", default=[0, 1, 2, 3])
+    parser.add_argument("-o", "--output", default=None, help="Path to write JSON results to")
+    args = parser.parse_args()
+
+    config = dict(rush_config, elevator_algorithm=args.elevator_algorithm)
+    results = {"commit": get_commit(), "num_people": args.num_people, "direction": args.direction, "runs": []}
+    for destination_dispatch in [False, True]:
+        runs = [run_rush(config, seed, args.num_people, args.direction, destination_dispatch) for seed in args.seeds]
+        results["runs"] += runs
+        names = ["rush_minutes", "trips_per_hour", "avg_wait_minutes", "p95_wait_minutes", "avg_ride_minutes", "stops", "load_factor", "left_behind"]
+        means = {name: float(np.mean([run[name] for run in runs])) for name in names}
+        print(("destination dispatch" if destination_dispatch else args.elevator_algorithm).ljust(22) + "  ".join(name + " " + "{:.2f}".format(means[name]) for name in names))
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4)
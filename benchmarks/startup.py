@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # If src code is moved, the path input must be changed here
+
+import Config
+
+from benchmark import benchmarks, build, get_commit
+
+"""
+Times Building construction (everything before the first simulation step) for the benchmark building sizes (see benchmark.py) and a 100,000 resident tower.
+Construction is timed on its own because the tower is too large to simulate in a routine benchmark run. Times are wall clock seconds, the best of --repeat runs.
+
+Usage (from the repository root):
+python benchmarks/startup.py -o startup.json
+
+get_startup_report(config, seed, repeat)
+"""
+
+tower_config = dict(Config.HERE_config,
+    floor_populations=[0] + [2500] * 40, # 100,000 residents
+    dest_floors_by_state_name=dict(Config.HERE_config["dest_floors_by_state_name"], freetime=list(range(41))),
+    elevator_starting_floors=[0] * 12,
+    elevator_capacities=[10] * 12,
+    elevator_steps_per_loads=[2] * 12,
+    elevator_return_to_floors=[0, 0, 1, 4, 8, 12, 16, 20, 24, 28, 32, 36],
+)
+
+# Keys are benchmark names, values are configurations
+startup_benchmarks = dict({name: benchmark["config"] for name, benchmark in benchmarks.items()}, tower=tower_config)
+
+"""
+Returns:
+Dictionary with keys "population", "construction_seconds", and "seconds_per_100k_residents"
+"""
+def get_startup_report(config, seed, repeat):
+    seconds = []
+    for i in range(repeat):
+        building, construction_seconds = build(config, seed)
+        population = building.population
+        del building
+        seconds.append(construction_seconds)
+
+    return {
+        "population": population,
+        "construction_seconds": min(seconds),
+        "seconds_per_100k_residents": min(seconds) / population * 100000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time Building construction for each benchmark building size.")
+    parser.add_argument("-b", "--benchmarks", nargs="+", default=list(startup_benchmarks.keys()), choices=list(startup_benchmarks.keys()))
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of times to build each Building (the fastest is reported)")
+    parser.add_argument("-o", "--output", default=None, help="Path to write JSON results to")
+    args = parser.parse_args()
+
+    results = {"commit": get_commit(), "seed": args.seed, "benchmarks": {}}
+    for name in args.benchmarks:
+        report = get_startup_report(startup_benchmarks[name], args.seed, args.repeat)
+        results["benchmarks"][name] = report
+        print(name.ljust(8) + str(report["population"]).rjust(8) + " residents" + "{:10.3f}".format(report["construction_seconds"]) + " s")
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4)
@@ -3,10 +3,18 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 import constants
+import TripRecords
 
 class Analytics:
     cur_day = 0
 
+    # Windows of steps (counted from the start of the simulation) that the next daily and hourly averages cover, they end at the Building's cur_step
+    daily_window_start = 0
+    hourly_window_start = 0
+    # Index of the first trip in a Building's trip_records that finished within each window
+    daily_first_trip = 0
+    hourly_first_trip = 0
+
     daily_avg_elevator_idle_steps = []
     daily_avg_elevator_active_steps = []
     daily_avg_elevator_loading_steps = []
@@ -80,45 +88,55 @@ class Analytics:
         return (((steps * constants.seconds_per_step) / 60) / 60) / 24
     
     """
-    Adds a Person's daily counters to the running sums to be averaged in the future, and reset counters to zero.
-    A Person's counters list is structured as so:
-    0 - daily steps waiting, 1 - hourly steps waiting, 2 - daily steps riding, 3 - hourly steps riding
+    Computes how many steps of the interval [start, end) fall within the window [window_start, window_end).
 
     Takes:
-    person - Person class
+    start, end - integer steps (counted from the start of the simulation) bounding the interval
+    window_start, window_end - integer steps bounding the window
     """
-    def handle_daily_person_counters(self, person):
-        self.daily_avg_person_waiting_steps[-1] += person.waiting_counters[0]
-        self.daily_avg_person_riding_steps[-1] += person.riding_counters[0]
-
-        person.waiting_counters[0] = 0
-        person.riding_counters[0] = 0
-
-        #self.daily_avg_person_waiting_steps[-1] += person.daily_steps_waiting
-        #self.daily_avg_person_riding_steps[-1] += person.daily_steps_riding
-        #person.daily_steps_waiting = 0
-        #person.daily_steps_riding = 0
+    def get_overlap_steps(self, start, end, window_start, window_end):
+        return max(0, min(end, window_end) - max(start, window_start))
 
     """
-    Adds a Person's hourly counters to the running sums to be averaged in the future, and reset counters to zero.
-    A Person's counters list is structured as so:
-    0 - daily steps waiting, 1 - hourly steps waiting, 2 - daily steps riding, 3 - hourly steps riding
+    Sums the steps all Persons spent waiting for and riding Elevators within a window of steps.
+    Waiting and riding time is recorded as the steps a Person starts waiting, boards, and gets off, so intervals crossing the window's edges are clipped to it.
+    Finished trips come from the Building's trip_records, and trips still in progress from the Persons currently waiting or riding.
 
     Takes:
-    person - Person class
+    building - Building class
+    window_start - integer step (counted from the start of the simulation) the window starts at
+    first_trip - integer index of the first trip in building.trip_records that may overlap the window (earlier trips finished before window_start)
+
+    Returns:
+    Tuple (total waiting steps, total riding steps). The window ends at building.cur_step.
+
+    Runs in O(T + W) time, where T is the number of trips finished since first_trip (vectorized) and W is the number of Persons currently traveling
     """
-    def handle_hourly_person_counters(self, person):
-        self.hourly_avg_person_waiting_steps[-1] += person.waiting_counters[1]
-        self.hourly_avg_person_riding_steps[-1] += person.riding_counters[1]
+    def sum_person_steps(self, building, window_start, first_trip):
+        window_end = building.cur_step
 
-        person.waiting_counters[1] = 0
-        person.riding_counters[1] = 0
+        # Finished trips
+        trips = building.trip_records.get_records(first_trip)
+        wait_start_steps = np.maximum(trips[:, TripRecords.wait_start_column], window_start)
+        board_steps = np.clip(trips[:, TripRecords.board_column], window_start, window_end)
+        arrival_steps = np.minimum(trips[:, TripRecords.arrival_column], window_end)
+        total_waiting = int(np.maximum(board_steps - wait_start_steps, 0).sum())
+        total_riding = int(np.maximum(arrival_steps - board_steps, 0).sum())
+
+        # Trips in progress
+        for floor in building.floors:
+            for person in floor.people_going_up:
+                total_waiting += self.get_overlap_steps(person.wait_start_step, window_end, window_start, window_end)
+            for person in floor.people_going_down:
+                total_waiting += self.get_overlap_steps(person.wait_start_step, window_end, window_start, window_end)
+
+        for elevator in building.elevators:
+            for person in elevator.manifest.get_all_passengers():
+                total_waiting += self.get_overlap_steps(person.wait_start_step, person.board_step, window_start, window_end)
+                total_riding += self.get_overlap_steps(person.board_step, window_end, window_start, window_end)
+
+        return total_waiting, total_riding
 
-        #self.hourly_avg_person_waiting_steps[-1] += person.hourly_steps_waiting
-        #self.hourly_avg_person_riding_steps[-1] += person.hourly_steps_riding
-        #person.hourly_steps_waiting = 0
-        #person.hourly_steps_riding = 0
-    
     """
     Adds an Elevator's daily counters to the running sums to be averaged in the future, and reset counters to zero.
     An Elevator's counters list is structured as so:
@@ -177,7 +195,7 @@ class Analytics:
     Computes all daily step averages for today and append the value to this class's lists.
     This function is called by evaluate_simulation when a day change is detected.
     This function sets other class's daily counters to 0 such that they start tracking data for this new day.
-    handle_daily_person_counters and handle_daily_elevator_counters sum values of counters which are then averaged at the end of this function.
+    sum_person_steps and handle_daily_elevator_counters sum steps and counters which are then averaged at the end of this function.
 
     Takes:
     building - Building class
@@ -191,25 +209,16 @@ class Analytics:
         self.daily_avg_person_riding_steps.append(0.0)
         self.daily_avg_person_waiting_steps.append(0.0)
 
-        # Sum all Person daily counters and reset them to 0 for next day. Need to check people on floor, waiting to travel, and currently riding
-        for floor in building.floors:
-            # People on floor
-            for person in floor.people_on_floor:
-                self.handle_daily_person_counters(person)
-            # People on floor going up
-            for person in floor.people_going_up:
-                self.handle_daily_person_counters(person)
-            # People on floor going down
-            for person in floor.people_going_down:
-                self.handle_daily_person_counters(person)
+        # Sum all Person waiting and riding steps since the last day change, then start the next day's window here
+        total_waiting, total_riding = self.sum_person_steps(building, self.daily_window_start, self.daily_first_trip)
+        self.daily_avg_person_waiting_steps[-1] += total_waiting
+        self.daily_avg_person_riding_steps[-1] += total_riding
+        self.daily_window_start = building.cur_step
+        self.daily_first_trip = len(building.trip_records)
+        building.trip_records.release(min(self.daily_first_trip, self.hourly_first_trip))
 
-        # Sum all Elevator daily counters and reset them to 0 for next day. Also handle the people that are riding.
+        # Sum all Elevator daily counters and reset them to 0 for next day
         for elevator in building.elevators:
-            # People riding on elevator
-            for key in elevator.people_by_destination.keys():
-                for person in elevator.people_by_destination[key]:
-                    self.handle_daily_person_counters(person)
-
             self.handle_daily_elevator_counters(elevator)
         
         # Divide by totals to get average steps
@@ -225,7 +234,7 @@ class Analytics:
     Computes all hourly averages for today and append the value to this class's lists.
     This function is called by evaluate_simulation when an hour change is detected.
     This function sets other class's hourly counters to 0 such that they start tracking data for this new hour.
-    handle_hourly_person_counters and handle_hourly_elevator_counters sum values of counters which are then averaged at the end of this function.
+    sum_person_steps and handle_hourly_elevator_counters sum steps and counters which are then averaged at the end of this function.
 
     Takes:
     building - Building class
@@ -239,27 +248,16 @@ class Analytics:
         self.hourly_avg_person_riding_steps.append(0.0)
         self.hourly_avg_person_waiting_steps.append(0.0)
 
-        # Sum all Person waiting and riding hourly counters, and reset them to 0 for next day. Need to check people on floor, waiting to travel, and currently riding
-        for floor in building.floors:
-            # People on floor
-            for person in floor.people_on_floor:
-                self.handle_hourly_person_counters(person)
-
-            # People going up on floor
-            for person in floor.people_going_up:
-                self.handle_hourly_person_counters(person)
+        # Sum all Person waiting and riding steps since the last hour change, then start the next hour's window here
+        total_waiting, total_riding = self.sum_person_steps(building, self.hourly_window_start, self.hourly_first_trip)
+        self.hourly_avg_person_waiting_steps[-1] += total_waiting
+        self.hourly_avg_person_riding_steps[-1] += total_riding
+        self.hourly_window_start = building.cur_step
+        self.hourly_first_trip = len(building.trip_records)
+        building.trip_records.release(min(self.daily_first_trip, self.hourly_first_trip))
 
-            # People going down on floor
-            for person in floor.people_going_down:
-                self.handle_hourly_person_counters(person)
-
-        # Sum all Elevator hourly counters and reset them to 0 for next day. Also handle the people that are riding.
+        # Sum all Elevator hourly counters and reset them to 0 for next hour
         for elevator in building.elevators:
-            # Sum all Person riding hourly counters on each Elevator, and reset them to 0 for next day
-            for key in elevator.people_by_destination.keys():
-                for person in elevator.people_by_destination[key]:
-                    self.handle_hourly_person_counters(person)
-
             self.handle_hourly_elevator_counters(elevator)
         
         # Divide by totals to get average steps
@@ -290,18 +288,62 @@ class Analytics:
         return
 
 
-    def print_defining_averages(self, building):
-        avg_hourly_person_wait_time_minutes = self.steps_to_minutes(np.sum(self.hourly_avg_person_waiting_steps) / len(self.hourly_avg_person_waiting_steps))
-        print("Avg Hourly Person Wait Time (minutes):", avg_hourly_person_wait_time_minutes)
+    """
+    Computes the averages that define how well a Building's Elevators served its residents.
+    compute_daily_step_averages and compute_hourly_step_averages should be called once more after the simulation finishes so the last day and hour are included.
 
-        avg_hourly_person_ride_time_minutes = self.steps_to_minutes(np.sum(self.hourly_avg_person_riding_steps) / len(self.hourly_avg_person_riding_steps))
-        print("Avg Hourly Person Ride Time (minutes)", avg_hourly_person_ride_time_minutes)
+    Takes:
+    building - Building class that was simulated
+
+    Returns:
+    Dictionary where keys are metric names (strings) and values are numbers. Trip metrics are only included if at least one trip finished.
+    """
+    def get_defining_averages(self, building):
+        averages = {
+            "Avg Hourly Person Wait Time (minutes)": float(self.steps_to_minutes(np.sum(self.hourly_avg_person_waiting_steps) / len(self.hourly_avg_person_waiting_steps))),
+            "Avg Hourly Person Ride Time (minutes)": float(self.steps_to_minutes(np.sum(self.hourly_avg_person_riding_steps) / len(self.hourly_avg_person_riding_steps))),
+            "Avg Daily Person Wait Time (hours)": float(self.steps_to_hours(np.sum(self.daily_avg_person_waiting_steps) / len(self.daily_avg_person_waiting_steps))),
+            "Avg Daily Person Ride Time (hours)": float(self.steps_to_hours(np.sum(self.daily_avg_person_riding_steps) / len(self.daily_avg_person_riding_steps))),
+        }
 
-        avg_daily_person_wait_time_hours = self.steps_to_hours(np.sum(self.daily_avg_person_waiting_steps) / len(self.daily_avg_person_waiting_steps))
-        print("Avg Daily Person Wait Time (hours):", avg_daily_person_wait_time_hours)
+        trip_records = building.trip_records
+        if trip_records.num_trips != 0:
+            averages["Trips Finished"] = trip_records.num_trips
+            averages["Avg Trip Wait Time (minutes)"] = float(self.steps_to_minutes(trip_records.wait_steps_sum / trip_records.num_trips))
+            averages["95th Percentile Trip Wait Time (minutes)"] = float(self.steps_to_minutes(trip_records.get_wait_percentile(95)))
+            averages["Avg Trip Ride Time (minutes)"] = float(self.steps_to_minutes(trip_records.ride_steps_sum / trip_records.num_trips))
 
-        avg_daily_person_ride_time_hours = self.steps_to_hours(np.sum(self.daily_avg_person_riding_steps) / len(self.daily_avg_person_riding_steps))
-        print("Avg Daily Person Ride Time (hours):", avg_daily_person_ride_time_hours)
+        num_departures = sum(elevator.num_departures for elevator in building.elevators)
+        if num_departures != 0:
+            averages["Avg Elevator Load Factor"] = sum(elevator.departure_load_sum / elevator.capacity for elevator in building.elevators) / num_departures
+        averages["Persons Left Behind"] = sum(elevator.num_left_behind for elevator in building.elevators)
+
+        return averages
+
+    """
+    Takes:
+    building - Building class that was simulated
+
+    Returns:
+    List of dictionaries, one per Elevator in id order, of how full the Elevator was as it left its stops (see Elevator.record_departure) and how many times a waiting Person didn't fit in it
+    """
+    def get_elevator_loads(self, building):
+        return [{
+            "Elevator": elevator.id,
+            "Departures": elevator.num_departures,
+            "Load Factor": elevator.get_load_factor(),
+            "Max Load": elevator.max_load,
+            "Capacity": elevator.capacity,
+            "Persons Left Behind": elevator.num_left_behind,
+        } for elevator in building.elevators]
+
+    def print_elevator_loads(self, building):
+        for loads in self.get_elevator_loads(building):
+            print(", ".join(name + ": " + str(value) for name, value in loads.items()))
+
+    def print_defining_averages(self, building):
+        for name, value in self.get_defining_averages(building).items():
+            print(name + ":", value)
 
         
 
@@ -1,23 +1,64 @@
 from copy import deepcopy
+import gc
 
 import numpy as np
-from Floor import Floor
+from Floor import Floor, generate_residents
 from Elevator import Elevator
-from ElevatorAlgorithm import ElevatorAlgorithm
+from ElevatorAlgorithm import get_elevator_algorithm
+import ETAAlgorithm # Registers the "eta" ElevatorAlgorithm
+import PopulationArtifact
+from RandomBuffer import RandomBuffer
+from RandomStreams import RandomStreams
+from StopSet import StopIndex
+import StateChanges
+from TripRecords import TripRecords
 
 class Building:
     # (Unchanging) Used to define the physical structure of the building.
     floors = []
     elevators = []
     population = 0
-    
-    # Brains of the elevator system. Utilizes elevators list to schedule routes to visit floors with pressed "call elevator" buttons.
+
+    # Optional Instrumentation (profiling timers and event counters) of the simulation run. None unless enabled with Instrumentation.enable_instrumentation
+    instrumentation = None
+
+    # Optional RandomTraffic (random trips on top of scheduled state changes). None unless enabled with RandomTraffic.enable_random_traffic
+    random_traffic = None
+
+    # Optional DestinationDispatch (Persons register their destination and are assigned an Elevator, instead of pressing up and down buttons). None unless enabled with DestinationDispatch.enable_destination_dispatch
+    destination_dispatch = None
+
+    # Brains of the elevator system (an ElevatorAlgorithm, resolved by name when the Building is built). Utilizes elevators list to schedule routes to visit floors with pressed "call elevator" buttons.
     elevator_algorithm = None
 
     # (Changing) Used to keep track of which floors have a "call elevator" button pressed that hasn't been assigned to an elevator yet.
     floors_new_up_button = []
     floors_new_down_button = []
 
+    # StopIndex of which Elevators have a stop at each Floor in each direction, kept up to date by the Elevators' StopSets
+    stop_index = None
+
+    # Current simulation step, counted from the start of the simulation (day * steps per day + step). Set by the Engine at the start of each step.
+    cur_step = 0
+
+    # TripRecords of every finished trip (person id, origin Floor id, destination Floor id, wait start step, board step, arrival step), in the order they finished
+    trip_records = None
+
+    # RandomStreams class that every random choice of the simulation is drawn from
+    random_streams = None
+
+    # numpy Generator for residents' random choices on the current day (random_streams.get_day_generator, replaced at the start of each day)
+    behavior_rng = None
+
+    # RandomBuffer that residents' destination floors are drawn from, filled from behavior_rng
+    dest_floor_buffer = None
+
+    # StateChanges class holding every resident's weekly state change data, rows in Floor order
+    state_changes = None
+
+    # List of 7 dictionaries (one per day of the week) where keys are step numbers and values are lists of Persons with a scheduled state change at that step.
+    state_change_calendar = []
+
     floor_destination_counters = []
     floor_departure_counters = []
     
@@ -30,23 +71,43 @@ class Building:
     Takes:
     floor_populations - list of integers representing the number of residents on each Floor.
     building_dest_floors_by_state_name -  dictionary where keys are state names (strings) and values are lists of potential destination Floor ids for any given state from a Building's perspective
-    elevator_algorithm - string representing the scheduling algorithm to be used within the Building
+    elevator_algorithm - string representing the scheduling algorithm to be used within the Building, the name of a registered ElevatorAlgorithm (see ElevatorAlgorithm.register_elevator_algorithm)
     elevator_starting_floors - list of integers representing Floor ids where each Elevator will "begin" at the start of the simulation.
     elevator_capacities - list of integers representing the maximum amount of Persons that can be onboard each Elevator at any given time.
     elevator_steps_per_loads - list of integers representing the number of steps each Elevator takes to onload/offload/stop at a floor.
     elevator_return_to_floors - list of integers representing the floor id each Elevator should return to if using any "return" algorithms.
+    use_batch_schedules - boolean representing whether every resident should be generated at once with the bulk construction path (Floor.generate_residents, much faster for large populations, same distribution) instead of one at a time.
+    population_artifact - optional string path of a population artifact (see PopulationArtifact) to load residents from instead of generating them. Must have been generated for the same floor_populations.
+    seed - integer random seed of the Building's RandomStreams, None to draw one from NumPy's global random state.
 
     Runs in O(F+E) time, where F is number of Floors and E is number of Elevators
     """
-    def __init__(self, floor_populations, building_dest_floors_by_state_name, elevator_algorithm, elevator_starting_floors, elevator_capacities, elevator_steps_per_loads, elevator_return_to_floors):
+    def __init__(self, floor_populations, building_dest_floors_by_state_name, elevator_algorithm, elevator_starting_floors, elevator_capacities, elevator_steps_per_loads, elevator_return_to_floors, use_batch_schedules=False, population_artifact=None, seed=None):
         self.floors = deepcopy(self.floors)
         self.elevators = deepcopy(self.elevators)
         self.floors_new_down_button = deepcopy(self.floors_new_down_button)
         self.floors_new_up_button = deepcopy(self.floors_new_up_button)
+        self.state_change_calendar = deepcopy(self.state_change_calendar)
+        self.trip_records = TripRecords()
         
-        self.generate_floors(floor_populations, building_dest_floors_by_state_name)
+        self.random_streams = RandomStreams(seed)
+
+        # Generating residents allocates millions of long lived objects (Persons, calendar lists) and no garbage, so garbage collection passes over them would only slow it down
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.generate_floors(floor_populations, building_dest_floors_by_state_name, use_batch_schedules, population_artifact, self.random_streams.population)
+            people = [person for floor in self.floors for person in floor.people_on_floor]
+            self.state_changes = StateChanges.concatenate_state_changes(people)
+            StateChanges.bind_state_changes(people, self.state_changes)
+            self.generate_state_change_calendar(people)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
         self.generate_elevators(elevator_starting_floors, elevator_capacities, elevator_steps_per_loads, elevator_return_to_floors)
-        self.elevator_algorithm = ElevatorAlgorithm(elevator_algorithm)
+        self.elevator_algorithm = get_elevator_algorithm(elevator_algorithm, len(self.floors))
+        self.behavior_rng = self.random_streams.get_day_generator(0)
+        self.dest_floor_buffer = RandomBuffer(self.behavior_rng)
 
         self.daily_floor_destination_counters = deepcopy(np.zeros((len(self.floors))))
         self.daily_floor_departure_counters = deepcopy(np.zeros((len(self.floors))))
@@ -60,14 +121,59 @@ class Building:
     Takes:
     floor_populations - list of integers representing the number of residents on each floor of a building
     building_dest_floors_by_state_name - dictionary where keys are state names (strings) and values are lists of potential destination Floor ids for any given state from a Building's perspective
+    use_batch_schedules - boolean representing whether to generate every resident at once with Floor.generate_residents
+    population_artifact - optional string path of a population artifact to load residents from instead of generating them
+    rng - optional numpy Generator to generate residents from, None to use one seeded from NumPy's global random state
     
     Runs in O(F) time, where F is the number of floors
     """
-    def generate_floors(self, floor_populations, building_dest_floors_by_state_name):
+    def generate_floors(self, floor_populations, building_dest_floors_by_state_name, use_batch_schedules=False, population_artifact=None, rng=None):
+        people_by_floor = None
+        if population_artifact is not None:
+            people_by_floor = PopulationArtifact.load_population_artifact(population_artifact, floor_populations)
+
+        if rng is None:
+            rng = RandomStreams().population
+
+        if use_batch_schedules and people_by_floor is None:
+            people_by_floor = generate_residents(floor_populations, building_dest_floors_by_state_name, rng)
+
+        first_resident = 0
         for i in range(len(floor_populations)):
             self.population += floor_populations[i]
-            floor = Floor(id=i, num_residents=floor_populations[i], building_dest_floors_by_state_name=building_dest_floors_by_state_name)
+            floor_people = None
+            if people_by_floor is not None:
+                floor_people = people_by_floor[i]
+            floor = Floor(id=i, num_residents=floor_populations[i], building_dest_floors_by_state_name=building_dest_floors_by_state_name, people=floor_people, rng=rng, first_person_id=first_resident)
             self.floors.append(floor)
+            first_resident += floor_populations[i]
+
+    """
+    Generates state_change_calendar from state_changes so each simulation step only has to touch the Persons who change state at that step.
+    The calendar only depends on state_changes (handled or not) and which Person each row belongs to, so it can be regenerated at any time (e.g. by Checkpoint).
+
+    Takes:
+    people - list of every resident, people[i] is bound to row i of state_changes
+
+    Runs in O(P*D + C log C) time, where P is the number of Persons, D is the number of days in a schedule, and C is the total number of state changes
+    """
+    def generate_state_change_calendar(self, people):
+        people_array = np.empty((self.state_changes.size,), dtype=object)
+        people_array[:] = people
+        self.state_change_calendar = []
+        for day in range(7):
+            rows, steps = self.state_changes.get_day_state_changes(day)
+            # Stable sort, so Persons changing state at the same step stay in row order
+            order = np.argsort(steps, kind="stable")
+            day_people = people_array[rows[order]].tolist()
+            steps = steps[order]
+            starts = np.flatnonzero(np.diff(steps, prepend=-1) != 0) # First of each run of equal steps
+            ends = starts[1:].tolist() + [len(day_people)]
+
+            daily_calendar = {}
+            for step, start, end in zip(steps[starts].tolist(), starts.tolist(), ends):
+                daily_calendar[step] = day_people[start:end]
+            self.state_change_calendar.append(daily_calendar)
 
     """
     Generates a list of Elevator classes for the building.
@@ -80,11 +186,9 @@ class Building:
     Runs in O(E) time, where E is the number of floors
     """
     def generate_elevators(self, elevator_starting_floors, elevator_capacities, elevator_steps_per_loads, elevator_return_to_floors):
+        self.stop_index = StopIndex(len(self.floors))
         for i in range(len(elevator_starting_floors)):
-            self.elevators.append(Elevator(id=i, capacity=elevator_capacities[i], starting_floor=elevator_starting_floors[i], steps_per_load=elevator_steps_per_loads[i], return_to_floor=elevator_return_to_floors[i]))
-            # Initialize each Elevator's people_by_destination dictionary with deepcopied empty lists (can't do this within an Elevator class because it doesn't know how many floors there are)
-            for j in range(len(self.floors)):
-                self.elevators[i].people_by_destination[j] = deepcopy([])
+            self.elevators.append(Elevator(id=i, capacity=elevator_capacities[i], starting_floor=elevator_starting_floors[i], steps_per_load=elevator_steps_per_loads[i], return_to_floor=elevator_return_to_floors[i], num_floors=len(self.floors), stop_index=self.stop_index))
 
     """
     Prints the state of a building for debugging purposes.
@@ -129,9 +233,9 @@ class Building:
             #print("Is moving up:", self.elevators[i].is_moving_up)
             print("Up stops:", self.elevators[i].up_stops)
             print("Down stops:", self.elevators[i].down_stops)
-            for key in self.elevators[i].people_by_destination.keys():
-                if len(self.elevators[i].people_by_destination[key]) != 0:
-                    print(str(len(self.elevators[i].people_by_destination[key])) + " people with destination " + str(key))
+            manifest = self.elevators[i].manifest
+            for key in np.flatnonzero(manifest.counts).tolist():
+                print(str(manifest.counts[key]) + " people with destination " + str(key))
                     #self.debug_simulation_loop = True
             print("")
             if len(self.elevators[i].up_stops) > 0 or len(self.elevators[i].down_stops) > 0:
@@ -0,0 +1,411 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import gc
+from itertools import chain
+import io
+import json
+from operator import attrgetter
+import os
+import random
+
+import numpy as np
+
+from Analytics import Analytics
+from Building import Building
+from DestinationDispatch import DestinationDispatch
+from Elevator import Elevator
+from ElevatorAlgorithm import get_elevator_algorithm
+from Floor import Floor
+from Person import Person
+from RandomBuffer import RandomBuffer
+from RandomStreams import RandomStreams
+from RandomTraffic import RandomTraffic
+from StopSet import StopIndex
+from TripRecords import TripRecords
+import Engine
+import Simulation
+import constants
+import StateChanges
+
+"""
+Snapshots and restores the complete state of a simulation (Building, Analytics, and random number generator states, including the Building's RandomStreams) so it can be resumed later or forked into several continuations.
+
+A checkpoint is a bytes object in NumPy's .npz format. Every Person, Floor, Elevator, and Analytics attribute is packed into a handful of flat arrays
+(one row per Person, one entry per list member, etc.). Person rows are in the order of the Building's StateChanges rows, and lists of Persons (Floor queues, Elevator passengers)
+are stored as those row numbers, packed one list after another with an array of list lengths.
+The state_change_calendar isn't stored, it is regenerated from the StateChanges (see Building.generate_state_change_calendar).
+
+    pack_lists(lists, dtype)
+    unpack_lists(lengths, members, values)
+save_checkpoint(building, analytics)
+restore_checkpoint(data, elevator_algorithm)
+write_checkpoint(path, building, analytics)
+read_checkpoint(path, elevator_algorithm)
+    run_fork(data, num_days, engine, elevator_algorithm, seed)
+run_forks(data, forks, num_days, engine, max_workers)
+"""
+
+checkpoint_version = 14
+
+"""
+Takes:
+lists - list of lists of integers
+dtype - NumPy dtype to store list members as
+
+Returns:
+Tuple (lengths, members) of arrays, members holding every list one after another
+"""
+def pack_lists(lists, dtype=np.int32):
+    lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+    members = np.fromiter(chain.from_iterable(lists), dtype=dtype, count=int(lengths.sum()))
+    return lengths, members
+
+"""
+Inverse of pack_lists.
+
+Takes:
+lengths, members - arrays returned by pack_lists
+values - optional NumPy array (e.g. an object array of Persons) that members index into
+
+Returns:
+List of lists of Python integers, or of values[member] if values is given
+"""
+def unpack_lists(lengths, members, values=None):
+    if values is not None:
+        members = values[members]
+    members = members.tolist()
+    ends = np.cumsum(lengths).tolist()
+    return [members[start:end] for start, end in zip([0] + ends[:-1], ends)]
+
+"""
+Returns:
+List of every Person in a Building, wherever they currently are, in the order of their rows of building.state_changes
+"""
+def get_people(building):
+    people = []
+    for floor in building.floors:
+        people += floor.people_on_floor
+        people += floor.people_going_up
+        people += floor.people_going_down
+    for elevator in building.elevators:
+        people += elevator.manifest.get_all_passengers()
+    return sorted(people, key=attrgetter("state_change_row"))
+
+"""
+Snapshots a simulation.
+
+Takes:
+building - Building class, between simulation steps (building.cur_step is the next step to simulate, as left by Engine.run_simulation)
+analytics - Analytics class used with building
+
+Returns:
+Bytes object holding the checkpoint
+"""
+def save_checkpoint(building, analytics):
+    people = get_people(building)
+    get_row = attrgetter("state_change_row")
+    def pack_people_lists(people_lists):
+        lengths = np.fromiter(map(len, people_lists), dtype=np.int64, count=len(people_lists))
+        members = np.fromiter(map(get_row, chain.from_iterable(people_lists)), dtype=np.int32, count=int(lengths.sum()))
+        return lengths, members
+
+    arrays = {}
+
+    # Persons. Each Person's dest_floor_choices only depend on their home floor, so each distinct table is stored once.
+    dest_tables = []
+    dest_table_idxs = []
+    dest_table_idx_by_id = {} # Tables shared between Persons (e.g. after a restore) are only compared once
+    for person in people:
+        table = person.dest_floor_choices
+        if id(table) not in dest_table_idx_by_id:
+            if table not in dest_tables:
+                dest_tables.append(table)
+            dest_table_idx_by_id[id(table)] = dest_tables.index(table)
+        dest_table_idxs.append(dest_table_idx_by_id[id(table)])
+
+    arrays["person_ints"] = np.array(list(map(attrgetter("id", "home_floor", "cur_floor", "dest_floor", "is_traveling", "wait_start_step", "board_step", "cur_num_visitors", "avg_num_visitors", "elevator_id"), people)),
+                                     dtype=np.int64).reshape(len(people), 10)
+    arrays["person_prob_having_visitors"] = np.fromiter(map(attrgetter("prob_having_visitors"), people), dtype=np.float64, count=len(people))
+    arrays["person_dest_table"] = np.array(dest_table_idxs, dtype=np.int64)
+    arrays["person_schedule"] = np.array([person.schedule for person in people], dtype=np.int8).reshape(len(people), 7, -1)
+
+    # State change data of every Person (row i is people[i]), including which state changes were already handled
+    state_changes = building.state_changes
+    arrays["state_change_steps"] = state_changes.steps
+    arrays["state_change_ids"] = state_changes.ids
+    arrays["state_change_day_starts"] = state_changes.day_starts
+    arrays["state_change_cursors"] = state_changes.cursors
+
+    # Floors, with their people_on_floor, people_going_up, and people_going_down lists
+    arrays["floor_ints"] = np.array([[floor.id, floor.num_residents, floor.is_up_pressed, floor.is_down_pressed] for floor in building.floors], dtype=np.int64).reshape(len(building.floors), 4)
+    arrays["floor_people_lengths"], arrays["floor_people"] = pack_people_lists([people_list for floor in building.floors for people_list in (floor.people_on_floor, floor.people_going_up, floor.people_going_down)])
+
+    # Elevators, with their stop lists and the passengers getting off at each Floor
+    arrays["elevator_ints"] = np.array([[elevator.id, elevator.capacity, elevator.steps_per_load, elevator.cur_floor, elevator.is_active, elevator.is_idle, elevator.is_loading, elevator.is_returning,
+                                         elevator.is_moving_up, elevator.loading_steps, elevator.deidled_floor, elevator.return_to_floor] for elevator in building.elevators], dtype=np.int64).reshape(len(building.elevators), 12)
+    arrays["elevator_counters"] = np.array([[elevator.idle_counters, elevator.active_counters, elevator.loading_counters, elevator.returning_counters] for elevator in building.elevators], dtype=np.int64).reshape(len(building.elevators), 4, 2)
+    arrays["elevator_load_counters"] = np.array([[elevator.num_departures, elevator.departure_load_sum, elevator.max_load, elevator.num_left_behind] for elevator in building.elevators], dtype=np.int64).reshape(len(building.elevators), 4)
+    arrays["elevator_stop_lengths"], arrays["elevator_stops"] = pack_lists([stops for elevator in building.elevators for stops in (elevator.up_stops, elevator.down_stops)])
+    arrays["elevator_people_lengths"], arrays["elevator_people"] = pack_people_lists([elevator.manifest.get_passengers(floor_id) for elevator in building.elevators for floor_id in range(len(building.floors))])
+
+    # Building
+    arrays["new_button_lengths"], arrays["new_buttons"] = pack_lists([building.floors_new_up_button, building.floors_new_down_button])
+    arrays["trip_records"] = building.trip_records.get_records()
+    arrays["trip_wait_step_counts"] = building.trip_records.wait_step_counts
+    if building.destination_dispatch is not None:
+        arrays["destination_request_lengths"], arrays["destination_requests"] = pack_people_lists([building.destination_dispatch.new_requests])
+    arrays["floor_counters"] = np.array([building.daily_floor_destination_counters, building.daily_floor_departure_counters, building.hourly_floor_destination_counters, building.hourly_floor_departure_counters])
+
+    # Analytics lists
+    analytics_list_names = [name for name in vars(Analytics) if name.startswith("daily_avg_") or name.startswith("hourly_avg_")]
+    for name in analytics_list_names:
+        arrays["analytics_" + name] = np.array(getattr(analytics, name), dtype=np.float64)
+
+    # Random number generator states, including destination floor values that were generated but not used yet
+    arrays["dest_floor_buffer_values"] = np.array(building.dest_floor_buffer.values[building.dest_floor_buffer.next_idx:], dtype=np.float64)
+    np_state = np.random.get_state()
+    arrays["np_random_keys"] = np_state[1]
+    py_state = random.getstate()
+    arrays["py_random_state"] = np.array(py_state[1], dtype=np.int64)
+
+    header = {
+        "version": checkpoint_version,
+        "population": building.population,
+        "elevator_algorithm": building.elevator_algorithm.algorithm,
+        "debug_simulation_loop": building.debug_simulation_loop,
+        "cur_step": building.cur_step,
+        "dest_tables": dest_tables,
+        "dest_floor_buffer_size": building.dest_floor_buffer.size,
+        "random_streams": {
+            "seed": building.random_streams.seed,
+            "population": building.random_streams.population.bit_generator.state,
+            "dispatch": building.random_streams.dispatch.bit_generator.state,
+            "behavior": building.behavior_rng.bit_generator.state,
+        },
+        "random_traffic": None if building.random_traffic is None else {
+            "hourly_trip_probabilities": building.random_traffic.hourly_trip_probabilities,
+            "num_present": building.random_traffic.num_present,
+            "next_trip_step": building.random_traffic.next_trip_step,
+            "redraw_step": building.random_traffic.redraw_step,
+        },
+        "has_destination_dispatch": building.destination_dispatch is not None,
+        "trip_records": {name: int(getattr(building.trip_records, name)) for name in ["first_kept", "keep_all", "num_trips", "wait_steps_sum", "ride_steps_sum"]},
+        "deidled_floor_directions": [elevator.deidled_floor_direction for elevator in building.elevators],
+        "analytics": {
+            "cur_day": analytics.cur_day,
+            "daily_window_start": analytics.daily_window_start,
+            "hourly_window_start": analytics.hourly_window_start,
+            "daily_first_trip": analytics.daily_first_trip,
+            "hourly_first_trip": analytics.hourly_first_trip,
+            "list_names": analytics_list_names,
+        },
+        "np_random": [np_state[0], int(np_state[2]), int(np_state[3]), float(np_state[4])],
+        "py_random": [py_state[0], py_state[2]],
+    }
+    arrays["header"] = np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8)
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+"""
+Restores a simulation from a checkpoint. Restoring the same checkpoint several times gives independent copies (forks) of the simulation.
+Also restores the global random number generator states, so a restored simulation continues exactly like the original would have.
+
+Takes:
+data - bytes object returned by save_checkpoint
+elevator_algorithm - string representing the scheduling algorithm to continue with, None to keep the checkpoint's
+
+Returns:
+Tuple (Building class, Analytics class)
+"""
+def restore_checkpoint(data, elevator_algorithm=None):
+    arrays = np.load(io.BytesIO(data))
+    header = json.loads(arrays["header"].tobytes().decode("utf-8"))
+    if header["version"] != checkpoint_version:
+        raise ValueError("Unsupported checkpoint version " + str(header["version"]) + ", expected " + str(checkpoint_version))
+
+    # Restoring allocates a few long lived objects per Person and no garbage, so garbage collection passes over them would only slow it down (see Building)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # Persons are created without running Person.__init__, which would generate a new Schedule
+        people = []
+        person_ints = arrays["person_ints"].tolist()
+        prob_having_visitors = arrays["person_prob_having_visitors"].tolist()
+        dest_table_idxs = arrays["person_dest_table"].tolist()
+        dest_tables = [tuple(tuple(choices) for choices in table) for table in header["dest_tables"]]
+        schedules = arrays["person_schedule"]
+        for i in range(len(person_ints)):
+            person = Person.__new__(Person)
+            person.id, person.home_floor, person.cur_floor, person.dest_floor, is_traveling, person.wait_start_step, person.board_step, person.cur_num_visitors, person.avg_num_visitors, person.elevator_id = person_ints[i]
+            person.is_traveling = bool(is_traveling)
+            person.floor_idx = -1 # Set when the Person is added back to their Floor
+            person.prob_having_visitors = prob_having_visitors[i]
+            person.dest_floor_choices = dest_tables[dest_table_idxs[i]] # Shared between Persons with the same table
+            person.schedule = schedules[i]
+            people.append(person)
+
+        people_array = np.empty((len(people),), dtype=object)
+        people_array[:] = people
+        state_changes = StateChanges.StateChanges(arrays["state_change_steps"], arrays["state_change_ids"], arrays["state_change_day_starts"], arrays["state_change_cursors"])
+        StateChanges.bind_state_changes(people, state_changes)
+
+        building = Building.__new__(Building)
+        building.population = header["population"]
+        building.debug_simulation_loop = header["debug_simulation_loop"]
+        building.cur_step = header["cur_step"]
+        building.state_changes = state_changes
+        building.random_streams = RandomStreams(header["random_streams"]["seed"])
+        building.random_streams.population.bit_generator.state = header["random_streams"]["population"]
+        building.random_streams.dispatch.bit_generator.state = header["random_streams"]["dispatch"]
+        building.behavior_rng = np.random.default_rng() # Same kind of bit generator as the day's Generator, its state is replaced right away
+        building.behavior_rng.bit_generator.state = header["random_streams"]["behavior"]
+        building.dest_floor_buffer = RandomBuffer(building.behavior_rng, header["dest_floor_buffer_size"])
+        building.dest_floor_buffer.values = arrays["dest_floor_buffer_values"].tolist()
+
+        if header["random_traffic"] is not None:
+            traffic = RandomTraffic.__new__(RandomTraffic)
+            for name, value in header["random_traffic"].items():
+                setattr(traffic, name, value)
+            building.random_traffic = traffic
+
+        building.generate_state_change_calendar(people)
+
+        building.floors = []
+        floor_people = unpack_lists(arrays["floor_people_lengths"], arrays["floor_people"], people_array)
+        for i, (floor_id, num_residents, is_up_pressed, is_down_pressed) in enumerate(arrays["floor_ints"].tolist()):
+            floor = Floor.__new__(Floor)
+            floor.id = floor_id
+            floor.num_residents = num_residents
+            floor.is_up_pressed = bool(is_up_pressed)
+            floor.is_down_pressed = bool(is_down_pressed)
+            floor.people_on_floor = []
+            for person in floor_people[i * 3]:
+                floor.add_person(person)
+            floor.people_going_up = deque(floor_people[i * 3 + 1])
+            floor.people_going_down = deque(floor_people[i * 3 + 2])
+            building.floors.append(floor)
+
+        building.elevator_algorithm = get_elevator_algorithm(header["elevator_algorithm"] if elevator_algorithm is None else elevator_algorithm, len(building.floors))
+
+        building.elevators = []
+        elevator_counters = arrays["elevator_counters"]
+        elevator_load_counters = arrays["elevator_load_counters"].tolist()
+        elevator_stops = unpack_lists(arrays["elevator_stop_lengths"], arrays["elevator_stops"])
+        elevator_people = unpack_lists(arrays["elevator_people_lengths"], arrays["elevator_people"], people_array)
+        num_floors = len(building.floors)
+        building.stop_index = StopIndex(num_floors)
+        for i, elevator_ints in enumerate(arrays["elevator_ints"].tolist()):
+            elevator_id, capacity, steps_per_load, cur_floor, is_active, is_idle, is_loading, is_returning, is_moving_up, loading_steps, deidled_floor, return_to_floor = elevator_ints
+            elevator = Elevator(id=elevator_id, capacity=capacity, starting_floor=cur_floor, steps_per_load=steps_per_load, return_to_floor=return_to_floor, num_floors=num_floors, stop_index=building.stop_index)
+            elevator.is_active = bool(is_active)
+            elevator.is_idle = bool(is_idle)
+            elevator.is_loading = bool(is_loading)
+            elevator.is_returning = bool(is_returning)
+            elevator.is_moving_up = bool(is_moving_up)
+            elevator.loading_steps = loading_steps
+            elevator.deidled_floor = deidled_floor
+            elevator.deidled_floor_direction = header["deidled_floor_directions"][i]
+            elevator.idle_counters, elevator.active_counters, elevator.loading_counters, elevator.returning_counters = [counters.astype(int) for counters in elevator_counters[i]]
+            elevator.num_departures, elevator.departure_load_sum, elevator.max_load, elevator.num_left_behind = elevator_load_counters[i]
+            for floor_id in elevator_stops[i * 2]:
+                elevator.up_stops.add(floor_id)
+            for floor_id in elevator_stops[i * 2 + 1]:
+                elevator.down_stops.add(floor_id)
+            for floor_id in range(num_floors):
+                for person in elevator_people[i * num_floors + floor_id]:
+                    elevator.manifest.add(person)
+            building.elevators.append(elevator)
+
+        building.floors_new_up_button, building.floors_new_down_button = unpack_lists(arrays["new_button_lengths"], arrays["new_buttons"])
+
+        if header["has_destination_dispatch"]:
+            # Counts of Persons waiting for each Elevator are rebuilt from the Persons waiting on Floors
+            dispatch = DestinationDispatch(len(building.elevators), num_floors)
+            dispatch.new_requests = unpack_lists(arrays["destination_request_lengths"], arrays["destination_requests"], people_array)[0]
+            for floor in building.floors:
+                for direction_idx, people_waiting in enumerate([floor.people_going_up, floor.people_going_down]):
+                    for person in people_waiting:
+                        if person.elevator_id != -1:
+                            dispatch.num_waiting[person.elevator_id] += 1
+                            dispatch.num_waiting_by_dest[person.elevator_id, direction_idx, person.dest_floor] += 1
+            building.destination_dispatch = dispatch
+        building.trip_records = TripRecords()
+        for name, value in header["trip_records"].items():
+            setattr(building.trip_records, name, value)
+        building.trip_records.keep_all = bool(building.trip_records.keep_all)
+        building.trip_records.records = arrays["trip_records"].copy()
+        building.trip_records.size = len(building.trip_records.records)
+        building.trip_records.wait_step_counts = arrays["trip_wait_step_counts"].copy()
+        building.daily_floor_destination_counters, building.daily_floor_departure_counters, building.hourly_floor_destination_counters, building.hourly_floor_departure_counters = [counters.copy() for counters in arrays["floor_counters"]]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    analytics = Analytics()
+    for name, value in header["analytics"].items():
+        if name != "list_names":
+            setattr(analytics, name, value)
+    for name in header["analytics"]["list_names"]:
+        setattr(analytics, name, arrays["analytics_" + name].tolist())
+
+    np_name, np_pos, np_has_gauss, np_cached_gaussian = header["np_random"]
+    np.random.set_state((np_name, arrays["np_random_keys"], np_pos, np_has_gauss, np_cached_gaussian))
+    py_version, py_gauss_next = header["py_random"]
+    random.setstate((py_version, tuple(arrays["py_random_state"].tolist()), py_gauss_next))
+
+    return building, analytics
+
+def write_checkpoint(path, building, analytics):
+    with open(path, "wb") as file:
+        file.write(save_checkpoint(building, analytics))
+
+def read_checkpoint(path, elevator_algorithm=None):
+    with open(path, "rb") as file:
+        return restore_checkpoint(file.read(), elevator_algorithm)
+
+"""
+Restores a checkpoint and continues the simulation to the end of day num_days.
+
+Takes:
+data - bytes object returned by save_checkpoint
+num_days - integer number of days (counted from the start of the simulation) to simulate until
+engine - string representing the Engine to use
+elevator_algorithm - string representing the scheduling algorithm to continue with, None to keep the checkpoint's
+seed - integer random seed of new RandomStreams to continue with (from the checkpoint's day on), None to continue the checkpoint's random number generator states
+
+Returns:
+Dictionary from Analytics.get_defining_averages
+"""
+def run_fork(data, num_days, engine="event", elevator_algorithm=None, seed=None):
+    building, analytics = restore_checkpoint(data, elevator_algorithm)
+    if seed is not None:
+        building.random_streams = RandomStreams(seed)
+        Simulation.reset_behavior_rng(building, building.cur_step // int(constants.steps_per_day))
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        Engine.run_simulation(building, analytics, num_days=num_days, engine=engine, progress=False)
+        analytics.compute_daily_step_averages(building)
+        analytics.compute_hourly_step_averages(building)
+
+    return analytics.get_defining_averages(building)
+
+"""
+Continues several forks of one checkpoint across a pool of worker processes, e.g. to compare switching scheduling algorithms part way through a week.
+
+Takes:
+data - bytes object returned by save_checkpoint
+forks - list of dictionaries with optional keys "elevator_algorithm" and "seed" (see run_fork)
+num_days - integer number of days (counted from the start of the simulation) to simulate until
+engine - string representing the Engine to use
+max_workers - integer maximum number of worker processes, None to use one per CPU
+
+Returns:
+List of dictionaries from run_fork, in the same order as forks
+"""
+def run_forks(data, forks, num_days, engine="event", max_workers=None):
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_fork, data, num_days, engine, fork.get("elevator_algorithm"), fork.get("seed")) for fork in forks]
+        return [future.result() for future in futures]
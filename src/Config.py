@@ -0,0 +1,82 @@
+from Building import Building
+import DestinationDispatch
+import Instrumentation
+import PopulationArtifact
+import RandomTraffic
+
+"""
+Simulation configurations are dictionaries so they can be copied, compared, hashed, and sent to worker processes. Keys:
+
+floor_populations - list of integers representing the number of residents on each Floor.
+dest_floors_by_state_name - dictionary where keys are state names (strings) and values are lists of potential destination Floor ids for any given state from a Building's perspective
+elevator_algorithm - string representing the scheduling algorithm to be used within the Building
+elevator_starting_floors - list of integers representing Floor ids where each Elevator will "begin" at the start of the simulation.
+elevator_capacities - list of integers representing the maximum amount of Persons that can be onboard each Elevator at any given time.
+elevator_steps_per_loads - list of integers representing the number of steps each Elevator takes to onload/offload/stop at a floor.
+elevator_return_to_floors - list of integers representing the floor id each Elevator should return to if using any "return" algorithms.
+use_batch_schedules - boolean representing whether residents' schedules are generated all at once (see Schedule.generate_schedules)
+engine - string representing the Engine to run the simulation with, "tick" or "event"
+num_days - integer number of days to simulate
+instrumentation - boolean representing whether to time simulation phases and count events (see Instrumentation)
+population_cache_dir - string path of a directory to store generated residents in and load them from (see PopulationArtifact), None to generate residents for every Building
+random_trip_rates - list of 24 floats, average number of random trips each resident on a Floor starts per hour of the day on top of their schedule (see RandomTraffic), None for no random trips
+destination_dispatch - boolean representing whether residents register their destination instead of pressing up and down buttons (see DestinationDispatch)
+keep_trip_records - boolean representing whether every finished trip's record is kept (see TripRecords), False to drop records once Analytics has reported on them
+"""
+
+HERE_config = {
+    "floor_populations": [0, 0, 0, 0, 10, 10, 10, 10, 10, 10, 10, 10, 10, 10, 10],
+    "dest_floors_by_state_name": {
+        "freetime": [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14], # Person can go anywhere during freetime
+        "class": [0], # Must go to ground floor for in person class
+        "sleep": [], # Sleep only happens at person's home floor
+        "meal": [0], # Must go to ground floor to eat out / pickup food
+        "exercise": [1], # HERE gym is on second floor
+        "shop": [0], # Must go to ground floor to go to store
+        "chores": [], # Chores only happen at person's home floor
+        "study": [3], # HERE study rooms are on fourth floor
+    },
+    "elevator_algorithm": "stay_where_stopped",
+    "elevator_starting_floors": [0, 0, 0],
+    "elevator_capacities": [10, 10, 10],
+    "elevator_steps_per_loads": [2, 2, 2], # Num simulation steps an elevator must pass (doing nothing) each time it stops to onload or offload passengers
+    "elevator_return_to_floors": [1, 4, 10],
+    "use_batch_schedules": True, # Generate every resident's schedule at once, much faster startup for large populations with the same schedule distribution
+    "engine": "event", # "tick" simulates every step, "event" jumps over steps where only Elevator movement happens (same results, much faster through quiet hours)
+    "num_days": 7, # Persons' Schedules are weekly
+    "instrumentation": False, # Print a breakdown of where simulation time went at the end of a run
+    "population_cache_dir": None, # Reuse residents generated from the same seed across runs (e.g. a sweep over Elevator parameters) instead of regenerating them
+    "random_trip_rates": None, # e.g. [0.05] * 24 for one unscheduled trip every 20 hours per resident, all day
+    "destination_dispatch": False, # Residents register their destination and are assigned an Elevator, grouped with others going to the same Floor
+    "keep_trip_records": True, # False keeps memory flat over long runs, trip averages are kept as running totals either way
+}
+
+"""
+Builds the Building described by a configuration.
+With a seed, every random choice of the Building is drawn from the seed's RandomStreams, and residents are loaded from (or saved to) the configuration's population_cache_dir if it is set.
+A Building loaded from the cache is the same as one generated from the seed.
+
+Takes:
+config - configuration dictionary (see above)
+seed - integer random seed, None to draw one from NumPy's global random state (population_cache_dir is then ignored)
+
+Returns:
+Building class
+"""
+def build_building(config, seed=None):
+    population_artifact = None
+    if seed is not None and config.get("population_cache_dir") is not None:
+        population_artifact = PopulationArtifact.get_population_artifact(config["population_cache_dir"], seed, config["floor_populations"], config["dest_floors_by_state_name"],
+                                                                          config.get("use_batch_schedules", False))
+
+    building = Building(config["floor_populations"], config["dest_floors_by_state_name"], config["elevator_algorithm"], config["elevator_starting_floors"], config["elevator_capacities"],
+                        config["elevator_steps_per_loads"], config["elevator_return_to_floors"],
+                        use_batch_schedules=config.get("use_batch_schedules", False), population_artifact=population_artifact, seed=seed)
+    if config.get("random_trip_rates") is not None:
+        RandomTraffic.enable_random_traffic(building, config["random_trip_rates"])
+    if config.get("destination_dispatch", False):
+        DestinationDispatch.enable_destination_dispatch(building)
+    building.trip_records.keep_all = config.get("keep_trip_records", True)
+    if config.get("instrumentation", False):
+        Instrumentation.enable_instrumentation(building)
+    return building
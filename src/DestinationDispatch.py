@@ -0,0 +1,179 @@
+from collections import deque
+
+import numpy as np
+
+from ElevatorAlgorithm import add_stop
+from ETAAlgorithm import ElevatorStates, full_elevator_cost, idle_elevator_cost
+
+"""
+Destination dispatch, an opt-in mode that works with any ElevatorAlgorithm. Persons register an (origin, destination) request when they start waiting instead of pressing an up or down button.
+Each request is assigned to one Elevator, and when an Elevator stops at a Floor only the Persons assigned to it board.
+
+Requests are grouped by destination. The cost of giving a request to an Elevator is the number of steps until the Elevator picks the Person up (see ETAAlgorithm.ElevatorStates),
+plus steps_per_load + 1 steps for every stop the request adds to the Elevator (at the origin and at the destination) for every Person riding or waiting for the Elevator.
+Persons going to the same Floor end up in the same Elevator, and each Elevator makes fewer stops.
+An Elevator only gets as many requests as it has room for (counting the Persons riding it and waiting for it), unless no Elevator has room.
+Persons who don't fit when their Elevator arrives stay in line and register their request again.
+Like the hall calls of stay_where_stopped, a request can only go to an idle Elevator, one moving towards the origin in the direction of the request, or one that already stops there in that direction.
+Requests no Elevator can take are retried every step.
+The ElevatorAlgorithm still decides what Elevators do when they run out of stops.
+
+DestinationDispatch(num_elevators, num_floors)
+enable_destination_dispatch(building)
+"""
+
+class DestinationDispatch:
+    new_requests = [] # Persons waiting for an Elevator that weren't assigned one yet, in the order they registered
+
+    # Numpy int array of shape (E, 2, F). Number of Persons waiting for each Elevator to go up (0) or down (1) to each Floor
+    num_waiting_by_dest = None
+
+    # Numpy int array of shape (E,). Number of Persons waiting for each Elevator
+    num_waiting = None
+
+    """
+    Takes:
+    num_elevators - integer number of Elevators in the Building
+    num_floors - integer number of Floors in the Building
+    """
+    def __init__(self, num_elevators, num_floors):
+        self.new_requests = []
+        self.num_waiting_by_dest = np.zeros((num_elevators, 2, num_floors), dtype=np.int64)
+        self.num_waiting = np.zeros((num_elevators,), dtype=np.int64)
+
+    """
+    Registers the request of a Person who started waiting on their cur_floor to travel to their dest_floor.
+
+    Takes:
+    person - Person class
+    """
+    def add_request(self, person):
+        person.elevator_id = -1
+        self.new_requests.append(person)
+
+    """
+    Takes:
+    states - ElevatorStates of the Building's Elevators
+    origin - integer Floor id the request was made on
+    dest - integer Floor id the request goes to
+
+    Returns:
+    Float array of shape (E,), the cost of assigning the request to each Elevator (see the top of this module). inf where the Elevator can't take the request now.
+
+    Runs in O(E) vectorized time
+    """
+    def get_costs(self, states, origin, dest):
+        going_up = dest > origin
+        stops_below = states.up_stops_below if going_up else states.down_stops_below
+
+        # Elevators on their way to pick up Persons going the same way at origin stop there, although origin is in their other stop list.
+        # Elevators with origin in their stop list for the request's direction stop there moving that way, unless it is their deidled_floor for the other direction
+        is_picking_up = (states.deidled_floor == origin) & (states.is_deidled_up == going_up)
+        is_picking_up_other = (states.deidled_floor == origin) & (states.is_deidled_up != going_up)
+        has_origin_stop = ((stops_below[:, origin + 1] > stops_below[:, origin]) & ~is_picking_up_other) | is_picking_up
+
+        # Elevators that already stop at origin can be moving away from it, they are assumed to make all of their stops first
+        num_stops = states.up_stops_below[:, -1] + states.down_stops_below[:, -1]
+        stop_pickup_steps = np.abs(origin - states.cur_floor) + states.remaining_stop_steps + np.where(is_picking_up, 0, np.maximum(num_stops - 1, 0) * states.stop_steps)
+        pickup_steps = np.where(has_origin_stop, stop_pickup_steps, states.get_eta_steps([origin], [going_up])[0])
+
+        has_dest_stop = (stops_below[:, dest + 1] > stops_below[:, dest]) | (self.num_waiting_by_dest[:, 0 if going_up else 1, dest] > 0)
+        num_new_stops = (~has_origin_stop).astype(np.int64) + (~has_dest_stop).astype(np.int64)
+        num_delayed = states.load + self.num_waiting + 1 # Every Person riding or waiting for the Elevator waits through a new stop, and so does this one
+
+        is_full = states.load + self.num_waiting >= states.capacity
+        return pickup_steps + num_new_stops * states.stop_steps * num_delayed + states.is_idle * idle_elevator_cost + is_full * full_elevator_cost
+
+    """
+    Assigns the new requests to Elevators, one at a time. Requests with the same origin and destination are assigned one after another (groups in the order their first request was registered),
+    so they fill the same Elevator before it runs out of room. Requests no Elevator can take stay in new_requests, in the order they were registered, to be assigned on a later step.
+
+    Takes:
+    building - Building class
+
+    Runs in O(E*F + R*E) time, where E is the number of Elevators, F is the number of Floors, and R is the number of new requests
+    """
+    def assign_requests(self, building):
+        if len(self.new_requests) == 0:
+            return
+        states = ElevatorStates(building.elevators, len(building.floors))
+        groups = {}
+        for person in self.new_requests:
+            groups.setdefault((person.cur_floor, person.dest_floor), []).append(person)
+        for (origin, dest), people in groups.items():
+            for person in people:
+                costs = self.get_costs(states, origin, dest)
+                i = int(np.argmin(costs))
+                if costs[i] != np.inf:
+                    self.assign_request(states, person, i)
+        self.new_requests = [person for person in self.new_requests if person.elevator_id == -1]
+
+    """
+    Assigns a request to an Elevator, adding a stop at its origin if the Elevator doesn't stop there yet.
+
+    Takes:
+    states - ElevatorStates of the Building's Elevators
+    person - Person class who made the request
+    i - integer position of the Elevator within states.elevators
+    """
+    def assign_request(self, states, person, i):
+        elevator = states.elevators[i]
+        origin = person.cur_floor
+        direction = "up" if person.dest_floor > origin else "down"
+        stops = elevator.up_stops if direction == "up" else elevator.down_stops
+        if elevator.deidled_floor == origin:
+            has_origin_stop = elevator.deidled_floor_direction == direction
+        else:
+            has_origin_stop = origin in stops
+        if not has_origin_stop:
+            add_stop(elevator, origin, direction)
+            states.update(i)
+
+        person.elevator_id = elevator.id
+        self.num_waiting[i] += 1
+        self.num_waiting_by_dest[i, 0 if direction == "up" else 1, person.dest_floor] += 1
+
+    """
+    Removes the Persons assigned to an Elevator from a Floor's waiting line, as many as the Elevator has room for. The other Persons keep their order.
+    Assigned Persons who don't fit stay in line and their requests are registered again, to be assigned on a later step.
+
+    Takes:
+    people_waiting - deque of Persons, a Floor's people_going_up or people_going_down
+    elevator - Elevator class stopped at the Floor
+    direction - String "up" for people_going_up or "down" for people_going_down
+    room - integer number of Persons that fit in the Elevator
+
+    Returns:
+    Tuple (boarding, left_behind). boarding is a deque of the Persons assigned to the Elevator that fit, left_behind a list of those that don't, both in the order they started waiting
+
+    Runs in O(W) time, where W is the number of Persons waiting
+    """
+    def pop_boarding(self, people_waiting, elevator, direction, room):
+        boarding = deque()
+        left_behind = []
+        for j in range(len(people_waiting)):
+            person = people_waiting.popleft()
+            if person.elevator_id == elevator.id:
+                person.elevator_id = -1
+                self.num_waiting[elevator.id] -= 1
+                self.num_waiting_by_dest[elevator.id, 0 if direction == "up" else 1, person.dest_floor] -= 1
+                if len(boarding) < room:
+                    boarding.append(person)
+                    continue
+                left_behind.append(person)
+                self.add_request(person)
+            people_waiting.append(person)
+        return boarding, left_behind
+
+"""
+Switches a Building to destination dispatch (see the top of this module). Must be enabled before the simulation starts, while nobody is waiting for an Elevator.
+
+Takes:
+building - Building class
+
+Returns:
+DestinationDispatch class attached to the Building
+"""
+def enable_destination_dispatch(building):
+    building.destination_dispatch = DestinationDispatch(len(building.elevators), len(building.floors))
+    return building.destination_dispatch
@@ -0,0 +1,241 @@
+import numpy as np
+
+from ElevatorAlgorithm import ElevatorAlgorithm, add_stop, has_stop, register_elevator_algorithm
+
+"""
+Estimated time of arrival (ETA) dispatch. Each hall call goes to the Elevator with the lowest cost, computed for every Elevator at once with array operations:
+the number of steps until the Elevator would pick the caller up (floors to travel, plus a stop of steps_per_load + 1 steps for every stop it already has on the way, plus what is left of its current stop).
+Idle Elevators cost extra, since an Elevator sent to a call can't take other calls until it gets there. Full Elevators are only used if no other Elevator can take the call.
+Like stay_where_stopped, only idle Elevators and Elevators moving towards the call in its direction can take it, and Elevators stay where they stop.
+Unlike stay_where_stopped, an Elevator on its way to its deidled_floor can take calls on the way when it is already moving in the direction its deidled_floor was requested in.
+
+ElevatorStates(elevators, num_floors)
+ETAAlgorithm(algorithm)
+BatchETAAlgorithm(algorithm) - assigns all of a step's new hall calls together ("batch_eta")
+"""
+
+# Added to the cost of idle Elevators (steps), so a call waits a little longer for an Elevator already moving its way rather than taking an idle one out of reserve
+idle_elevator_cost = 30
+
+# Added to the cost of full Elevators (more steps than any trip takes), so they only get calls no other Elevator can take
+full_elevator_cost = 1e9
+
+class ElevatorStates:
+    num_floors = 0
+    elevators = []
+
+    # Arrays indexed by Elevator (position within elevators)
+    cur_floor = None
+    is_idle = None
+    is_moving_up = None
+    is_moving_towards_stops = None # Active, loading, or returning, and not heading to a deidled_floor against its direction, so it can take calls ahead of it in its direction
+    remaining_stop_steps = None # Steps left of the stop the Elevator is loading at, 0 if it isn't loading
+    stop_steps = None # Steps a stop takes (steps_per_load, plus the step the Elevator arrives on)
+    deidled_floor = None # -1 if the Elevator isn't on its way to a deidled_floor
+    is_deidled_up = None # True if the Persons on the Elevator's deidled_floor want to go up
+    load = None
+    capacity = None
+    is_full = None
+
+    # Arrays of shape (E, F + 1). Number of up stops (or down stops) of each Elevator below each Floor, so the number of stops between two Floors is a difference
+    up_stops_below = None
+    down_stops_below = None
+
+    """
+    Takes a snapshot of the state of Elevators. Call update after changing an Elevator.
+
+    Takes:
+    elevators - list of Elevator classes
+    num_floors - integer number of Floors in the Building
+
+    Runs in O(E*F) time, where E is the number of Elevators and F is the number of Floors
+    """
+    def __init__(self, elevators, num_floors):
+        self.num_floors = num_floors
+        self.elevators = elevators
+        num_elevators = len(elevators)
+
+        self.cur_floor = np.zeros((num_elevators,), dtype=np.int64)
+        self.is_idle = np.zeros((num_elevators,), dtype=bool)
+        self.is_moving_up = np.zeros((num_elevators,), dtype=bool)
+        self.is_moving_towards_stops = np.zeros((num_elevators,), dtype=bool)
+        self.remaining_stop_steps = np.zeros((num_elevators,), dtype=np.int64)
+        self.stop_steps = np.zeros((num_elevators,), dtype=np.int64)
+        self.deidled_floor = np.zeros((num_elevators,), dtype=np.int64)
+        self.is_deidled_up = np.zeros((num_elevators,), dtype=bool)
+        self.load = np.zeros((num_elevators,), dtype=np.int64)
+        self.capacity = np.zeros((num_elevators,), dtype=np.int64)
+        self.is_full = np.zeros((num_elevators,), dtype=bool)
+        self.up_stops_below = np.zeros((num_elevators, num_floors + 1), dtype=np.int64)
+        self.down_stops_below = np.zeros((num_elevators, num_floors + 1), dtype=np.int64)
+
+        for i in range(num_elevators):
+            self.update(i)
+
+    """
+    Updates the snapshot of one Elevator.
+
+    Takes:
+    i - integer position of the Elevator within elevators
+
+    Runs in O(F) time, where F is the number of Floors
+    """
+    def update(self, i):
+        elevator = self.elevators[i]
+        self.cur_floor[i] = elevator.cur_floor
+        self.is_idle[i] = elevator.is_idle
+        self.is_moving_up[i] = elevator.is_moving_up
+        self.is_moving_towards_stops[i] = (elevator.is_active or elevator.is_loading or elevator.is_returning) and (elevator.deidled_floor == -1 or (elevator.deidled_floor_direction == "up") == elevator.is_moving_up)
+        self.remaining_stop_steps[i] = elevator.loading_steps if elevator.is_loading else 0
+        self.stop_steps[i] = elevator.steps_per_load + 1
+        self.deidled_floor[i] = elevator.deidled_floor
+        self.is_deidled_up[i] = elevator.deidled_floor_direction == "up"
+        self.load[i] = elevator.manifest.load
+        self.capacity[i] = elevator.capacity
+        self.is_full[i] = elevator.manifest.load >= elevator.capacity
+        self.up_stops_below[i, 1:] = np.cumsum(get_stop_flags(elevator.up_stops, self.num_floors))
+        self.down_stops_below[i, 1:] = np.cumsum(get_stop_flags(elevator.down_stops, self.num_floors))
+
+    """
+    Takes:
+    floor_ids - array of C integer Floor ids of hall calls
+    going_up - array of C booleans, True for up calls and False for down calls
+
+    Returns:
+    Float array of shape (C, E), the number of steps until each Elevator would reach each call. inf where the Elevator can't take the call now.
+
+    Runs in O(C*E) vectorized time
+    """
+    def get_eta_steps(self, floor_ids, going_up):
+        floor_ids = np.asarray(floor_ids, dtype=np.int64)[:, None]
+        going_up = np.asarray(going_up, dtype=bool)[:, None]
+        elevator_idxs = np.arange(len(self.elevators))[None, :]
+        cur_floor = self.cur_floor[None, :]
+
+        # Stops the Elevator makes before reaching the call: up stops in [cur_floor, floor_id) or down stops in (floor_id, cur_floor]
+        pending_up_stops = self.up_stops_below[elevator_idxs, np.maximum(floor_ids, cur_floor)] - self.up_stops_below[elevator_idxs, cur_floor]
+        pending_down_stops = self.down_stops_below[elevator_idxs, cur_floor + 1] - self.down_stops_below[elevator_idxs, np.minimum(floor_ids, cur_floor) + 1]
+        pending_stops = np.where(going_up, pending_up_stops, pending_down_stops)
+
+        moving_towards = self.is_moving_towards_stops[None, :] & np.where(going_up, self.is_moving_up[None, :] & (cur_floor < floor_ids), ~self.is_moving_up[None, :] & (cur_floor > floor_ids))
+        eta_steps = np.abs(floor_ids - cur_floor) + np.where(self.is_idle[None, :], 0, pending_stops * self.stop_steps[None, :] + self.remaining_stop_steps[None, :])
+        return np.where(self.is_idle[None, :] | moving_towards, eta_steps, np.inf)
+
+    """
+    Takes:
+    floor_ids - array of C integer Floor ids of hall calls
+    going_up - array of C booleans, True for up calls and False for down calls
+
+    Returns:
+    Float array of shape (C, E), the cost of assigning each call to each Elevator (see the top of this module). inf where the Elevator can't take the call now.
+
+    Runs in O(C*E) vectorized time
+    """
+    def get_costs(self, floor_ids, going_up):
+        return self.get_eta_steps(floor_ids, going_up) + (self.is_idle * idle_elevator_cost + self.is_full * full_elevator_cost)[None, :]
+
+class ETAAlgorithm(ElevatorAlgorithm):
+    """
+    Assigns every hall call in the Building's "floors_new_up_button" and "floors_new_down_button" lists that an Elevator can take now to the Elevator with the lowest cost,
+    one at a time in the order the buttons were pressed. Floors that aren't assigned stay in the lists to be assigned on a later step.
+
+    Takes:
+    building - Building class
+
+    Runs in O(E*F + C*E) time, where E is the number of Elevators, F is the number of Floors, and C is the number of calls
+    """
+    def assign_hall_calls(self, building):
+        if len(building.floors_new_up_button) == 0 and len(building.floors_new_down_button) == 0:
+            return
+        states = ElevatorStates(building.elevators, len(building.floors))
+        for direction, new_button in (("up", building.floors_new_up_button), ("down", building.floors_new_down_button)):
+            new_button[:] = [floor_id for floor_id in new_button if not self.assign_call(states, floor_id, direction, building.stop_index)]
+
+    """
+    Takes:
+    elevators - List of Elevator classes
+    floor_id - Integer id of the floor an elevator needs to stop at
+    direction - String representing direction of travel desired by people on floor_id, "up" or "down"
+    stop_index - optional StopIndex of the Building the elevators belong to
+
+    Returns:
+    assigned - Boolean representing if the requested stop was successfully assigned.
+    """
+    def assign_stop(self, elevators, floor_id, direction, stop_index=None):
+        if self.num_floors == 0:
+            raise ValueError("The " + repr(self.algorithm) + " elevator algorithm needs the number of Floors, resolve it with get_elevator_algorithm(name, num_floors)")
+        return self.assign_call(ElevatorStates(elevators, self.num_floors), floor_id, direction, stop_index)
+
+    """
+    Assigns a hall call to the Elevator with the lowest cost, and updates states for it.
+
+    Takes:
+    states - ElevatorStates of the Elevators
+    floor_id - Integer id of the floor of the call
+    direction - String "up" or "down"
+    stop_index - optional StopIndex of the Building the Elevators belong to
+
+    Returns:
+    assigned - Boolean representing if an Elevator could take the call
+    """
+    def assign_call(self, states, floor_id, direction, stop_index=None):
+        if has_stop(states.elevators, floor_id, direction, stop_index):
+            return True
+        costs = states.get_costs([floor_id], [direction == "up"])[0]
+        i = int(np.argmin(costs))
+        if costs[i] == np.inf:
+            return False
+        add_stop(states.elevators[i], floor_id, direction)
+        states.update(i)
+        return True
+
+class BatchETAAlgorithm(ETAAlgorithm):
+    """
+    Assigns all of the Building's new hall calls together instead of one at a time in list order, so an early call can't take the Elevator that would have been best for a later one.
+    The cost of every call for every Elevator is computed at once (a (C, E) matrix, see ElevatorStates.get_costs), and the cheapest (call, Elevator) pair of the whole matrix is assigned first.
+    The matrix is then recomputed with the Elevator that took the call updated, until every call is assigned or no Elevator can take the rest.
+    Calls no Elevator can take stay in the lists, in order, to be assigned on a later step.
+
+    Takes:
+    building - Building class
+
+    Runs in O(E*F + C*F + C^2*E) time, where E is the number of Elevators, F is the number of Floors, and C is the number of calls. The C^2*E part is vectorized
+    """
+    def assign_hall_calls(self, building):
+        calls = [(floor_id, "up") for floor_id in building.floors_new_up_button] + [(floor_id, "down") for floor_id in building.floors_new_down_button]
+        if len(calls) == 0:
+            return
+        states = ElevatorStates(building.elevators, len(building.floors))
+        floor_ids = np.array([floor_id for floor_id, direction in calls], dtype=np.int64)
+        going_up = np.array([direction == "up" for floor_id, direction in calls], dtype=bool)
+
+        is_assigned = [has_stop(building.elevators, floor_id, direction, building.stop_index) for floor_id, direction in calls]
+        pending = np.flatnonzero(np.logical_not(is_assigned))
+        while len(pending) != 0:
+            costs = states.get_costs(floor_ids[pending], going_up[pending])
+            j, i = np.unravel_index(int(np.argmin(costs)), costs.shape) # Ties go to the call made first
+            if costs[j, i] == np.inf:
+                break
+            call = pending[j]
+            add_stop(states.elevators[i], calls[call][0], calls[call][1])
+            states.update(i)
+            is_assigned[call] = True
+            pending = np.delete(pending, j)
+
+        building.floors_new_up_button[:] = [floor_id for (floor_id, direction), assigned in zip(calls, is_assigned) if direction == "up" and not assigned]
+        building.floors_new_down_button[:] = [floor_id for (floor_id, direction), assigned in zip(calls, is_assigned) if direction == "down" and not assigned]
+
+"""
+Takes:
+stops - StopSet
+num_floors - integer number of Floors
+
+Returns:
+Boolean array of shape (num_floors,), True at the stops
+"""
+def get_stop_flags(stops, num_floors):
+    flags = np.unpackbits(np.frombuffer(stops.mask.to_bytes((num_floors + 7) // 8, "little"), dtype=np.uint8), bitorder="little")
+    return flags[:num_floors].astype(bool)
+
+register_elevator_algorithm("eta", ETAAlgorithm)
+register_elevator_algorithm("batch_eta", BatchETAAlgorithm)
@@ -1,6 +1,9 @@
 from copy import deepcopy
 import numpy as np
 
+from Manifest import Manifest
+from StopSet import StopSet
+
 class Elevator:
     id = -1
     capacity = -1
@@ -24,13 +27,13 @@ class Elevator:
     # Used by Elevator's utilizing variants of the "return_to" algorithm, where Elevators are able to return to specific floors when they run out of stops.
     return_to_floor = -1
 
-    # Keys are Floor ids and values are lists of Persons who will get off the elevator at that floor.
-    people_by_destination = {}
+    # Manifest of the Persons onboard, by the Floor they will get off the elevator at.
+    manifest = None
     
-    # List of floors to stop at going up (includes destination floors and requested external stops where new people will get on elevator). Order of list does not represent stopping order.
-    up_stops = []
-    # List of floors to stop at going up (includes destination floors and requested external stops where new people will get on elevator). Order of list does not represent stopping order.
-    down_stops = []
+    # StopSet of floors to stop at going up (includes destination floors and requested external stops where new people will get on elevator). Iterates in Floor order, which does not represent stopping order.
+    up_stops = None
+    # StopSet of floors to stop at going down (includes destination floors and requested external stops where new people will get on elevator). Iterates in Floor order, which does not represent stopping order.
+    down_stops = None
 
     # Each counter is an array of two integers, tracking the number of simulation steps this Elevator spends in a particular state.
     # array[0] represents the daily count, array[1] represents the hourly count
@@ -39,6 +42,12 @@ class Elevator:
     loading_counters = np.zeros((2,), dtype=int)
     returning_counters = np.zeros((2,), dtype=int)
 
+    # Load counters, tracked over the whole simulation
+    num_departures = 0 # Number of stops the Elevator left
+    departure_load_sum = 0 # Sum of the number of Persons onboard as the Elevator left each stop
+    max_load = 0 # Most Persons ever onboard at once
+    num_left_behind = 0 # Number of times a waiting Person didn't fit in the Elevator (a Person left behind twice counts twice)
+
     """
     
     Takes:
@@ -46,10 +55,13 @@ class Elevator:
     capacity - integer representing capacity of the Elevator
     starting_floor - integer representing initial position of the Elevator at start of simulation
     steps_per_load - integer representing the number of simulation steps the Elevator takes to onload/offload Persons
+    return_to_floor - integer representing the Floor id the Elevator returns to if using any "return" algorithms
+    num_floors - integer representing the number of Floors in the Building (Persons can get off at any of them)
+    stop_index - optional StopIndex of the Building to record the Elevator's stops in
 
-    Runs in O(1) time.
+    Runs in O(F*C) time, where F is the number of Floors and C is the capacity
     """
-    def __init__(self, id, capacity, starting_floor, steps_per_load, return_to_floor):
+    def __init__(self, id, capacity, starting_floor, steps_per_load, return_to_floor, num_floors, stop_index=None):
         self.id = id
         self.capacity = capacity
         self.cur_floor = starting_floor
@@ -57,9 +69,9 @@ class Elevator:
         self.return_to_floor = return_to_floor
         
         # Ensure memory is unique per instance
-        self.people_by_destination = deepcopy(self.people_by_destination)
-        self.up_stops = deepcopy(self.up_stops)
-        self.down_stops = deepcopy(self.down_stops)
+        self.manifest = Manifest(num_floors, capacity)
+        self.up_stops = StopSet(id, None if stop_index is None else stop_index.up_cars)
+        self.down_stops = StopSet(id, None if stop_index is None else stop_index.down_cars)
         #self.counters = deepcopy(self.counters)
         self.idle_counters = deepcopy(self.idle_counters)
         self.active_counters = deepcopy(self.active_counters)
@@ -121,4 +133,25 @@ class Elevator:
         self.is_loading = False
 
 
-        
\ No newline at end of file
+        
+
+    """
+    Records the Elevator's load as it leaves a stop, after Persons offload and onboard.
+
+    Runs in O(1) time
+    """
+    def record_departure(self):
+        load = self.manifest.load
+        self.num_departures += 1
+        self.departure_load_sum += load
+        if load > self.max_load:
+            self.max_load = load
+
+    """
+    Returns:
+    Float average fraction of the Elevator's capacity in use as it left its stops, 0 if it hasn't left one
+    """
+    def get_load_factor(self):
+        if self.num_departures == 0:
+            return 0.0
+        return self.departure_load_sum / (self.num_departures * self.capacity)
@@ -1,27 +1,91 @@
 import numpy as np
 
+"""
+Elevator dispatch policies. A policy is an ElevatorAlgorithm subclass registered under a name with register_elevator_algorithm.
+A Building resolves its policy by name once (get_elevator_algorithm), and Simulation calls the policy's hooks from then on without comparing algorithm names:
+
+    assign_hall_calls(building) - assigns the Building's new hall calls to Elevators, once per simulated step
+    assign_stop(elevators, floor_id, direction, stop_index) - assigns one hall call (the default assign_hall_calls assigns them one at a time)
+    end_route(building, elevator) - decides what an Elevator does when it runs out of stops
+    update(building) - runs once per simulated step before the Elevators move
+
+Steps skipped by the event Engine are not simulated, so policies that need update on every step should be run with the tick Engine.
+
+register_elevator_algorithm(name, algorithm_class)
+get_elevator_algorithm(name, num_floors)
+has_stop(elevators, floor_id, direction, stop_index)
+    is_picking_up_other_direction(elevator, floor_id, direction)
+assign_stop_nearest(elevators, floor_id, direction, stop_index)
+add_stop(elevator, floor_id, direction)
+"""
+
 class ElevatorAlgorithm:
-    algorithm = ""
+    algorithm = "" # Name the policy was resolved by
+    num_floors = 0 # Number of Floors in the Building the policy was resolved for
 
     """
     Takes:
-    algorithm - String representing the algorithm to use.
+    algorithm - String representing the name of the algorithm.
     """
     def __init__(self, algorithm):
         self.algorithm = algorithm
 
-    def assign_stop(self, elevators, requested_floor, direction):
-        if self.algorithm == "stay_where_stopped":
-            return assign_stop_SWS(elevators, requested_floor, direction)
-        elif self.algorithm == "return_to":
-            return assign_stop_RT(elevators, requested_floor, direction)
+    """
+    Assigns every Floor within the Building's "floors_new_up_button" and "floors_new_down_button" lists that an Elevator can take now.
+    Floors that aren't assigned stay in the lists to be assigned on a later step.
 
+    Takes:
+    building - Building class
+    """
+    def assign_hall_calls(self, building):
+        self.assign_new_button_presses(building, "up")
+        self.assign_new_button_presses(building, "down")
 
-"""
-simple algorithm:
+    """
+    Assigns the Floors within one of the Building's "floors_new_up_button" and "floors_new_down_button" lists with assign_stop, one at a time in the order the buttons were pressed.
+    Floors that aren't assigned stay in the list, in order.
 
-"""
+    Takes:
+    building - Building class
+    direction - String "up" for floors_new_up_button or "down" for floors_new_down_button
+    """
+    def assign_new_button_presses(self, building, direction):
+        new_button = building.floors_new_up_button if direction == "up" else building.floors_new_down_button
+        new_button[:] = [floor_id for floor_id in new_button if not self.assign_stop(building.elevators, floor_id, direction, building.stop_index)]
 
+    """
+    Assigns a requested stop to one of the Elevators.
+
+    Takes:
+    elevators - List of Elevator classes
+    floor_id - Integer id of the floor an elevator needs to stop at
+    direction - String representing direction of travel desired by people on floor_id, "up" or "down"
+    stop_index - optional StopIndex of the Building the elevators belong to, for O(1) lookup of already scheduled stops
+
+    Returns:
+    assigned - Boolean representing if the requested stop was successfully assigned.
+    """
+    def assign_stop(self, elevators, floor_id, direction, stop_index=None):
+        return assign_stop_nearest(elevators, floor_id, direction, stop_index)
+
+    """
+    Called when an Elevator finishes its last stop. The Elevator becomes idle where it stopped.
+
+    Takes:
+    building - Building class
+    elevator - Elevator class that needs to stop being active
+    """
+    def end_route(self, building, elevator):
+        elevator.set_state_idle()
+
+    """
+    Called once per simulated step, before the Elevators are updated. Does nothing.
+
+    Takes:
+    building - Building class
+    """
+    def update(self, building):
+        return
 
 """
 stay_where_stopped algorithm (SWS):
@@ -36,6 +100,8 @@ If there are no elevators moving towards the floor of the requested stop, the ne
 If there are no idle elevators, the requested stop is assigned to the elevator with the shortest stop list.
 If there are no idle elevators, the requested stop is assigned to the elevator who's last stop in it's stop list is closest to the floor of the requested stop.
 """
+class StayWhereStopped(ElevatorAlgorithm):
+    pass
 
 """
 return_to algorithm (RT):
@@ -45,164 +111,137 @@ Once it reaches this floor, it will remain idle there until assigned a stop.
 
 If an elevator is assigned a stop while in the "return to" state, it will switch to the "active" state and will move towards this assigned stop.
 """
+class ReturnTo(ElevatorAlgorithm):
+    """
+    Called when an Elevator finishes its last stop. The Elevator starts returning to its return_to_floor.
 
+    Takes:
+    building - Building class
+    elevator - Elevator class that needs to stop being active
+    """
+    def end_route(self, building, elevator):
+        if elevator.cur_floor == elevator.return_to_floor:
+            # Elevator becomes idle because it's already at its return_to_floor
+            elevator.set_state_idle()
 
+        elif elevator.cur_floor < elevator.return_to_floor:
+            # Elevator is below return_to_floor
+            elevator.set_state_returning(is_moving_up=True)
 
+        else:
+            # Elevator is above return_to_floor
+            elevator.set_state_returning(is_moving_up=False)
 
+# Keys are algorithm names and values are ElevatorAlgorithm subclasses
+elevator_algorithms = {}
 
 """
-Assigns a requested stop to one of the Elevators. (stay_where_stopped algorithm)
-Elevators using stay_where_stopped algorithm can be in "active", "idle", or "loading" states.
+Registers a dispatch policy so Buildings (and configurations) can use it by name.
 
 Takes:
-elevators - List of Elevator classes
-floor_id - Integer id of the floor an elevator needs to stop at
-direction - String representing direction of travel desired by people on floor_id, "up" or "down"
-
-Returns:
-assigned - Boolean representing if the requested stop was successfully assigned.
-
-Runs in as litte as O(E) and as long as O(4E) time, where E is number of Elevators
+name - String name of the algorithm
+algorithm_class - ElevatorAlgorithm subclass, constructed with the name
 """
+def register_elevator_algorithm(name, algorithm_class):
+    elevator_algorithms[name] = algorithm_class
 
-def assign_stop_SWS(elevators, floor_id, direction):
-    # Check if there is an Elevator that was previously scheduled to stop at the requested Floor
-    for elevator in elevators:
-        if direction == "up":
-            if floor_id in elevator.up_stops:
-                return True
-        else:
-            if floor_id in elevator.down_stops:
-                return True
+register_elevator_algorithm("stay_where_stopped", StayWhereStopped)
+register_elevator_algorithm("return_to", ReturnTo)
+register_elevator_algorithm("return_to_floor", ReturnTo) # Name used by older configurations
 
-    # Check if there is an idle Elevator on the correct Floor
-    for i in range(len(elevators)):
-        if elevators[i].is_idle and elevators[i].cur_floor == floor_id:
-            elevators[i].is_idle = False
-            elevators[i].is_active = True
+"""
+Takes:
+name - String name of a registered algorithm
+num_floors - integer number of Floors in the Building the algorithm is for
 
-            if direction == "up":
-                elevators[i].up_stops.append(floor_id)
-                elevators[i].is_moving_up = True
-            else:
-                elevators[i].down_stops.append(floor_id)
-                elevators[i].is_moving_up = False
-            return True
+Returns:
+New instance of the ElevatorAlgorithm subclass registered under name. Raises ValueError if there is none
+"""
+def get_elevator_algorithm(name, num_floors=0):
+    if name not in elevator_algorithms:
+        raise ValueError("Unknown elevator algorithm " + repr(name) + ", expected one of " + str(sorted(elevator_algorithms.keys())))
+    algorithm = elevator_algorithms[name](name)
+    algorithm.num_floors = num_floors
+    return algorithm
 
-    # Sort Elevators into elevators_idle and elevators_moving_towards (active AND loading Elevators can be 'moving towards')
-    elevators_idle = []
-    elevators_moving_towards = []
+"""
+Checks if an Elevator is already scheduled to stop at a Floor in a direction.
+A stop at an Elevator's deidled_floor only picks up Persons going in the deidled_floor_direction, whichever stop list it is in, so it doesn't count for the other direction.
 
-    for i in range(len(elevators)):
-        if elevators[i].is_idle:
-            elevators_idle.append(elevators[i])
-        
-        elif elevators[i].is_active or elevators[i].is_loading:
-            if direction == "up":
-                # Check if Elevator is moving up towards floor_id
-                if elevators[i].cur_floor < floor_id and elevators[i].is_moving_up and elevators[i].deidled_floor == -1:
-                    elevators_moving_towards.append(elevators[i])
-            else:
-                # Check if Elevator is moving down towards floor_id
-                if elevators[i].cur_floor > floor_id and not elevators[i].is_moving_up and elevators[i].deidled_floor == -1:
-                    elevators_moving_towards.append(elevators[i])
-            
-    # Assign the nearest elevator moving towards, if one exists
-    if len(elevators_moving_towards) != 0:
-        min_dist = np.inf
-        min_idx = 0
-        for i in range(len(elevators_moving_towards)):
-            dist = np.abs(floor_id - elevators_moving_towards[i].cur_floor)
-            if dist < min_dist:
-                min_dist = dist
-                min_idx = i
-        if direction == "up":
-            elevators_moving_towards[min_idx].up_stops.append(floor_id)
-        else:
-            elevators_moving_towards[min_idx].down_stops.append(floor_id)
+Takes:
+elevators - List of Elevator classes
+floor_id - Integer id of the floor
+direction - String "up" or "down"
+stop_index - optional StopIndex of the Building the elevators belong to
 
-    # If there are no elevators moving towards, assign nearest idle elevator, if one exists
-    elif len(elevators_idle) != 0:
-        min_dist = np.inf
-        min_idx = 0
-        for i in range(len(elevators_idle)):
-            dist = np.abs(floor_id - elevators_idle[i].cur_floor)
-            if dist < min_dist:
-                min_dist = dist
-                min_idx = i
+Returns:
+Boolean representing whether one of the elevators has the stop
 
-        if elevators_idle[min_idx].cur_floor < floor_id:
-            # Idle Elevator is below floor_id
-            elevators_idle[min_idx].up_stops.append(floor_id)
-            # Need to change state of Elevator here in case multiple stops need to be assigned during one simulation tick
-            elevators_idle[min_idx].is_idle = False
-            elevators_idle[min_idx].is_active = True
-            elevators_idle[min_idx].is_moving_up = True
-            elevators_idle[min_idx].deidled_floor = floor_id
-            elevators_idle[min_idx].deidled_floor_direction = direction
-        else:
-            # Idle Elevator is above floor_id
-            elevators_idle[min_idx].down_stops.append(floor_id)
-            # Need to change state of Elevator here in case multiple stops need to be assigned during one simulation tick
-            elevators_idle[min_idx].is_idle = False
-            elevators_idle[min_idx].is_active = True
-            elevators_idle[min_idx].is_moving_up = False
-            elevators_idle[min_idx].deidled_floor = floor_id
-            elevators_idle[min_idx].deidled_floor_direction = direction      
-    
-    # If there are no elevators moving towards and no idle elevators, this stop is not assigned yet. It will be assigned at a later simulation step when one of those two conditions are met.
-    else:
+Runs in O(1) time with a stop_index (O(E) if several Elevators have the stop), O(E) time without one, where E is number of Elevators
+"""
+def has_stop(elevators, floor_id, direction, stop_index=None):
+    if stop_index is not None:
+        if not stop_index.has_stop(floor_id, direction):
+            return False
+        cars = stop_index.up_cars[floor_id] if direction == "up" else stop_index.down_cars[floor_id]
+        while cars:
+            car_bit = cars & -cars
+            if not is_picking_up_other_direction(elevators[car_bit.bit_length() - 1], floor_id, direction):
+                return True
+            cars ^= car_bit
         return False
+    for elevator in elevators:
+        stops = elevator.up_stops if direction == "up" else elevator.down_stops
+        if floor_id in stops and not is_picking_up_other_direction(elevator, floor_id, direction):
+            return True
+    return False
 
-    return True
+"""
+Takes:
+elevator - Elevator class
+floor_id - Integer id of the floor
+direction - String "up" or "down"
 
+Returns:
+Boolean representing whether floor_id is the Elevator's deidled_floor, where it picks up Persons going the other way
 """
-Assigns a requested stop to one of the Elevators. (return_to algorithm)
-Elevators using return_to algorithm can be in "active", "idle", "loading", and "returning" states.
+def is_picking_up_other_direction(elevator, floor_id, direction):
+    return elevator.deidled_floor == floor_id and elevator.deidled_floor_direction != direction
+
+"""
+Assigns a requested stop to one of the Elevators (stay_where_stopped and return_to algorithms).
+Active, loading, and returning Elevators moving towards the requested floor can take it, as well as idle ones. Returning Elevators only exist under return_to.
 
 Takes:
 elevators - List of Elevator classes
 floor_id - Integer id of the floor an elevator needs to stop at
 direction - String representing direction of travel desired by people on floor_id, "up" or "down"
+stop_index - optional StopIndex of the Building the elevators belong to
 
 Returns:
 assigned - Boolean representing if the requested stop was successfully assigned.
 
-Runs in as litte as O(E) and as long as O(4E) time, where E is number of Elevators
+Runs in as litte as O(1) and as long as O(4E) time, where E is number of Elevators
 """
-def assign_stop_RT(elevators, floor_id, direction):
-    
+def assign_stop_nearest(elevators, floor_id, direction, stop_index=None):
     # Check if there is an Elevator that was previously scheduled to stop at the requested Floor
-    for elevator in elevators:
-        if direction == "up":
-            if floor_id in elevator.up_stops:
-                return True
-        else:
-            if floor_id in elevator.down_stops:
-                return True
+    if has_stop(elevators, floor_id, direction, stop_index):
+        return True
 
     # Check if there is an idle Elevator on the correct Floor
     for i in range(len(elevators)):
         if elevators[i].is_idle and elevators[i].cur_floor == floor_id:
-            elevators[i].is_idle = False
-            elevators[i].is_active = True
-
-            if direction == "up":
-                elevators[i].up_stops.append(floor_id)
-                elevators[i].is_moving_up = True
-            else:
-                elevators[i].down_stops.append(floor_id)
-                elevators[i].is_moving_up = False
+            add_stop(elevators[i], floor_id, direction)
             return True
 
-    # Sort Elevators into elevators_idle and elevators_moving_towards (active AND loading Elevators can be 'moving towards')
+    # Sort Elevators into elevators_idle and elevators_moving_towards (active, loading, AND returning Elevators can be 'moving towards')
     elevators_idle = []
     elevators_moving_towards = []
 
     for i in range(len(elevators)):
         if elevators[i].is_idle:
             elevators_idle.append(elevators[i])
-        
+
         elif elevators[i].is_active or elevators[i].is_loading or elevators[i].is_returning:
             if direction == "up":
                 # Check if Elevator is moving up towards floor_id
@@ -212,7 +251,7 @@ def assign_stop_RT(elevators, floor_id, direction):
                 # Check if Elevator is moving down towards floor_id
                 if elevators[i].cur_floor > floor_id and not elevators[i].is_moving_up and elevators[i].deidled_floor == -1:
                     elevators_moving_towards.append(elevators[i])
-            
+
     # Assign the nearest elevator moving towards, if one exists
     if len(elevators_moving_towards) != 0:
         min_dist = np.inf
@@ -222,10 +261,7 @@ def assign_stop_RT(elevators, floor_id, direction):
             if dist < min_dist:
                 min_dist = dist
                 min_idx = i
-        if direction == "up":
-            elevators_moving_towards[min_idx].up_stops.append(floor_id)
-        else:
-            elevators_moving_towards[min_idx].down_stops.append(floor_id)
+        add_stop(elevators_moving_towards[min_idx], floor_id, direction)
 
     # If there are no elevators moving towards, assign nearest idle elevator, if one exists
     elif len(elevators_idle) != 0:
@@ -237,162 +273,52 @@ def assign_stop_RT(elevators, floor_id, direction):
                 min_dist = dist
                 min_idx = i
 
-        if elevators_idle[min_idx].cur_floor < floor_id:
-            # Idle Elevator is below floor_id
-            elevators_idle[min_idx].up_stops.append(floor_id)
-            # Need to change state of Elevator here in case multiple stops need to be assigned during one simulation tick
-            elevators_idle[min_idx].is_idle = False
-            elevators_idle[min_idx].is_active = True
-            elevators_idle[min_idx].is_moving_up = True
-            elevators_idle[min_idx].deidled_floor = floor_id
-            elevators_idle[min_idx].deidled_floor_direction = direction
-        else:
-            # Idle Elevator is above floor_id
-            elevators_idle[min_idx].down_stops.append(floor_id)
-            # Need to change state of Elevator here in case multiple stops need to be assigned during one simulation tick
-            elevators_idle[min_idx].is_idle = False
-            elevators_idle[min_idx].is_active = True
-            elevators_idle[min_idx].is_moving_up = False
-            elevators_idle[min_idx].deidled_floor = floor_id
-            elevators_idle[min_idx].deidled_floor_direction = direction      
-    
+        add_stop(elevators_idle[min_idx], floor_id, direction)
+
     # If there are no elevators moving towards and no idle elevators, this stop is not assigned yet. It will be assigned at a later simulation step when one of those two conditions are met.
     else:
         return False
 
     return True
 
-    """
-    
-    # Check if there is an Elevator that was previously scheduled to stop at the requested Floor
-    for elevator in elevators:
-        if direction == "up":
-            if floor_id in elevator.up_stops:
-                return True
-        else:
-            if floor_id in elevator.down_stops:
-                return True
-
-    # Check if there is an idle elevator on the correct floor
-    for i in range(len(elevators)):
-        if elevators[i].is_idle and elevators[i].cur_floor == floor_id:
-            # Need to change state of Elevator here in case multiple stops need to be assigned during one simulation tick
-            elevators[i].is_idle = False
-            elevators[i].is_active = True
-            if direction == "up":
-                elevators[i].up_stops.append(floor_id)
-                elevators[i].is_moving_up = True
-            else:
-                elevators[i].down_stops.append(floor_id)
-                elevators[i].is_moving_up = False
-            return True
-    # Sort Elevators into idle, active, loading, and returning categories
-    elevators_idle = []
-    elevators_active = []
-    elevators_loading = []
-    elevators_returning = []
-    for i in range(len(elevators)):
-        if elevators[i].is_idle:
-            elevators_idle.append(elevators[i])
+"""
+Assigns a requested stop to an Elevator that can take it: an idle Elevator, or one moving towards floor_id in direction (see assign_stop_nearest).
 
-        elif elevators[i].is_active:
-            if direction == "up":
-                # Check if Elevator is moving up towards floor_id
-                if elevators[i].cur_floor < floor_id and elevators[i].is_moving_up and elevators[i].deidled_floor == -1:
-                    elevators_moving_towards.append(elevators[i])
-            else:
-                # Check if Elevator is moving down towards floor_id
-                if elevators[i].cur_floor > floor_id and not elevators[i].is_moving_up and elevators[i].deidled_floor == -1:
-                    elevators_moving_towards.append(elevators[i])
-        
-        elif elevators[i].is_loading:
-            #WIP
-        
-        elif elevators[i].is_returning:
-            elevators_returning.append(elevators[i])
-            
+Takes:
+elevator - Elevator class
+floor_id - Integer id of the floor the elevator needs to stop at
+direction - String representing direction of travel desired by people on floor_id, "up" or "down"
+"""
+def add_stop(elevator, floor_id, direction):
+    if not elevator.is_idle:
+        # Elevator is moving towards floor_id in direction
+        if direction == "up":
+            elevator.up_stops.add(floor_id)
         else:
-            
-
-    min_towards_dist = np.inf
-    min_towards_idx = 0
-    min_idle_dist = np.inf
-    min_idle_idx = 0
-    min_returning_dist = np.inf
-    min_returning_idx = np.inf
-
-    # Find the nearest Elevator moving towards, if one exists
-    if len(elevators_moving_towards) != 0:
-        for i in range(len(elevators_moving_towards)):
-            dist = np.abs(floor_id - elevators_moving_towards[i].cur_floor)
-            if dist < min_towards_dist:
-                min_towards_dist = dist
-                min_towards_idx = i
-
-    # Find the nearest Elevator returning, if one exists
-    if len(elevators_returning) != 0:
-        for i in range(len(elevators_returning)):
-            dist = np.abs(floor_id - elevators_returning[i].cur_floor)
-            if dist < min_returning_dist:
-                min_returning_dist = dist
-                min_returning_idx = i
-    
-    # Find nearest Elevator idle, if one exists
-    if len(elevators_idle) != 0:
-        for i in range(len(elevators_idle)):
-            dist = np.abs(floor_id - elevators_idle[i].cur_floor)
-            if dist < min_idle_dist:
-                min_idle_dist = dist
-                min_idle_idx = i
-
-    if min_towards_dist == np.inf and min_idle_dist == np.inf and min_returning_dist == np.inf:
-        return False # There are no Elevators eligable to take this stop
+            elevator.down_stops.add(floor_id)
 
-    # Assign stop to the nearest Elevator moving towards, idle, or returning
-    if min_towards_dist <= min_idle_dist and min_towards_dist <= min_returning_dist:
-        # Nearest Elevator is moving towards
+    elif elevator.cur_floor == floor_id:
+        # Idle Elevator is on floor_id, it picks people up in direction
+        elevator.is_idle = False
+        elevator.is_active = True
         if direction == "up":
-            elevators_moving_towards[min_towards_idx].up_stops.append(floor_id)
+            elevator.up_stops.add(floor_id)
+            elevator.is_moving_up = True
         else:
-            elevators_moving_towards[min_towards_idx].down_stops.append(floor_id)
+            elevator.down_stops.add(floor_id)
+            elevator.is_moving_up = False
 
-    elif min_idle_dist <= min_towards_dist and min_idle_dist <= min_returning_dist:
-        # Nearest Elevator is idle
-        if elevators_idle[min_idle_idx].cur_floor < floor_id:
+    else:
+        # Need to change state of Elevator here in case multiple stops need to be assigned during one simulation tick
+        elevator.is_idle = False
+        elevator.is_active = True
+        elevator.deidled_floor = floor_id
+        elevator.deidled_floor_direction = direction
+        if elevator.cur_floor < floor_id:
             # Idle Elevator is below floor_id
-            elevators_idle[min_idle_idx].up_stops.append(floor_id)
-            # Need to change state of Elevator here in case multiple stops need to be assigned during one simulation tick
-            elevators_idle[min_idle_idx].is_idle = False
-            elevators_idle[min_idle_idx].is_active = True
-            elevators_idle[min_idle_idx].is_moving_up = True
-            elevators_idle[min_idle_idx].deidled_floor = floor_id
-            elevators_idle[min_idle_idx].deidled_floor_direction = direction
+            elevator.up_stops.add(floor_id)
+            elevator.is_moving_up = True
         else:
             # Idle Elevator is above floor_id
-            elevators_idle[min_idle_idx].down_stops.append(floor_id)
-            # Need to change state of Elevator here in case multiple stops need to be assigned during one simulation tick
-            elevators_idle[min_idle_idx].is_idle = False
-            elevators_idle[min_idle_idx].is_active = True
-            elevators_idle[min_idle_idx].is_moving_up = False
-            elevators_idle[min_idle_idx].deidled_floor = floor_id
-            elevators_idle[min_idle_idx].deidled_floor_direction = direction      
-    
-    else:
-        # Nearest Elevator is returning
-        elevators_returning[min_returning_idx].is_returning = False
-        elevators_returning[min_returning_idx].is_active = True
-        elevators_returning[min_returning_idx].deidled_floor = floor_id
-        elevators_returning[min_returning_idx].deidled_floor_direction = direction
-        if elevators_returning[min_returning_idx].cur_floor < floor_id:
-            # Returning Elevator is below floor_id
-            elevators_returning[min_returning_idx].is_moving_up = True
-            
-        elif elevators_returning[min_returning_idx].cur_floor > floor_id:
-            # Returning Elevator is above floor_id
-            elevators_returning[min_returning_idx].is_moving_up = False
-        
-        else:
-            return False # If the nearest Elevator is returning and is on floor_id, the stop is not assigned because the Elevator is already moving through this floor.
-
-    return True
-    """
\ No newline at end of file
+            elevator.down_stops.add(floor_id)
+            elevator.is_moving_up = False
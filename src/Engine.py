@@ -0,0 +1,298 @@
+from bisect import bisect_right
+from tqdm import tqdm
+
+import Simulation
+import constants
+
+"""
+Engines that drive the Simulation functions through time. Both engines produce identical Buildings and Analytics for the same inputs.
+
+tick - Advances one step (constants.seconds_per_step) at a time, calling every Simulation function on every step.
+event - Simulates steps where something can happen (state changes, random trips, button presses, arrivals, loading completions, hour boundaries) exactly like the tick engine,
+        and jumps over the steps in between, moving Elevators and incrementing counters analytically.
+
+        simulate_step(building, analytics, day, step)
+        simulate_step_instrumented(building, analytics, day, step)
+    simulate_day_ticks(building, analytics, day, start_step, end_step)
+            get_elevator_skippable_steps(elevator)
+        get_skippable_steps(building, day, step, event_steps)
+        skip_steps(building, num_steps)
+    simulate_day_events(building, analytics, day, start_step, end_step)
+run_simulation(building, analytics, num_days, engine, progress, stop_step)
+"""
+
+engine_names = ["tick", "event"]
+
+"""
+Runs one step of the simulation loop.
+
+Takes:
+building - Building class
+analytics - Analytics class
+day - integer representing the day of the simulation (mod 7 gives the day of the week)
+step - integer representing the step number of the simulation on the given day
+"""
+def simulate_step(building, analytics, day, step):
+    building.cur_step = day * int(constants.steps_per_day) + step
+
+    analytics.evaluate_simulation(building, day, step)
+
+    Simulation.handle_state_changes_scheduled(building, day % 7, step) # First. Check if anybody not waiting for an elevator needs to start doing so.
+    Simulation.handle_new_button_presses(building)
+
+    Simulation.update_elevators(building) # Update all Elevators, active and idle. (handles stopping to onboard, offload, switching from active to idle or visa versa, moving Persons from Elevators to Floors or visa versa, etc.)
+    Simulation.increment_counters(building, day % 7) # Last. Update the counters of every Elevator.
+
+"""
+Runs one step of the simulation loop exactly like simulate_step, timing each phase into building.instrumentation (see Instrumentation).
+The Engines only call this when instrumentation is enabled, so simulate_step stays free of timing overhead.
+
+Takes:
+building - Building class with instrumentation enabled
+analytics - Analytics class
+day - integer representing the day of the simulation (mod 7 gives the day of the week)
+step - integer representing the step number of the simulation on the given day
+"""
+def simulate_step_instrumented(building, analytics, day, step):
+    instrumentation = building.instrumentation
+    clock = instrumentation.clock
+    building.cur_step = day * int(constants.steps_per_day) + step
+
+    start = clock()
+    analytics.evaluate_simulation(building, day, step)
+    t1 = clock()
+    Simulation.handle_state_changes_scheduled(building, day % 7, step)
+    t2 = clock()
+    Simulation.handle_new_button_presses(building)
+    t3 = clock()
+    Simulation.update_elevators(building)
+    t4 = clock()
+    Simulation.increment_counters(building, day % 7)
+    end = clock()
+
+    instrumentation.add_time("evaluate_simulation", t1 - start)
+    instrumentation.add_time("handle_state_changes_scheduled", t2 - t1)
+    instrumentation.add_time("handle_new_button_presses", t3 - t2)
+    instrumentation.add_time("update_elevators", t4 - t3)
+    instrumentation.add_time("increment_counters", end - t4)
+
+"""
+Returns:
+simulate_step_instrumented if the Building has instrumentation enabled, otherwise simulate_step
+"""
+def get_step_function(building):
+    if building.instrumentation is not None:
+        return simulate_step_instrumented
+    return simulate_step
+
+"""
+Simulates one day, one step at a time.
+
+Takes:
+building - Building class
+analytics - Analytics class
+day - integer representing the day of the simulation
+start_step - integer step of the day to start at (0 unless resuming part way through a day)
+end_step - integer step of the day to stop before (steps per day unless stopping part way through a day)
+
+Runs in O(S) simulation steps, where S is the number of steps in a day
+"""
+def simulate_day_ticks(building, analytics, day, start_step=0, end_step=None):
+    if end_step is None:
+        end_step = int(constants.steps_per_day)
+    simulate = get_step_function(building)
+    for step in range(start_step, end_step):
+        simulate(building, analytics, day, step)
+
+"""
+Determines how many upcoming steps an Elevator spends moving, loading, or sitting idle without reaching a stop, finishing a load, or changing state.
+Elevators whose state flags are inconsistent are never skipped, so the tick logic always handles them.
+
+Takes:
+elevator - Elevator class
+
+Returns:
+Integer number of steps that can be skipped for this Elevator (float("inf") if the Elevator is idle with no stops)
+
+Runs in O(1) time
+"""
+def get_elevator_skippable_steps(elevator):
+    if elevator.is_idle + elevator.is_active + elevator.is_loading + elevator.is_returning != 1:
+        return 0
+
+    if elevator.is_idle:
+        if len(elevator.up_stops) != 0 or len(elevator.down_stops) != 0:
+            return 0 # Elevator becomes active next step
+        return float("inf")
+
+    if elevator.is_loading:
+        return elevator.loading_steps - 1 # The step that takes loading_steps to 0 changes the Elevator's state
+
+    if elevator.is_returning:
+        if len(elevator.up_stops) != 0 or len(elevator.down_stops) != 0:
+            return 0 # Returning gets cancelled next step
+        if (elevator.return_to_floor > elevator.cur_floor) != elevator.is_moving_up:
+            return 0
+        return abs(elevator.return_to_floor - elevator.cur_floor)
+
+    # Elevator is active, it moves one Floor per step until it reaches its next stop in its direction of travel
+    if elevator.is_moving_up:
+        next_stop = elevator.up_stops.get_next_at_or_above(elevator.cur_floor)
+        if next_stop == -1:
+            return 0
+        return next_stop - elevator.cur_floor
+    else:
+        next_stop = elevator.down_stops.get_next_at_or_below(elevator.cur_floor)
+        if next_stop == -1:
+            return 0
+        return elevator.cur_floor - next_stop
+
+"""
+Determines how many steps after the given step can be skipped because nothing but Elevator movement and counter increments would happen in them.
+Steps with a random trip (see RandomTraffic) are never skipped.
+
+Takes:
+building - Building class
+day - integer representing the day of the simulation
+step - integer representing the step number that was just simulated
+event_steps - sorted list of step numbers with scheduled state changes on the given day
+
+Returns:
+Integer number of steps that can be skipped (0 if the next step must be simulated)
+
+Runs in O(E*S) time, where E is the number of Elevators and S is the number of stops each Elevator has
+"""
+def get_skippable_steps(building, day, step, event_steps):
+    # Unassigned button presses are retried every step, and may be assigned at any step as Elevators move
+    if len(building.floors_new_up_button) != 0 or len(building.floors_new_down_button) != 0:
+        return 0
+    if building.destination_dispatch is not None and len(building.destination_dispatch.new_requests) != 0:
+        return 0
+
+    steps_per_hour = int(constants.steps_per_hour)
+    next_hour_step = (step // steps_per_hour + 1) * steps_per_hour # Analytics evaluates hourly averages on this step
+    next_step = min(next_hour_step, int(constants.steps_per_day))
+
+    event_idx = bisect_right(event_steps, step)
+    if event_idx < len(event_steps):
+        next_step = min(next_step, event_steps[event_idx])
+
+    traffic = building.random_traffic
+    if traffic is not None:
+        # The next random trip step was drawn for the Persons on Floors at the time, it is redrawn on the next step if that changed
+        if sum(len(floor.people_on_floor) for floor in building.floors) != traffic.num_present:
+            return 0
+        next_step = min(next_step, traffic.next_trip_step - day * int(constants.steps_per_day))
+
+    skippable = next_step - step - 1
+    for elevator in building.elevators:
+        if skippable <= 0:
+            return 0
+        skippable = min(skippable, get_elevator_skippable_steps(elevator))
+
+    return max(0, int(skippable))
+
+"""
+Advances a Building by num_steps steps in which no state changes, button presses, stops, or Elevator state changes happen.
+Equivalent to calling Simulation.update_elevators and Simulation.increment_counters num_steps times.
+Persons need no updating, their waiting and riding time is computed from timestamps.
+
+Takes:
+building - Building class
+num_steps - integer number of steps to skip, as returned by get_skippable_steps
+
+Runs in O(E) time, where E is the number of Elevators
+"""
+def skip_steps(building, num_steps):
+    for elevator in building.elevators:
+        if elevator.is_idle:
+            elevator.idle_counters += num_steps
+
+        elif elevator.is_active:
+            elevator.cur_floor += num_steps if elevator.is_moving_up else -num_steps
+            elevator.active_counters += num_steps
+
+        elif elevator.is_loading:
+            elevator.loading_steps -= num_steps
+            elevator.loading_counters += num_steps
+
+        else:
+            elevator.cur_floor += num_steps if elevator.is_moving_up else -num_steps
+            elevator.returning_counters += num_steps
+
+"""
+Simulates one day, jumping over steps where nothing but Elevator movement and counter increments happen.
+
+Takes:
+building - Building class
+analytics - Analytics class
+day - integer representing the day of the simulation
+start_step - integer step of the day to start at (0 unless resuming part way through a day)
+end_step - integer step of the day to stop before (steps per day unless stopping part way through a day)
+
+Runs in O(V) simulated steps, where V is the number of steps with a state change, button press, stop, Elevator state change, or hour change
+"""
+def simulate_day_events(building, analytics, day, start_step=0, end_step=None):
+    if end_step is None:
+        end_step = int(constants.steps_per_day)
+    event_steps = sorted(building.state_change_calendar[day % 7].keys())
+    simulate = get_step_function(building)
+    instrumentation = building.instrumentation
+
+    step = start_step
+    while step < end_step:
+        simulate(building, analytics, day, step)
+
+        if instrumentation is None:
+            num_steps = min(get_skippable_steps(building, day, step, event_steps), end_step - step - 1)
+            if num_steps != 0:
+                skip_steps(building, num_steps)
+        else:
+            start = instrumentation.clock()
+            num_steps = min(get_skippable_steps(building, day, step, event_steps), end_step - step - 1)
+            instrumentation.add_time("get_skippable_steps", instrumentation.clock() - start)
+            if num_steps != 0:
+                start = instrumentation.clock()
+                skip_steps(building, num_steps)
+                instrumentation.add_time("skip_steps", instrumentation.clock() - start)
+        step += num_steps + 1
+
+"""
+Runs the simulation loop for a Building, starting at building.cur_step (0 for a new Building, or wherever a stopped or restored Building left off, see Checkpoint).
+Afterwards building.cur_step is the next step to simulate, so calling this again continues the same simulation.
+Persons' weekly Schedules repeat every 7 days, so num_days can be any number of weeks (e.g. a whole semester).
+
+Takes:
+building - Building class
+analytics - Analytics class
+num_days - integer number of days to simulate from the start of the simulation
+engine - string representing the engine to use, one of engine_names
+progress - boolean representing whether to display a progress bar
+stop_step - integer step (counted from the start of the simulation) to stop before, None to run until the end of day num_days
+"""
+def run_simulation(building, analytics, num_days=7, engine="tick", progress=True, stop_step=None):
+    if engine == "tick":
+        simulate_day = simulate_day_ticks
+    elif engine == "event":
+        simulate_day = simulate_day_events
+    else:
+        raise ValueError("Unknown engine '" + str(engine) + "', expected one of " + str(engine_names))
+
+    steps_per_day = int(constants.steps_per_day)
+    start_step = building.cur_step
+    if stop_step is None or stop_step > num_days * steps_per_day:
+        stop_step = num_days * steps_per_day
+
+    days = range(start_step // steps_per_day, (stop_step + steps_per_day - 1) // steps_per_day)
+    if progress:
+        days = tqdm(days)
+    for day in days:
+        day_start_step = max(start_step - day * steps_per_day, 0)
+        day_end_step = min(stop_step - day * steps_per_day, steps_per_day)
+        if day_start_step == 0:
+            Simulation.reset_state_changes(building, day % 7) # The weekly schedule starts over every 7 days
+            Simulation.reset_behavior_rng(building, day)
+        simulate_day(building, analytics, day, day_start_step, day_end_step)
+
+    # Final averages (computed by the caller) cover up to the last simulated step
+    building.cur_step = max(start_step, stop_step)
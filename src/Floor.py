@@ -1,15 +1,25 @@
+from collections import deque
 from copy import deepcopy
-from distutils.command import build
-from Person import Person
+import numpy as np
+
+from Person import Person, create_people, get_dest_floor_choices
+import RandomStreams
+import Schedule
+import StateChanges
+
+# Every resident brings visitors back with them with the same probability, and the same number of visitors on average (see Person)
+resident_prob_having_visitors = 0.25
+resident_avg_num_visitors = 2
 
 class Floor:
     id = -1
     num_residents = -1
     is_up_pressed = False
     is_down_pressed = False
-    people_on_floor = []
-    people_going_up = []
-    people_going_down = []
+    people_on_floor = [] # Persons on the Floor in no particular order. Use add_person and remove_person, which keep each Person's floor_idx up to date
+    # FIFO queues of Persons waiting for an Elevator, in order of arrival (Person.wait_start_step is set as they join)
+    people_going_up = deque()
+    people_going_down = deque()
     
     """
     Initializes a Floor class by setting id and num_residents, deepcopying lists to ensure unique memory between instances, and generating People to populate people_on_floor
@@ -18,10 +28,14 @@ class Floor:
     id - integer representing id of the Floor
     num_residents - integer representing number of residents of the Floor
     building_dest_floors_by_state_name - dictionary where keys are state names (strings) and values are lists of potential destination Floor ids for any given state from a Building's perspective
+    schedules - optional numpy array of shape (num_residents, 7, 24) of pregenerated schedules for the residents (see Schedule.generate_schedules). Each resident generates their own if not given.
+    people - optional list of num_residents already generated Persons (e.g. loaded with PopulationArtifact.load_population_artifact) to use instead of generating residents
+    rng - optional numpy Generator to generate residents from (see Person), None to use one seeded from NumPy's global random state
+    first_person_id - integer id of the Floor's first resident, the others get the following ids (Buildings number residents consecutively across Floors, so ids are unique)
     
     Runs in O(P) time, where P is the number of People living on the Floor
     """
-    def __init__(self, id, num_residents, building_dest_floors_by_state_name):
+    def __init__(self, id, num_residents, building_dest_floors_by_state_name, schedules=None, people=None, rng=None, first_person_id=0):
         # Ensure memory is unique per instance
         self.people_on_floor = deepcopy(self.people_on_floor)
         self.people_going_up = deepcopy(self.people_going_up)
@@ -30,10 +44,81 @@ class Floor:
         self.id = id
         self.num_residents = num_residents
 
+        if people is not None:
+            for person in people:
+                self.add_person(person)
+            return
+
+        if rng is None:
+            rng = RandomStreams.get_global_generator()
+
+        # Every resident of the Floor shares the same destination floor choices
+        dest_floor_choices = get_dest_floor_choices(building_dest_floors_by_state_name, self.id)
         for i in range(num_residents):
-            person_id = int(str(self.id) + str(i))
-            prob_having_visitors = 0.25
-            avg_num_visitors = 2
+            schedule = None if schedules is None else schedules[i]
+
+            person = Person(id=first_person_id + i, home_floor=self.id, prob_having_visitors=resident_prob_having_visitors, avg_num_visitors=resident_avg_num_visitors, building_dest_floors_by_state_name=building_dest_floors_by_state_name, schedule=schedule,
+                            dest_floor_choices=dest_floor_choices, rng=rng)
+            self.add_person(person)
+
+    """
+    Adds a Person to people_on_floor.
+
+    Takes:
+    person - Person class
+
+    Runs in O(1) time
+    """
+    def add_person(self, person):
+        person.floor_idx = len(self.people_on_floor)
+        self.people_on_floor.append(person)
+
+    """
+    Removes a Person from people_on_floor by moving the last Person on the Floor into their place.
+
+    Takes:
+    person - Person class on the Floor
+
+    Runs in O(1) time (O(P) if people_on_floor was changed without add_person and remove_person, where P is the number of People on the Floor)
+    """
+    def remove_person(self, person):
+        i = person.floor_idx
+        if i < 0 or i >= len(self.people_on_floor) or self.people_on_floor[i] is not person:
+            i = self.people_on_floor.index(person)
+        last = self.people_on_floor.pop()
+        if last is not person:
+            self.people_on_floor[i] = last
+            last.floor_idx = i
+        person.floor_idx = -1
+
+"""
+Bulk construction path for very large populations. Generates the residents of every Floor of a Building in one pass, instead of one Person.__init__ at a time:
+all schedules at once (Schedule.generate_schedules), all state change data at once (StateChanges.generate_state_changes, shared by every resident),
+one destination floor choices table per Floor, and Persons created without running Person.__init__. Residents are numbered consecutively from 0 in Floor order.
+
+Takes:
+floor_populations - list of integers representing the number of residents on each Floor
+building_dest_floors_by_state_name - dictionary where keys are state names (strings) and values are lists of potential destination Floor ids for any given state from a Building's perspective
+rng - numpy Generator to generate residents from
+
+Returns:
+List (one per Floor) of lists of Persons, to pass to Floor as people
+
+Runs in O(P) time (mostly vectorized), where P is the number of residents
+"""
+def generate_residents(floor_populations, building_dest_floors_by_state_name, rng):
+    population = sum(floor_populations)
+    schedules = Schedule.generate_schedules(population, rng)
+    state_changes = StateChanges.generate_state_changes(schedules, rng)
+
+    home_floors = np.repeat(np.arange(len(floor_populations)), floor_populations).tolist()
+    dest_floor_choices_by_floor = {floor_id: get_dest_floor_choices(building_dest_floors_by_state_name, floor_id) for floor_id in range(len(floor_populations)) if floor_populations[floor_id] != 0}
+    people = create_people(list(range(population)), home_floors, [resident_prob_having_visitors] * population, [resident_avg_num_visitors] * population, schedules, dest_floor_choices_by_floor)
+    StateChanges.bind_state_changes(people, state_changes)
 
-            person = Person(id=person_id, home_floor=self.id, prob_having_visitors=prob_having_visitors, avg_num_visitors=avg_num_visitors, building_dest_floors_by_state_name=building_dest_floors_by_state_name)
-            self.people_on_floor.append(person)
+    people_by_floor = []
+    first_resident = 0
+    for floor_population in floor_populations:
+        people_by_floor.append(people[first_resident:first_resident + floor_population])
+        first_resident += floor_population
+    return people_by_floor
@@ -0,0 +1,126 @@
+from copy import deepcopy
+import time
+
+"""
+Opt-in profiling of a simulation run. Keeps wall clock timers and call counts for each phase of the simulation loop and for ElevatorAlgorithm.assign_stop,
+plus counters of simulation events (hall calls, stops, boardings, alightings).
+
+Instrumentation is disabled unless enable_instrumentation is called on a Building. While disabled, the Engine runs its plain simulate_step,
+assign_stop is not wrapped, and Simulation only pays for an "is not None" check where events happen.
+
+enable_instrumentation(building)
+"""
+
+# Names of the timed phases, in the order Engine.simulate_step runs them (assign_stop runs within handle_new_button_presses, get_skippable_steps and skip_steps only within the event engine)
+phase_names = ["evaluate_simulation", "handle_state_changes_scheduled", "handle_new_button_presses", "assign_stop", "update_elevators", "increment_counters", "get_skippable_steps", "skip_steps"]
+
+# Names of the counted events
+event_names = [
+    "hall_calls", # A Floor's up or down button was pressed while unpressed
+    "destination_requests", # A Person started waiting and registered their destination (destination dispatch, which has no buttons)
+    "stops", # An Elevator stopped at a Floor to onboard or offload
+    "boardings", # A Person got on an Elevator
+    "alightings", # A Person got off an Elevator
+    "left_behind", # A waiting Person didn't fit in the Elevator that stopped for them
+]
+
+class Instrumentation:
+    # Keys are phase_names, values are total seconds spent in that phase / number of times that phase ran
+    phase_seconds = {}
+    phase_calls = {}
+
+    # Keys are event_names, values are integer number of times that event happened
+    event_counts = {}
+
+    clock = time.perf_counter
+
+    """
+    Ensures all class dictionaries use unique memory for each Instrumentation instance
+    """
+    def __init__(self):
+        self.phase_seconds = deepcopy(self.phase_seconds)
+        self.phase_calls = deepcopy(self.phase_calls)
+        self.event_counts = deepcopy(self.event_counts)
+        for name in phase_names:
+            self.phase_seconds[name] = 0.0
+            self.phase_calls[name] = 0
+        for name in event_names:
+            self.event_counts[name] = 0
+
+    """
+    Takes:
+    name - string phase name, one of phase_names
+    seconds - float seconds spent in one call of the phase
+    """
+    def add_time(self, name, seconds):
+        self.phase_seconds[name] += seconds
+        self.phase_calls[name] += 1
+
+    """
+    Takes:
+    name - string event name, one of event_names
+    amount - integer number of events that happened
+    """
+    def count_event(self, name, amount=1):
+        self.event_counts[name] += amount
+
+    """
+    Replaces an ElevatorAlgorithm's assign_stop with a timed version for this instance only.
+
+    Takes:
+    elevator_algorithm - ElevatorAlgorithm class
+    """
+    def wrap_assign_stop(self, elevator_algorithm):
+        assign_stop = elevator_algorithm.assign_stop
+        clock = self.clock
+        def timed_assign_stop(elevators, requested_floor, direction, stop_index=None):
+            start = clock()
+            assigned = assign_stop(elevators, requested_floor, direction, stop_index)
+            self.add_time("assign_stop", clock() - start)
+            return assigned
+        elevator_algorithm.assign_stop = timed_assign_stop
+
+    """
+    Returns:
+    Dictionary with keys "phases" (phase name to dictionary with keys "seconds", "calls", "mean_microseconds") and "events" (event name to count)
+    """
+    def get_report(self):
+        phases = {}
+        for name in phase_names:
+            calls = self.phase_calls[name]
+            phases[name] = {
+                "seconds": self.phase_seconds[name],
+                "calls": calls,
+                "mean_microseconds": self.phase_seconds[name] / calls * 1e6 if calls != 0 else 0.0,
+            }
+        return {"phases": phases, "events": dict(self.event_counts)}
+
+    def print_report(self):
+        report = self.get_report()
+        # assign_stop is part of handle_new_button_presses, so it isn't added to the total
+        total_seconds = sum(stats["seconds"] for name, stats in report["phases"].items() if name != "assign_stop")
+
+        print("Phase".ljust(32) + "Calls".rjust(12) + "Seconds".rjust(12) + "% Total".rjust(10) + "Mean us".rjust(12))
+        for name, stats in report["phases"].items():
+            if stats["calls"] == 0:
+                continue
+            percent = 100 * stats["seconds"] / total_seconds if total_seconds != 0 else 0.0
+            print(name.ljust(32) + str(stats["calls"]).rjust(12) + "{:12.4f}".format(stats["seconds"]) + "{:10.1f}".format(percent) + "{:12.2f}".format(stats["mean_microseconds"]))
+        print("Total".ljust(32) + "".rjust(12) + "{:12.4f}".format(total_seconds))
+
+        for name, count in report["events"].items():
+            print(name + ":", count)
+
+"""
+Turns on instrumentation for a Building. The Engine and Simulation functions record into building.instrumentation from then on.
+
+Takes:
+building - Building class
+
+Returns:
+Instrumentation class attached to the Building
+"""
+def enable_instrumentation(building):
+    building.instrumentation = Instrumentation()
+    building.instrumentation.wrap_assign_stop(building.elevator_algorithm)
+    return building.instrumentation
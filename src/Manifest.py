@@ -0,0 +1,84 @@
+import numpy as np
+
+class Manifest:
+    # Array of shape (F,). Number of passengers getting off at each Floor
+    counts = None
+    # Object array of shape (F, S) of Persons. Row f packs the passengers getting off at Floor f into its first counts[f] slots, the other slots are None
+    passengers = None
+    # Total number of passengers onboard (the sum of counts)
+    load = 0
+
+    """
+    Initializes an empty Manifest.
+
+    Takes:
+    num_floors - integer number of Floors in the Building, at least 1
+    capacity - integer capacity of the Elevator. Each Floor starts with this many slots, and gets more if an Elevator is ever loaded past capacity
+
+    Runs in O(F*C) time, where F is the number of Floors and C is the capacity
+    """
+    def __init__(self, num_floors, capacity):
+        if num_floors < 1:
+            raise ValueError("A Manifest needs at least one Floor, got num_floors=" + str(num_floors))
+        self.counts = np.zeros((num_floors,), dtype=np.int32)
+        self.passengers = np.full((num_floors, max(1, capacity)), None, dtype=object)
+        self.load = 0
+
+    """
+    Adds a passenger getting off at their dest_floor.
+
+    Takes:
+    person - Person class
+
+    Runs in O(1) amortized time
+    """
+    def add(self, person):
+        floor_id = person.dest_floor
+        count = int(self.counts[floor_id])
+        if count == self.passengers.shape[1]:
+            # Double the slots of every Floor
+            self.passengers = np.concatenate((self.passengers, np.full(self.passengers.shape, None, dtype=object)), axis=1)
+        self.passengers[floor_id, count] = person
+        self.counts[floor_id] = count + 1
+        self.load += 1
+
+    """
+    Takes:
+    floor_id - integer Floor id
+
+    Returns:
+    List of the passengers getting off at floor_id, in the order they boarded
+    """
+    def get_passengers(self, floor_id):
+        return self.passengers[floor_id, :self.counts[floor_id]].tolist()
+
+    """
+    Removes every passenger getting off at a Floor.
+
+    Takes:
+    floor_id - integer Floor id
+
+    Returns:
+    List of the removed passengers, in the order they boarded
+
+    Runs in O(R) time, where R is the number of passengers removed
+    """
+    def remove_passengers(self, floor_id):
+        count = int(self.counts[floor_id])
+        if count == 0:
+            return []
+        people = self.passengers[floor_id, :count].tolist()
+        self.passengers[floor_id, :count] = None # Don't keep references to Persons who got off
+        self.counts[floor_id] = 0
+        self.load -= count
+        return people
+
+    """
+    Returns:
+    List of every passenger, by destination Floor then in the order they boarded
+    """
+    def get_all_passengers(self):
+        people = []
+        for floor_id in np.flatnonzero(self.counts).tolist():
+            people += self.get_passengers(floor_id)
+        return people
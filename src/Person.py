@@ -1,40 +1,41 @@
-from random import random
 import numpy as np
 from copy import deepcopy
+import RandomStreams
 import Schedule
+import StateChanges
 
 class Person:
-    id = -1
-    home_floor = -1
-    cur_floor = -1
-    dest_floor = -1
+    # Persons only store these attributes (no per-instance __dict__), so a large population stays small. Defaults are set in __init__.
+    __slots__ = (
+        "id",
+        "floor_idx", # Index of the Person within their Floor's people_on_floor list, -1 when not in one (see Floor.add_person)
+        "home_floor",
+        "cur_floor",
+        "dest_floor",
 
-    cur_num_visitors = 0
-    prob_having_visitors = 0.0
-    avg_num_visitors = -1
+        "is_traveling", # True while the Person is waiting for or riding an Elevator (not in their Floor's people_on_floor list)
+        "elevator_id", # Id of the Elevator the Person is assigned to while waiting under destination dispatch (see DestinationDispatch), -1 otherwise
 
-    #daily_steps_waiting = 0
-    #hourly_steps_waiting = 0
-    #daily_steps_riding = 0
-    #hourly_steps_riding = 0
+        "cur_num_visitors",
+        "prob_having_visitors",
+        "avg_num_visitors",
 
-    # List of integers used to count simulation steps spent in various states
-    # Idxs and uses: 0 - daily steps waiting, 1 - hourly steps waiting, 2 - daily steps riding,
-    #                3 - hourly steps riding
-    #counters = np.zeros((6,), dtype=int)
-    waiting_counters = np.zeros((2,), dtype=int)
-    riding_counters = np.zeros((2,), dtype=int)
+        # Simulation steps (counted from the start of the simulation) at which the Person's current trip started. -1 when not traveling.
+        # Waiting and riding time are computed from these by Analytics instead of being counted every step.
+        "wait_start_step", # Step the Person started waiting for an Elevator
+        "board_step", # Step the Person boarded an Elevator
 
-    schedule = [] # Numpy array of shape (7, N) where N is the number of time chunks in a given day.
-    state_change_steps = [] # Precise step numbers to change state. Idxs correspond to items in state_change_ids. Contains step numbers for the entire week, but steps are within a day
-    state_change_ids = [] # Int tuples. (3, 4) means a state change from 3 to 4
+        "schedule", # Numpy int8 array of shape (7, N) where N is the number of time chunks in a given day.
+        "state_changes", # StateChanges class holding the Person's weekly state change data (step numbers within a day and (old state, new state) ids) and which of them were handled. Usually shared by every resident of a Building
+        "state_change_row", # Row of the Person within state_changes
 
-    dest_floors_by_state_name = {} # Stores possible destination floors for each state of a Person. Keys are state names (strings) and values are lists of integers representing Floor ids
+        "dest_floor_choices", # Possible destination floors for each state of a Person. Tuple indexed by state id of tuples of Floor ids. Shared (read only) between Persons with the same home floor
+    )
 
     """
     Initializes a Person class by setting id, home_floor, prob_having_visitors, avg_num_visitors, and avg_num_visitors.
     Generates a schedule for the Person then, using that schedule, generates state change data to determine exact steps for state changes in the simulation.
-    Generates dest_floors_by_state_name by combining building_dest_floors_by_state_name with the Person's home_floor
+    Generates dest_floor_choices by combining building_dest_floors_by_state_name with the Person's home_floor, unless dest_floor_choices are given
 
     Takes:
     id - integer representing the id of the Person
@@ -42,98 +43,187 @@ class Person:
     prob_having_visitors - float between 0.0 and 1.0 representing the probabilitiy of the Person to bring visitors back with them when they travel from the 1st floor
     avg_num_visitors - integer representing the average number of visitors the Person brings back with them
     building_dest_floors_by_state_name - dictionary where keys are state names (strings) and values are lists of potential destination Floor ids for any given state from a Building's perspective
+    schedule - optional numpy array of shape (7, 24) to use instead of generating a schedule, e.g. one of the schedules from Schedule.generate_schedules
+    dest_floor_choices - optional tuple from get_dest_floor_choices(building_dest_floors_by_state_name, home_floor) to share with other residents of the same home floor
+    rng - optional numpy Generator to generate the Person's schedule and state change data from (e.g. a Building's RandomStreams.population), None to use one seeded from NumPy's global random state
 
-    Runs in O(1) + O(generate_schedule) + O(generate_state_change_data) + O(generate_dest_floors_by_state_name):
+    Runs in O(1) + O(generate_schedule) + O(generate_state_change_data) + O(generate_dest_floor_choices):
     O(1) + + (O(D) + O(C^2)) + O(1)
 
     """
-    def __init__(self, id, home_floor, prob_having_visitors, avg_num_visitors, building_dest_floors_by_state_name):
+    def __init__(self, id, home_floor, prob_having_visitors, avg_num_visitors, building_dest_floors_by_state_name, schedule=None, dest_floor_choices=None, rng=None):
         self.id = id
+        self.floor_idx = -1
         self.home_floor = home_floor
         self.cur_floor = home_floor
+        self.dest_floor = -1
+        self.is_traveling = False
+        self.elevator_id = -1
+        self.cur_num_visitors = 0
         self.prob_having_visitors = prob_having_visitors
         self.avg_num_visitors = avg_num_visitors
+        self.wait_start_step = -1
+        self.board_step = -1
 
-        # Ensure memory is unique per instance
-        #self.steps_waiting = deepcopy(self.steps_waiting)
-        #self.steps_riding = deepcopy(self.steps_riding)
+        if rng is None:
+            rng = RandomStreams.get_global_generator()
 
-        self.schedule = deepcopy(self.schedule)
-        self.schedule = Schedule.generate_schedule()
-        self.state_change_steps = deepcopy(self.state_change_steps)
-        self.state_change_ids = deepcopy(self.state_change_ids)
-        #self.counters = deepcopy(self.counters)
-        self.waiting_counters = deepcopy(self.waiting_counters)
-        self.riding_counters = deepcopy(self.riding_counters)
+        if schedule is None:
+            self.schedule = Schedule.generate_schedule(rng).astype(np.int8)
+        else:
+            self.schedule = schedule
 
-        self.generate_state_change_data()
-        self.generate_dest_floors_by_state_name(building_dest_floors_by_state_name)
+        self.generate_state_change_data(rng)
+        if dest_floor_choices is None:
+            self.generate_dest_floor_choices(building_dest_floors_by_state_name)
+        else:
+            self.dest_floor_choices = dest_floor_choices
 
     """
-    Computes state_change_steps and state_change_idx. These are used to store the exact step number that a person changes state, as well as what states they change between.
-    state_change_steps[i] and state_change_ids[i] will be the same length, but that length may differ between i's, as it is dependent upon how many state changes a schedule has in a given day.
+    Computes the Person's state change data: the exact step number that a person changes state, as well as what states they change between.
+    The number of state changes may differ between days, as it is dependent upon how many state changes a schedule has in a given day.
+    The data is stored in a new single row StateChanges (Buildings later merge every resident's row into one shared StateChanges).
+
+    Takes:
+    rng - numpy Generator to draw the randomized steps from, None to use one seeded from NumPy's global random state
     
-    Runs in O(D) + O(C^2) where D is the number of days in a schedule and C is the number of chunks in a day:
+    Runs in O(D*C) vectorized time, where D is the number of days in a schedule and C is the number of chunks in a day
+    """
+    def generate_state_change_data(self, rng=None):
+        if rng is None:
+            rng = RandomStreams.get_global_generator()
+
+        self.state_changes = StateChanges.generate_state_changes(self.schedule[None], rng)
+        self.state_change_row = 0
+
     """
-    def generate_state_change_data(self):
-        state_change_steps = []
-        state_change_ids = []
-        cur_state = self.schedule[0, 0]
-        for day in range(self.schedule.shape[0]):
-            daily_steps = []
-            daily_ids = []
-            # Each j represents 1 hour. 1hr = 3600s. 1 step = 3.5s. 3600/3.5 = 1028.5 steps
-            for j in range(self.schedule.shape[1]):
-                next_state = self.schedule[day, j]
-                if next_state != cur_state:
-                    true_step = 1028 * j
-                    randomized_true_step = 0
-                    if j == 0:
-                        # Then we can't be early for state change (since daily step number would be negative, it starts at 0 each day), allow people to be twice as late
-                        randomized_true_step = true_step + np.random.randint(0, 686)
-                    else:
-                        randomized_true_step = true_step + np.random.randint(-343, 343) # 343 is roughly 1/3 of an hour in steps, so people can be up to 20 mins early or late when switching activities
-                    
-                    daily_steps.append(randomized_true_step)
-                    daily_ids.append((cur_state, next_state))
-                    cur_state = next_state
-            state_change_steps.append((np.asarray(daily_steps)))
-            state_change_ids.append((np.asarray(daily_ids)))
-
-        self.state_change_steps = (np.asarray(state_change_steps, dtype=object))
-        self.state_change_ids = (np.asarray(state_change_ids, dtype=object))
-        
-        return
+    Takes:
+    day - integer representing day of the week (0-6 where 0 corresponds to Sunday and 6 corresponds to Saturday)
 
+    Returns:
+    Numpy array (view) of the steps of the Person's state changes on day that haven't been handled or skipped yet, in order
     """
-    Sets dest_floors_by_state_name by adding the Person's home floor to the appropriate state's destination floors in building_dest_floors_by_state_name.
+    def get_state_change_steps(self, day):
+        return self.state_changes.get_steps(self.state_change_row, day)
+
+    """
+    Takes:
+    day - integer representing day of the week (0-6 where 0 corresponds to Sunday and 6 corresponds to Saturday)
+
+    Returns:
+    Numpy array (view) of shape (C, 2) of the Person's state changes on day that haven't been handled or skipped yet, in order
+    """
+    def get_state_change_ids(self, day):
+        return self.state_changes.get_ids(self.state_change_row, day)
+
+    """
+    Consumes the Person's next state change on a day.
+
+    Takes:
+    day - integer representing day of the week (0-6 where 0 corresponds to Sunday and 6 corresponds to Saturday)
+
+    Returns:
+    Integer state id the Person changes to
+    """
+    def pop_state_change(self, day):
+        return self.state_changes.pop(self.state_change_row, day)
+
+    """
+    Sets dest_floor_choices by adding the Person's home floor to the appropriate state's destination floors in building_dest_floors_by_state_name.
 
     Takes:
     building_dest_floors_by_state_name - Dictionary where keys are state names (strings) and values are lists of potential destination Floor ids for any given state from a Building's perspective (Building doesn't know the home floor of a Person)
     
     Runs in O(1)
     """
-    def generate_dest_floors_by_state_name(self, building_dest_floors_by_state_name):
-        self.dest_floors_by_state_name = deepcopy(building_dest_floors_by_state_name)
-        
-        # Check if various state names exist, and if so, add the person's home floor if it is not already present
-        # If a state is not already in the keys, that means that state was not included in the simulation setup (parameters that trickled down to Person from Building)
-        if "class" in self.dest_floors_by_state_name.keys():
-            if not self.home_floor in self.dest_floors_by_state_name["class"]:
-                self.dest_floors_by_state_name["class"].append(self.home_floor) # If we want some classes to be done virtually at home
-        if "sleep" in self.dest_floors_by_state_name.keys():
-            if not self.home_floor in self.dest_floors_by_state_name["sleep"]:
-                self.dest_floors_by_state_name["sleep"].append(self.home_floor) # Sleep occurs at home
-        if "meal" in self.dest_floors_by_state_name.keys():
-            if not self.home_floor in self.dest_floors_by_state_name["meal"]:
-                self.dest_floors_by_state_name["meal"].append(self.home_floor) # Meals can occur at home
-        if "exercise" in self.dest_floors_by_state_name.keys():
-            if not self.home_floor in self.dest_floors_by_state_name["exercise"]:
-                self.dest_floors_by_state_name["exercise"].append(self.home_floor) # If we want some exercises to be done at home
-        if "chores" in self.dest_floors_by_state_name.keys():
-            if not self.home_floor in self.dest_floors_by_state_name["chores"]:
-                self.dest_floors_by_state_name["chores"].append(self.home_floor) # Chores occur at home
-        if "study" in self.dest_floors_by_state_name.keys():
-            if not self.home_floor in self.dest_floors_by_state_name["study"]:
-                self.dest_floors_by_state_name["study"].append(self.home_floor) # If we want some studying to be done at home
+    def generate_dest_floor_choices(self, building_dest_floors_by_state_name):
+        self.dest_floor_choices = get_dest_floor_choices(building_dest_floors_by_state_name, self.home_floor)
+
+"""
+Combines a Building's destination floors with a home floor.
+
+Takes:
+building_dest_floors_by_state_name - Dictionary where keys are state names (strings) and values are lists of potential destination Floor ids for any given state from a Building's perspective
+home_floor - integer representing the home Floor id
 
+Returns:
+Dictionary where keys are state names (strings) and values are lists of integers representing Floor ids
+
+Runs in O(1)
+"""
+def get_dest_floors_by_state_name(building_dest_floors_by_state_name, home_floor):
+    dest_floors_by_state_name = deepcopy(building_dest_floors_by_state_name)
+    
+    # Check if various state names exist, and if so, add the person's home floor if it is not already present
+    # If a state is not already in the keys, that means that state was not included in the simulation setup (parameters that trickled down to Person from Building)
+    if "class" in dest_floors_by_state_name.keys():
+        if not home_floor in dest_floors_by_state_name["class"]:
+            dest_floors_by_state_name["class"].append(home_floor) # If we want some classes to be done virtually at home
+    if "sleep" in dest_floors_by_state_name.keys():
+        if not home_floor in dest_floors_by_state_name["sleep"]:
+            dest_floors_by_state_name["sleep"].append(home_floor) # Sleep occurs at home
+    if "meal" in dest_floors_by_state_name.keys():
+        if not home_floor in dest_floors_by_state_name["meal"]:
+            dest_floors_by_state_name["meal"].append(home_floor) # Meals can occur at home
+    if "exercise" in dest_floors_by_state_name.keys():
+        if not home_floor in dest_floors_by_state_name["exercise"]:
+            dest_floors_by_state_name["exercise"].append(home_floor) # If we want some exercises to be done at home
+    if "chores" in dest_floors_by_state_name.keys():
+        if not home_floor in dest_floors_by_state_name["chores"]:
+            dest_floors_by_state_name["chores"].append(home_floor) # Chores occur at home
+    if "study" in dest_floors_by_state_name.keys():
+        if not home_floor in dest_floors_by_state_name["study"]:
+            dest_floors_by_state_name["study"].append(home_floor) # If we want some studying to be done at home
+    return dest_floors_by_state_name
+
+"""
+Precomputes the destination floor choices of every state for a home floor. Every resident of the same home floor gets the same choices, so Floors compute them once and share them.
+
+Takes:
+building_dest_floors_by_state_name - Dictionary where keys are state names (strings) and values are lists of potential destination Floor ids for any given state from a Building's perspective
+home_floor - integer representing the home Floor id
+
+Returns:
+Tuple indexed by state id (see Schedule.state_name_by_id) of tuples of Floor ids. States missing from building_dest_floors_by_state_name have no choices.
+"""
+def get_dest_floor_choices(building_dest_floors_by_state_name, home_floor):
+    dest_floors_by_state_name = get_dest_floors_by_state_name(building_dest_floors_by_state_name, home_floor)
+    return tuple(tuple(int(floor) for floor in dest_floors_by_state_name.get(Schedule.state_name_by_id[state], [])) for state in range(len(Schedule.state_name_by_id)))
+
+"""
+Creates many Persons at once without running Person.__init__ (nothing is generated), e.g. from arrays generated in bulk or loaded from disk.
+The Persons' state_changes are not set, bind them with StateChanges.bind_state_changes.
+
+Takes:
+ids - list of integer Person ids
+home_floors - list of integer home Floor ids
+prob_having_visitors - list of floats between 0.0 and 1.0 (see Person)
+avg_num_visitors - list of integers (see Person)
+schedules - numpy array of shape (P, 7, 24) of the Persons' schedules (each Person keeps a view of their row)
+dest_floor_choices_by_floor - dictionary where keys are home Floor ids and values are dest_floor_choices tuples shared by that Floor's residents
+
+Returns:
+List of P Person classes
+
+Runs in O(P) time, where P is the number of Persons
+"""
+def create_people(ids, home_floors, prob_having_visitors, avg_num_visitors, schedules, dest_floor_choices_by_floor):
+    people = []
+    for i in range(len(ids)):
+        person = Person.__new__(Person)
+        person.id = ids[i]
+        person.floor_idx = -1
+        person.home_floor = home_floors[i]
+        person.cur_floor = home_floors[i]
+        person.dest_floor = -1
+        person.is_traveling = False
+        person.elevator_id = -1
+        person.cur_num_visitors = 0
+        person.prob_having_visitors = prob_having_visitors[i]
+        person.avg_num_visitors = avg_num_visitors[i]
+        person.wait_start_step = -1
+        person.board_step = -1
+        person.schedule = schedules[i]
+        person.dest_floor_choices = dest_floor_choices_by_floor[home_floors[i]]
+        people.append(person)
+    return people
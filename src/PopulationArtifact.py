@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from Person import create_people
+from RandomStreams import RandomStreams
+import StateChanges
+import constants
+
+"""
+Saves a Building's generated residents (schedules, state change data, and destination tables) to disk so later Buildings can load them instead of regenerating them.
+Generating residents dominates Building construction, and sweeps that only change Elevator parameters would otherwise regenerate the same residents for every configuration.
+
+An artifact is a directory of .npy files (memory-mapped when loaded, so loading doesn't read the arrays up front) and a meta.json file.
+Artifacts are stored in a cache directory under a hash of everything that shapes the residents: the seed, the Floor populations, the destination Floors of each state,
+the schedule generator, and the constants that shape schedules.
+Residents are generated from the seed's population stream (see RandomStreams), which nothing else draws from, so a Building loaded from an artifact with the same seed simulates exactly like one generated from it.
+
+    get_artifact_key(seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules)
+    create_population_artifact(path, seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules)
+get_population_artifact(cache_dir, seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules)
+load_population_artifact(path, floor_populations)
+"""
+
+artifact_version = 6
+
+# Names of the arrays stored in an artifact, one .npy file each
+array_names = ["person_ids", "home_floors", "prob_having_visitors", "avg_num_visitors", "schedules", "state_change_day_starts", "state_change_steps", "state_change_ids"]
+
+"""
+Returns:
+String hex digest identifying the residents a seed and Building layout generate
+"""
+def get_artifact_key(seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules):
+    key_fields = {
+        "version": artifact_version,
+        "seed": seed,
+        "floor_populations": list(floor_populations),
+        "dest_floors_by_state_name": building_dest_floors_by_state_name,
+        "use_batch_schedules": use_batch_schedules,
+        "constants": {
+            "seconds_per_step": constants.seconds_per_step,
+            "min_total_course_hours": constants.min_total_course_hours,
+            "max_total_course_hours": constants.max_total_course_hours,
+            "earliest_course_start": constants.earliest_course_start,
+            "latest_course_start": constants.latest_course_start,
+        },
+    }
+    return hashlib.sha256(json.dumps(key_fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+"""
+Generates residents from a seed exactly like a Building would and saves them as an artifact.
+
+Takes:
+path - string path of the artifact directory to create
+seed - integer random seed
+floor_populations, building_dest_floors_by_state_name, use_batch_schedules - same as for Building
+"""
+def create_population_artifact(path, seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules):
+    from Building import Building # Building imports this module
+
+    building = Building.__new__(Building)
+    building.floors = []
+    building.population = 0
+    building.generate_floors(floor_populations, building_dest_floors_by_state_name, use_batch_schedules, rng=RandomStreams(seed).population)
+    people = [person for floor in building.floors for person in floor.people_on_floor]
+    state_changes = StateChanges.concatenate_state_changes(people)
+
+    arrays = {
+        "person_ids": np.array([person.id for person in people], dtype=np.int64),
+        "home_floors": np.array([person.home_floor for person in people], dtype=np.int32),
+        "prob_having_visitors": np.array([person.prob_having_visitors for person in people], dtype=np.float64),
+        "avg_num_visitors": np.array([person.avg_num_visitors for person in people], dtype=np.int32),
+        "schedules": np.array([person.schedule for person in people], dtype=np.int8).reshape(len(people), 7, 24),
+        "state_change_day_starts": state_changes.day_starts,
+        "state_change_steps": state_changes.steps,
+        "state_change_ids": state_changes.ids,
+    }
+
+    # Each resident's destination floor choices only depend on their home Floor
+    dest_tables = {}
+    for person in people:
+        dest_tables[str(person.home_floor)] = person.dest_floor_choices
+
+    meta = {
+        "key": get_artifact_key(seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules),
+        "seed": seed,
+        "floor_populations": list(floor_populations),
+        "dest_tables": dest_tables,
+    }
+
+    # Written to a temporary directory first, so other processes never see a partial artifact
+    parent_dir = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent_dir, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=parent_dir)
+    for name in array_names:
+        np.save(os.path.join(tmp_path, name + ".npy"), arrays[name])
+    with open(os.path.join(tmp_path, "meta.json"), "w") as file:
+        json.dump(meta, file)
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        shutil.rmtree(tmp_path) # Another process created the same artifact first
+
+"""
+Finds the artifact for a seed and Building layout in a cache directory, creating it if it doesn't exist yet.
+
+Takes:
+cache_dir - string path of the directory artifacts are stored in
+seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules - see create_population_artifact
+
+Returns:
+String path of the artifact, to pass to Building as population_artifact
+"""
+def get_population_artifact(cache_dir, seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules):
+    path = os.path.join(cache_dir, get_artifact_key(seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules))
+    if not os.path.exists(path):
+        create_population_artifact(path, seed, floor_populations, building_dest_floors_by_state_name, use_batch_schedules)
+    return path
+
+"""
+Loads the residents stored in an artifact.
+Persons are created without running Person.__init__. Their schedules and state change data are read-only views of the memory-mapped arrays (one shared StateChanges),
+and Persons on the same Floor share the same dest_floor_choices.
+
+Takes:
+path - string path of the artifact
+floor_populations - list of integers representing the number of residents on each Floor, must match the artifact
+
+Returns:
+List (one per Floor) of lists of Persons
+"""
+def load_population_artifact(path, floor_populations):
+    with open(os.path.join(path, "meta.json")) as file:
+        meta = json.load(file)
+    if list(floor_populations) != meta["floor_populations"]:
+        raise ValueError("Population artifact " + str(path) + " was generated for floor populations " + str(meta["floor_populations"]) + ", not " + str(list(floor_populations)))
+
+    # Plain ndarray views of the memory maps, slicing np.memmap objects is several times slower
+    arrays = {name: np.asarray(np.load(os.path.join(path, name + ".npy"), mmap_mode="r")) for name in array_names}
+    person_ids = arrays["person_ids"].tolist()
+    home_floors = arrays["home_floors"].tolist()
+    prob_having_visitors = arrays["prob_having_visitors"].tolist()
+    avg_num_visitors = arrays["avg_num_visitors"].tolist()
+    schedules = arrays["schedules"]
+
+    dest_tables = {int(home_floor): tuple(tuple(choices) for choices in table) for home_floor, table in meta["dest_tables"].items()}
+
+    people = create_people(person_ids, home_floors, prob_having_visitors, avg_num_visitors, schedules, dest_tables)
+    people_by_floor = [[] for floor_population in floor_populations]
+    for person in people:
+        people_by_floor[person.home_floor].append(person)
+
+    # Every resident reads and consumes their state changes from one StateChanges backed by the memory-mapped arrays (cursors are the only array in memory)
+    StateChanges.bind_state_changes(people, StateChanges.StateChanges(arrays["state_change_steps"], arrays["state_change_ids"], arrays["state_change_day_starts"]))
+    return people_by_floor
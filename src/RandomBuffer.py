@@ -0,0 +1,59 @@
+import RandomStreams
+
+"""
+Draws random choices one at a time from uniform values generated in bulk.
+Generating a block of values with one NumPy call and handing them out from a Python list is much cheaper per draw than a NumPy call per draw (e.g. np.random.choice on a list).
+"""
+
+class RandomBuffer:
+    rng = None # numpy Generator that values are generated from
+    size = 4096 # Number of values generated at a time
+    values = [] # Uniform floats in [0, 1) not handed out yet start at next_idx
+    next_idx = 0
+
+    """
+    Takes:
+    rng - numpy Generator to generate values from (e.g. a Building's behavior_rng), None to use one seeded from NumPy's global random state when values are first needed
+    size - integer number of values to generate at a time
+    """
+    def __init__(self, rng=None, size=4096):
+        self.rng = rng
+        self.size = size
+        self.values = []
+        self.next_idx = 0
+
+    """
+    Discards the values not handed out yet and continues from another Generator, e.g. at the start of a day so the day's choices only depend on the day's Generator.
+
+    Takes:
+    rng - numpy Generator to generate values from
+    """
+    def reset(self, rng):
+        self.rng = rng
+        self.values = []
+        self.next_idx = 0
+
+    """
+    Generates the next block of values. Values are generated lazily, so creating a RandomBuffer doesn't use any randomness.
+    """
+    def refill(self):
+        if self.rng is None:
+            self.rng = RandomStreams.get_global_generator()
+        self.values = self.rng.random(self.size).tolist()
+        self.next_idx = 0
+
+    """
+    Takes:
+    choices - non-empty tuple (or list) to choose from
+
+    Returns:
+    One element of choices, chosen uniformly at random
+    """
+    def choose(self, choices):
+        if len(choices) == 0:
+            raise ValueError("Cannot choose from an empty sequence")
+        if self.next_idx == len(self.values):
+            self.refill()
+        value = self.values[self.next_idx]
+        self.next_idx += 1
+        return choices[int(value * len(choices))]
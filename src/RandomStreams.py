@@ -0,0 +1,63 @@
+import numpy as np
+
+"""
+Independent, reproducible random number streams (numpy.random.Generator) for each part of a simulation, all derived from one integer seed with numpy.random.SeedSequence.
+
+population - Generates every resident's Schedule and state change steps while a Building is built
+behavior - One stream per simulated day for residents' random choices on that day (destination floors, random trips).
+           A day's stream only depends on the seed and the day, so a day plays out the same however much randomness earlier days used.
+dispatch - Elevator dispatching decisions. The built-in policies are deterministic (ties go to the lowest Elevator id) and don't draw from it,
+           it is reserved so a randomized policy can be added without changing the other streams of a seed.
+
+The streams are spawned children of the seed's SeedSequence, so they are statistically independent of each other and of the streams of other seeds.
+Nothing reads NumPy's global random state once the streams exist, so a run is bit-reproducible for a given seed in any process (e.g. with any number of Replication workers).
+
+get_global_seed()
+get_global_generator()
+"""
+
+class RandomStreams:
+    seed = None # Integer seed every stream is derived from
+
+    population = None # numpy Generator
+    dispatch = None # numpy Generator
+    behavior_seed_sequence = None # numpy SeedSequence that the per-day behavior streams are spawned from
+
+    """
+    Takes:
+    seed - integer random seed, None to draw one from NumPy's global random state (so code seeded with np.random.seed stays reproducible)
+    """
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = get_global_seed()
+        self.seed = int(seed)
+
+        population_seed_sequence, self.behavior_seed_sequence, dispatch_seed_sequence = np.random.SeedSequence(self.seed).spawn(3)
+        self.population = np.random.default_rng(population_seed_sequence)
+        self.dispatch = np.random.default_rng(dispatch_seed_sequence)
+
+    """
+    Takes:
+    day - integer representing the day of the simulation (not the day of the week, so every week gets new choices)
+
+    Returns:
+    New numpy Generator for residents' random choices on day. Calling this again for the same day returns a Generator in the same starting state.
+    """
+    def get_day_generator(self, day):
+        # Same child as the (day + 1)th spawn() of behavior_seed_sequence would return, without spawning the days before it
+        seed_sequence = np.random.SeedSequence(self.behavior_seed_sequence.entropy, spawn_key=self.behavior_seed_sequence.spawn_key + (day,))
+        return np.random.default_rng(seed_sequence)
+
+"""
+Returns:
+Integer seed drawn from NumPy's global random state
+"""
+def get_global_seed():
+    return int(np.random.randint(0, 2**31 - 1))
+
+"""
+Returns:
+New numpy Generator seeded from NumPy's global random state, for code run outside of a Building (e.g. a standalone Person or Schedule)
+"""
+def get_global_generator():
+    return np.random.default_rng(get_global_seed())
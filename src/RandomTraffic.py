@@ -0,0 +1,106 @@
+import math
+
+import constants
+
+"""
+Random (unscheduled) trips, as an opt-in addition to residents' scheduled state changes.
+Every step, each resident on a Floor (not waiting for or riding an Elevator) starts a trip to a uniformly random Floor with a probability that depends on the hour of the day.
+
+Instead of flipping a coin for every resident on every step, the Building-wide process is sampled directly.
+The step of the next trip by anyone is drawn from the geometric distribution (the first step where at least one of N residents' coin flips succeeds),
+and on that step the number of travelers is drawn conditioned on there being at least one. Every resident is equally likely to be a traveler.
+Coin flips are memoryless, so the next trip step is simply redrawn whenever the number of residents on Floors changes or a new hour starts.
+This gives exactly the arrival statistics of per-resident coin flips, in O(F) time per simulated step (F Floors), and lets the event Engine jump to the next trip.
+
+All draws come from the Building's behavior_rng (see RandomStreams).
+
+enable_random_traffic(building, hourly_trip_rates)
+"""
+
+class RandomTraffic:
+    hourly_trip_probabilities = [] # 24 floats, probability that a resident on a Floor starts a trip on a step of each hour of the day
+    num_present = -1 # Number of residents on Floors next_trip_step was drawn for, -1 to redraw on the next step
+    next_trip_step = float("inf") # Simulation step (counted from the start of the simulation) of the next trip, inf if there is none before redraw_step
+    redraw_step = -1 # Simulation step next_trip_step must be redrawn at (the start of the next hour)
+
+    """
+    Takes:
+    hourly_trip_rates - list of 24 floats, average number of random trips a resident on a Floor starts per hour, for each hour of the day
+    """
+    def __init__(self, hourly_trip_rates):
+        if len(hourly_trip_rates) != 24:
+            raise ValueError("Expected 24 hourly trip rates, got " + str(len(hourly_trip_rates)))
+        if min(hourly_trip_rates) < 0:
+            raise ValueError("Hourly trip rates must not be negative")
+        self.hourly_trip_probabilities = [min(1.0, rate / float(constants.steps_per_hour)) for rate in hourly_trip_rates]
+
+    """
+    Takes:
+    step - integer step within a day
+
+    Returns:
+    Float probability that a resident on a Floor starts a trip on step
+    """
+    def get_trip_probability(self, step):
+        return self.hourly_trip_probabilities[min(step // int(constants.steps_per_hour), 23)] # The last few steps of a day belong to hour 23
+
+    """
+    Draws the step of the next trip from the current step on, for the number of residents currently on Floors.
+
+    Takes:
+    rng - numpy Generator
+    num_present - integer number of residents on Floors
+    cur_step - integer simulation step (counted from the start of the simulation)
+    day_step - integer step within the day of cur_step
+    """
+    def draw_next_trip_step(self, rng, num_present, cur_step, day_step):
+        steps_per_hour = int(constants.steps_per_hour)
+        steps_per_day = int(constants.steps_per_day)
+        hour = min(day_step // steps_per_hour, 23)
+        hour_end = steps_per_day if hour == 23 else (hour + 1) * steps_per_hour # Hour 23 runs to the end of the day
+        self.redraw_step = cur_step + hour_end - day_step
+        self.num_present = num_present
+
+        probability = self.get_trip_probability(day_step)
+        self.next_trip_step = float("inf")
+        if num_present == 0 or probability == 0:
+            return
+        # Probability that at least one resident starts a trip on a step
+        any_probability = -math.expm1(num_present * math.log1p(-probability)) if probability < 1 else 1.0
+        next_trip_step = cur_step + int(rng.geometric(any_probability)) - 1
+        if next_trip_step < self.redraw_step:
+            self.next_trip_step = next_trip_step
+
+    """
+    Draws how many residents start a trip on a step, given that at least one does.
+    The first traveler's position J among the residents is truncated geometric, and each resident after them travels independently.
+
+    Takes:
+    rng - numpy Generator
+    num_present - integer number of residents on Floors (at least 1)
+    day_step - integer step within the day
+
+    Returns:
+    Integer number of travelers, at least 1
+    """
+    def draw_num_travelers(self, rng, num_present, day_step):
+        probability = self.get_trip_probability(day_step)
+        if probability >= 1:
+            return num_present
+        any_probability = -math.expm1(num_present * math.log1p(-probability))
+        first = min(int(math.log1p(-rng.random() * any_probability) / math.log1p(-probability)), num_present - 1)
+        return 1 + int(rng.binomial(num_present - 1 - first, probability))
+
+"""
+Turns on random trips for a Building. Simulation.handle_state_changes_scheduled starts them from then on.
+
+Takes:
+building - Building class
+hourly_trip_rates - list of 24 floats, average number of random trips a resident on a Floor starts per hour, for each hour of the day
+
+Returns:
+RandomTraffic class attached to the Building
+"""
+def enable_random_traffic(building, hourly_trip_rates):
+    building.random_traffic = RandomTraffic(hourly_trip_rates)
+    return building.random_traffic
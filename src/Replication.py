@@ -0,0 +1,139 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import argparse
+import os
+
+import numpy as np
+
+from Analytics import Analytics
+import Config
+import Engine
+
+"""
+Runs independent replications of a simulation (same configuration, different random seeds) and merges their Analytics results.
+A single weekly run is one sample of each Person's randomly generated Schedule, so averages should be compared across many seeds, not across single runs.
+
+    run_replication(config, seed)
+run_replications(config, num_replications, base_seed, max_workers)
+    get_t_critical_value(df)
+summarize_replications(results)
+print_summary(summary)
+"""
+
+# Two sided 95% critical values of Student's t distribution, indexed by degrees of freedom
+t_critical_values_95 = [float("nan"), 12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+"""
+Builds a Building from a configuration and simulates it with all randomness seeded by seed.
+Output printed while building and simulating is discarded, so replications can run in worker processes.
+
+Takes:
+config - configuration dictionary (see Config)
+seed - integer random seed
+
+Returns:
+Dictionary from Analytics.get_defining_averages, plus the seed under "Seed"
+"""
+def run_replication(config, seed):
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        building = Config.build_building(config, seed)
+        analytics = Analytics()
+
+        Engine.run_simulation(building, analytics, num_days=config["num_days"], engine=config["engine"], progress=False)
+
+        analytics.compute_daily_step_averages(building)
+        analytics.compute_hourly_step_averages(building)
+
+    results = analytics.get_defining_averages(building)
+    results["Seed"] = seed
+    return results
+
+"""
+Runs num_replications replications of a configuration, seeded base_seed, base_seed + 1, ..., across a pool of worker processes.
+Each replication only depends on its seed, so results are the same for any number of workers.
+
+Takes:
+config - configuration dictionary (see Config)
+num_replications - integer number of replications to run
+base_seed - integer seed of the first replication
+max_workers - integer maximum number of worker processes, None to use one per CPU. 1 runs every replication in this process.
+
+Returns:
+List of dictionaries from run_replication, ordered by seed
+"""
+def run_replications(config, num_replications, base_seed=0, max_workers=None):
+    seeds = [base_seed + i for i in range(num_replications)]
+
+    if max_workers == 1:
+        return [run_replication(config, seed) for seed in seeds]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run_replication, [config] * num_replications, seeds))
+
+"""
+Takes:
+df - integer degrees of freedom (at least 1)
+
+Returns:
+Float two sided 95% critical value of Student's t distribution (normal approximation past 30 degrees of freedom)
+"""
+def get_t_critical_value(df):
+    if df < len(t_critical_values_95):
+        return t_critical_values_95[df]
+    return 1.96
+
+"""
+Merges replication results into a mean and 95% confidence interval for each metric.
+
+Takes:
+results - list of dictionaries from run_replication
+
+Returns:
+Dictionary where keys are metric names and values are dictionaries with keys "mean", "std", "n", "ci_low", and "ci_high".
+Metrics missing from some replications (e.g. trip metrics when no trip finished) are summarized over the replications that have them.
+With a single replication std is 0 and the confidence interval is only the mean.
+"""
+def summarize_replications(results):
+    names = []
+    for result in results:
+        for name in result:
+            if name != "Seed" and name not in names:
+                names.append(name)
+
+    summary = {}
+    for name in names:
+        values = np.array([result[name] for result in results if name in result], dtype=float)
+        n = len(values)
+        mean = float(np.mean(values))
+        std = float(np.std(values, ddof=1)) if n > 1 else 0.0
+        half_width = get_t_critical_value(n - 1) * std / np.sqrt(n) if n > 1 else 0.0
+
+        summary[name] = {
+            "mean": mean,
+            "std": std,
+            "n": n,
+            "ci_low": float(mean - half_width),
+            "ci_high": float(mean + half_width),
+        }
+    return summary
+
+def print_summary(summary):
+    for name, stats in summary.items():
+        print(name + ": " + str(round(stats["mean"], 4)) + " (95% CI " + str(round(stats["ci_low"], 4)) + " to " + str(round(stats["ci_high"], 4)) + ", n=" + str(stats["n"]) + ")")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run independent replications of Config.HERE_config and report means with 95% confidence intervals.")
+    parser.add_argument("-n", "--num-replications", type=int, default=10)
+    parser.add_argument("-s", "--base-seed", type=int, default=0)
+    parser.add_argument("-w", "--max-workers", type=int, default=None)
+    parser.add_argument("-d", "--num-days", type=int, default=None, help="Override the configuration's number of days")
+    args = parser.parse_args()
+
+    config = dict(Config.HERE_config)
+    if args.num_days is not None:
+        config["num_days"] = args.num_days
+
+    print_summary(summarize_replications(run_replications(config, args.num_replications, args.base_seed, args.max_workers)))
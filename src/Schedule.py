@@ -1,5 +1,6 @@
 import numpy as np
 
+import RandomStreams
 import constants
 
 state_name_by_id = {
@@ -29,6 +30,7 @@ Sets lecture times in schedule for 4CR classes
 Takes:
 class_start_times - numpy array of indices of a schedule day that classes can occurr in
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Returns:
 Number of discussion sections associated with the chosen course format.
@@ -36,8 +38,8 @@ This is used to sum discussions and add them to schedule after all courses' lect
 
 Runs in O(S) where S is the number of unique times a class can start at in a day
 """
-def schedule_4CR_lectures(class_start_times, schedule):
-    np.random.shuffle(class_start_times)
+def schedule_4CR_lectures(class_start_times, schedule, rng):
+    rng.shuffle(class_start_times)
     # Set the MWF lecture time
     for start_time in class_start_times:
         if schedule[1, start_time] == 0 and schedule[3, start_time] == 0 and schedule[5, start_time] == 0:
@@ -55,6 +57,7 @@ Sets lecture times in schedule for 3CR classes
 Takes:
 class_start_times - numpy array of indices of a schedule day that classes can occurr in
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Returns:
 Number of discussion sections associated with the chosen course format.
@@ -62,9 +65,9 @@ This is used to sum discussions and add them to schedule after all courses' lect
 
 Runs in O(S) where S is the number of unique times a class can start at in a day
 """
-def schedule_3CR_lectures(class_start_times, schedule):
-    np.random.shuffle(class_start_times)
-    variety = np.random.randint(low=0, high=3, dtype=int)
+def schedule_3CR_lectures(class_start_times, schedule, rng):
+    rng.shuffle(class_start_times)
+    variety = rng.integers(low=0, high=3, dtype=int)
     if variety == 0:
         # MWF class
         for start_time in class_start_times:
@@ -99,6 +102,7 @@ Sets lecture times in schedule for 2CR classes
 Takes:
 class_start_times - numpy array of indices of a schedule day that classes can occurr in
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Returns:
 Number of discussion sections associated with the chosen course format.
@@ -106,9 +110,9 @@ This is used to sum discussions and add them to schedule after all courses' lect
 
 Runs in O(S) where S is the number of unique times a class can start at in a day
 """
-def schedule_2CR_lectures(class_start_times, schedule):
-    np.random.shuffle(class_start_times)
-    variety = np.random.randint(low=0, high=2, dtype=int)
+def schedule_2CR_lectures(class_start_times, schedule, rng):
+    rng.shuffle(class_start_times)
+    variety = rng.integers(low=0, high=2, dtype=int)
     if variety == 0:
         # MW class
         for start_time in class_start_times:
@@ -134,6 +138,7 @@ Sets lecture times in schedule for 1CR classes
 Takes:
 class_start_times - numpy array of indices of a schedule day that classes can occurr in
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Returns:
 Number of discussion sections associated with the chosen course format.
@@ -141,12 +146,12 @@ This is used to sum discussions and add them to schedule after all courses' lect
 
 Runs in O(S) where S is the number of unique times a class can start at in a day
 """
-def schedule_1CR_lecture(class_start_times, schedule):
+def schedule_1CR_lecture(class_start_times, schedule, rng):
     days = np.linspace(start=1, stop=5, num=5, dtype=int)
-    np.random.shuffle(class_start_times)
+    rng.shuffle(class_start_times)
     # Set class
     for start_time in class_start_times:
-        np.random.shuffle(days)
+        rng.shuffle(days)
         for day in days:
             if schedule[day, start_time] == 0:
                 schedule[day, start_time] = state_id_by_name["class"]
@@ -162,17 +167,18 @@ Takes:
 class_start_times - numpy array of indices of a schedule day that classes can occurr in
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
 num_discussions - cumulative sum of all discussions associated with a person's schedule. This is obtained by summing the return values of schedule_XCR_lecture functions.
+rng - numpy Generator to draw random numbers from
 
 Runs in O(C*S) where C is the number of class discussions and S is the number of unique times a class can start at in a day
 """
-def schedule_discussions(class_start_times, schedule, num_discussions):
+def schedule_discussions(class_start_times, schedule, num_discussions, rng):
     days = np.linspace(start=1, stop=5, num=5, dtype=int)
     # Set discussions
     for i in range(num_discussions):
         set = False
-        np.random.shuffle(class_start_times)
+        rng.shuffle(class_start_times)
         for start_time in class_start_times:
-            np.random.shuffle(days)
+            rng.shuffle(days)
             for day in days:
                 if schedule[day, start_time] == 0:
                     schedule[day, start_time] = state_id_by_name["class"]
@@ -191,15 +197,16 @@ Generates a random class schedule and stores it in schedule.
 
 Takes:
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Runs in O(H) + O(H*S) + O(C*S) where H is the number of course hours, S is the number of times classes can start in a day, and C is the number of class discussions
 """
-def schedule_class(schedule):
-    total_credit_hours = np.random.randint(constants.min_total_course_hours, constants.max_total_course_hours + 1) # Must add one to max since randint is exclusive for upper limit parameter.
+def schedule_class(schedule, rng):
+    total_credit_hours = rng.integers(constants.min_total_course_hours, constants.max_total_course_hours + 1) # Must add one to max since integers is exclusive for upper limit parameter.
     course_hours = [] # List of credit hours of classes
     hours_left = total_credit_hours
     while (hours_left != 0):
-        course_hour = np.random.choice([min(hours_left, 3), min(hours_left, 4)]) # randomly pick either a 3 or 4 credit hour class
+        course_hour = rng.choice([min(hours_left, 3), min(hours_left, 4)]) # randomly pick either a 3 or 4 credit hour class
         course_hours.append(course_hour)
         hours_left -= course_hour 
     #print("Total CR:", total_credit_hours)
@@ -211,36 +218,37 @@ def schedule_class(schedule):
     for i in range(len(course_hours)):
         course_hour = course_hours[i]
         if course_hour == 4:
-            num_discussions += schedule_4CR_lectures(class_start_times, schedule) # O(S)
+            num_discussions += schedule_4CR_lectures(class_start_times, schedule, rng) # O(S)
 
         elif course_hour == 3:
-            num_discussions += schedule_3CR_lectures(class_start_times, schedule) # O(S)
+            num_discussions += schedule_3CR_lectures(class_start_times, schedule, rng) # O(S)
 
         elif course_hour == 2:
-            num_discussions += schedule_2CR_lectures(class_start_times, schedule) # O(S)
+            num_discussions += schedule_2CR_lectures(class_start_times, schedule, rng) # O(S)
 
         else:
-            num_discussions += schedule_1CR_lecture(class_start_times, schedule) # O(S)
+            num_discussions += schedule_1CR_lecture(class_start_times, schedule, rng) # O(S)
 
-    schedule_discussions(class_start_times, schedule, num_discussions) # O(C*S)
+    schedule_discussions(class_start_times, schedule, num_discussions, rng) # O(C*S)
 
 """
 Generates a random sleep schedule and stores it in schedule.
 
 Takes:
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Runs is O(D) where D is the number of days in the schedule
 """
-def schedule_sleep(schedule):
-    variety = np.random.randint(0, 2)
+def schedule_sleep(schedule, rng):
+    variety = rng.integers(0, 2)
     if variety == 0:
         # Night Owl - Wakes up an hour before first class each day. If no class a given day, wakes up between 10am-2pm. General sleep pattern is irratic. 5-9 hours of sleep each night
         for i in range(schedule.shape[0]):
             if state_id_by_name["class"] in schedule[i]:
                 #print("Class")
                 # School day (mostly weekdays)
-                sleep_amount = np.random.randint(5, 10)
+                sleep_amount = rng.integers(5, 10)
                 first_class_time = np.where(schedule[i]==1)[0][0]
                 wakeup_time = first_class_time - 1
                 last_sleep_hour = wakeup_time - 1
@@ -256,8 +264,8 @@ def schedule_sleep(schedule):
             else:
                 #print("No Class")
                 # No school day (mostly weekends)
-                sleep_amount = np.random.randint(6, 11) # 6-10 hours of sleep a night
-                wakeup_time = np.random.randint(10, 15) # Wakes up between 10am-2pm
+                sleep_amount = rng.integers(6, 11) # 6-10 hours of sleep a night
+                wakeup_time = rng.integers(10, 15) # Wakes up between 10am-2pm
                 last_sleep_hour = wakeup_time - 1
 
                 if sleep_amount > last_sleep_hour:
@@ -272,10 +280,10 @@ def schedule_sleep(schedule):
         # Early bird. Wakes up between 5-9am, but wakes up at same time each day. Sleeps 7-9 hours each night, general sleep pattern is consistent
         # Upper limit restricted by earliest class time (must wake up at least an hour before earliest class of week)
         earliest_class_time = min(np.where(schedule==state_id_by_name["class"])[1])
-        wakeup_time = np.random.randint(5, min(10, earliest_class_time))
+        wakeup_time = rng.integers(5, min(10, earliest_class_time))
         for i in range(schedule.shape[0]):
             last_sleep_hour = wakeup_time - 1
-            sleep_amount = np.random.randint(7, 10)
+            sleep_amount = rng.integers(7, 10)
             if sleep_amount > last_sleep_hour:
                 schedule[i][0:wakeup_time] = state_id_by_name["sleep"]
                 remaining = sleep_amount - last_sleep_hour
@@ -289,20 +297,21 @@ Generates a random meal schedule (breakfast, lunch, dinner, late night) and stor
 
 Takes:
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Runs in O(D * (O(b) + O(l) + O(d))) time where D is the number of days in the schedule, b, l, and d are the number of times breakfast, lunch, and dinner respectively can occur at
 """
-def schedule_meals(schedule):
+def schedule_meals(schedule, rng):
     for i in range(schedule.shape[0]):
         # For each day, try to set breakfast, lunch, and dinner
         wakeup_time = max(np.where(schedule[i, :15]==state_id_by_name["sleep"])[0]) + 1 # schedule is indexed as such because the latest time a person can wake up is 2pm, i.e. 14
         # Breakfast can happen within the first 3 hours of waking up, lunch within the next 5 hours, dinner within the next 6. 
         breakfast_times = np.linspace(start=wakeup_time, stop=wakeup_time+2, num=3, dtype=int)
-        np.random.shuffle(breakfast_times)
+        rng.shuffle(breakfast_times)
         lunch_times = np.linspace(wakeup_time+3, wakeup_time+7, 5, dtype=int)
-        np.random.shuffle(lunch_times)
+        rng.shuffle(lunch_times)
         dinner_times = np.linspace(wakeup_time+8, wakeup_time+13, 6, dtype=int)
-        np.random.shuffle(dinner_times)
+        rng.shuffle(dinner_times)
         for breakfast_time in breakfast_times:
             if schedule[i, breakfast_time] == 0:
                 schedule[i, breakfast_time] = state_id_by_name["meal"]
@@ -328,16 +337,17 @@ Generates a random exercise schedule and stores it in schedule.
 
 Takes:
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Runs in O(D * C) time, where D is the number of days and C is the number of chunks in a day
 """
-def schedule_exercise(schedule):
+def schedule_exercise(schedule, rng):
     hours = np.linspace(0, 23, 14, dtype=int)
     for i in range(schedule.shape[0]):
         # Each day there is a 25% chance a person will workout
-        variety = np.random.randint(0,4)
+        variety = rng.integers(0,4)
         if variety == 0:
-            np.random.shuffle(hours)
+            rng.shuffle(hours)
             for hour in hours:
                 if schedule[i, hour] == 0:
                     schedule[i, hour] = state_id_by_name["exercise"]
@@ -349,16 +359,17 @@ Generates a random shopping schedule and stores it in schedule.
 
 Takes:
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Runs in O(D * C) time, where D is the number of days and C is the number of chunks in a day
 """
-def schedule_shopping(schedule):
+def schedule_shopping(schedule, rng):
     hours = np.linspace(0, 23, 14, dtype=int)
     for i in range(schedule.shape[0]):
         # Each day there is a 20% chance a person will go shopping
-        variety = np.random.randint(0,5)
+        variety = rng.integers(0,5)
         if variety == 0:
-            np.random.shuffle(hours)
+            rng.shuffle(hours)
             for hour in hours:
                 if schedule[i, hour] == 0:
                     schedule[i, hour] = state_id_by_name["shop"]
@@ -371,16 +382,17 @@ Generates a random chores schedule and stores it in schedule.
 
 Takes:
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Runs in O(D * C) time, where D is the number of days and C is the number of chunks in a day
 """
-def schedule_chores(schedule):
+def schedule_chores(schedule, rng):
     hours = np.linspace(0, 23, 14, dtype=int)
     for i in range(schedule.shape[0]):
         # Each day there is a 50% chance a person will do chores
-        variety = np.random.randint(0,2)
+        variety = rng.integers(0,2)
         if variety == 0:
-            np.random.shuffle(hours)
+            rng.shuffle(hours)
             for hour in hours:
                 if schedule[i, hour] == 0:
                     schedule[i, hour] = state_id_by_name["chores"]
@@ -392,36 +404,270 @@ Generates a random study schedule and stores it in schedule.
 
 Takes:
 schedule - 2d numpy array of shape (7, N) where N is the number of time chunks in each of a week's seven days. If N=24, the schedule is hourly
+rng - numpy Generator to draw random numbers from
 
 Runs in O(D * C) time, where D is the number of days and C is the number of chunks in a day
 """
-def schedule_study(schedule):
+def schedule_study(schedule, rng):
     hours = np.linspace(0, 23, 14, dtype=int)
     for i in range(schedule.shape[0]):
         for j in range(schedule.shape[1]):
             if schedule[i, j] == 0:
                 # Each hour of freetime will be used to study 25% of the time
-                if np.random.randint(0,4) == 0:
+                if rng.integers(0,4) == 0:
                     schedule[i, j] == state_id_by_name["study"]
     return
 
 """
 Using the "schedule_[activity]" functions above, a randomized student schedule is generated.
 
+Takes:
+rng - numpy Generator to draw random numbers from, None to use one seeded from NumPy's global random state
+
 Runs in (O(H) + O(H*S) + O(C*S)) + O(D) + O(D * (O(b) + O(l) + O(d))) + O(D * C) + O(D * C) + O(D * C) + O(D * C)
 """
-def generate_schedule():
+def generate_schedule(rng=None):
+    if rng is None:
+        rng = RandomStreams.get_global_generator()
     schedule = np.zeros((7, 24), dtype=int) # 24 hours in a day, 7 days a week
-    schedule_class(schedule) # O(H) + O(H*S) + O(C*S)
-    schedule_sleep(schedule) # O(D)
-    schedule_meals(schedule) # O(D * (O(b) + O(l) + O(d)))
-    schedule_exercise(schedule) # O(D * C)
-    schedule_shopping(schedule) # O(D * C)
-    schedule_chores(schedule) # O(D * C)
-    schedule_study(schedule) # O(D * C)
+    schedule_class(schedule, rng) # O(H) + O(H*S) + O(C*S)
+    schedule_sleep(schedule, rng) # O(D)
+    schedule_meals(schedule, rng) # O(D * (O(b) + O(l) + O(d)))
+    schedule_exercise(schedule, rng) # O(D * C)
+    schedule_shopping(schedule, rng) # O(D * C)
+    schedule_chores(schedule, rng) # O(D * C)
+    schedule_study(schedule, rng) # O(D * C)
     return schedule
 
-    
 
-#schedule = generate_schedule()
-#print("shedule", schedule)
\ No newline at end of file
+"""
+Batch schedule generation. generate_schedules(n) builds n schedules at once with whole-array operations, drawing every random choice
+from the same distributions as the per-person "schedule_[activity]" functions above (so a batch is statistically identical to n calls of generate_schedule,
+though not identical for a given seed since random numbers are drawn in a different order).
+
+Every "pick the first free time from a shuffled list" choice above is equivalent to picking uniformly among the free times, which is done here for many Persons at once
+by drawing a random key per candidate and taking the smallest key among free candidates.
+
+Each batch function takes schedules, a 3d numpy array of shape (P, 7, N) holding P schedules, and updates it in place.
+"""
+
+class_start_times = np.linspace(start=constants.earliest_course_start, stop=constants.latest_course_start, num=constants.latest_course_start-constants.earliest_course_start, dtype=int) # Hours that classes can start on (same as schedule_class)
+activity_hours = np.linspace(0, 23, 14, dtype=int) # Hours that exercise, shopping, and chores can happen at (same as schedule_exercise, schedule_shopping, and schedule_chores)
+
+"""
+For each of the given Persons, sets one uniformly chosen free candidate cell of their schedule to state. Persons without a free candidate are left unchanged.
+
+Takes:
+schedules - 3d numpy array of shape (P, 7, N)
+people - 1d numpy array of M schedule indices
+days - numpy array of shape (M,) or (M, K) of candidate days
+hours - numpy array of shape (M, K) of candidate hours
+state - integer state id to set
+rng - numpy Generator to draw random numbers from
+
+Returns:
+1d boolean numpy array of shape (M,), True where a cell was set
+"""
+def set_random_free_cells(schedules, people, days, hours, state, rng):
+    days = np.broadcast_to(days if days.ndim == 2 else days[:, None], hours.shape)
+    free = schedules[people[:, None], days, hours] == 0
+
+    keys = rng.random(free.shape)
+    keys[~free] = 2.0 # Never chosen over a free candidate
+    choices = np.argmin(keys, axis=1)
+
+    assigned = free.any(axis=1)
+    rows = np.nonzero(assigned)[0]
+    schedules[people[rows], days[rows, choices[rows]], hours[rows, choices[rows]]] = state
+    return assigned
+
+"""
+Batch version of the lecture loops in schedule_4CR_lectures, schedule_3CR_lectures, and schedule_2CR_lectures.
+Each Person gets the same class start time on every one of lecture_days, chosen uniformly among start times that are free on all of lecture_days.
+
+Takes:
+schedules - 3d numpy array of shape (P, 7, N)
+people - 1d numpy array of schedule indices
+lecture_days - list of days the course meets on
+rng - numpy Generator to draw random numbers from
+
+Returns:
+1d boolean numpy array, True where the lectures were scheduled
+"""
+def schedule_lectures_batch(schedules, people, lecture_days, rng):
+    free = np.ones((len(people), len(class_start_times)), dtype=bool)
+    for day in lecture_days:
+        free &= schedules[people[:, None], day, class_start_times[None, :]] == 0
+
+    keys = rng.random(free.shape)
+    keys[~free] = 2.0
+    start_times = class_start_times[np.argmin(keys, axis=1)]
+
+    assigned = free.any(axis=1)
+    for day in lecture_days:
+        schedules[people[assigned], day, start_times[assigned]] = state_id_by_name["class"]
+    return assigned
+
+"""
+Batch version of schedule_1CR_lecture and of one discussion in schedule_discussions.
+Each Person gets a start time chosen uniformly among start times free on at least one weekday, then a weekday chosen uniformly among the free ones at that time.
+
+Takes:
+schedules - 3d numpy array of shape (P, 7, N)
+people - 1d numpy array of schedule indices
+rng - numpy Generator to draw random numbers from
+"""
+def schedule_single_class_batch(schedules, people, rng):
+    weekdays = np.arange(1, 6)
+    free = schedules[people[:, None, None], weekdays[None, None, :], class_start_times[None, :, None]] == 0 # (M, start times, weekdays)
+
+    keys = rng.random(free.shape[:2])
+    keys[~free.any(axis=2)] = 2.0
+    start_idxs = np.argmin(keys, axis=1)
+
+    assigned = free.any(axis=(1, 2))
+    people = people[assigned]
+    start_idxs = start_idxs[assigned]
+    set_random_free_cells(schedules, people, np.broadcast_to(weekdays, (len(people), 5)), np.broadcast_to(class_start_times[start_idxs][:, None], (len(people), 5)), state_id_by_name["class"], rng)
+
+"""
+Batch version of schedule_class.
+
+Takes:
+schedules - 3d numpy array of shape (P, 7, N)
+rng - numpy Generator to draw random numbers from
+"""
+def schedule_class_batch(schedules, rng):
+    num_people = schedules.shape[0]
+    hours_left = rng.integers(constants.min_total_course_hours, constants.max_total_course_hours + 1, size=num_people)
+
+    # Split each Person's credit hours into courses, randomly picking either a 3 or 4 credit hour class (or whatever is left)
+    course_hours = []
+    while np.any(hours_left != 0):
+        course_hour = np.where(rng.integers(0, 2, size=num_people) == 0, np.minimum(hours_left, 3), np.minimum(hours_left, 4))
+        course_hours.append(course_hour)
+        hours_left -= course_hour
+
+    num_discussions = np.zeros((num_people,), dtype=int)
+    for course_hour in course_hours:
+        # 4CR: MWF lectures and a discussion
+        people = np.nonzero(course_hour == 4)[0]
+        num_discussions[people] += schedule_lectures_batch(schedules, people, [1, 3, 5], rng)
+
+        # 3CR: MWF lectures, or MW lectures and a discussion (schedule_3CR_lectures' "WF" variety also meets MW)
+        people = np.nonzero(course_hour == 3)[0]
+        variety = rng.integers(low=0, high=3, size=len(people))
+        schedule_lectures_batch(schedules, people[variety == 0], [1, 3, 5], rng)
+        num_discussions[people[variety != 0]] += schedule_lectures_batch(schedules, people[variety != 0], [1, 3], rng)
+
+        # 2CR: MW or WF lectures
+        people = np.nonzero(course_hour == 2)[0]
+        variety = rng.integers(low=0, high=2, size=len(people))
+        schedule_lectures_batch(schedules, people[variety == 0], [1, 3], rng)
+        schedule_lectures_batch(schedules, people[variety != 0], [3, 5], rng)
+
+        # 1CR: one lecture on any weekday
+        schedule_single_class_batch(schedules, np.nonzero(course_hour == 1)[0], rng)
+
+    for i in range(num_discussions.max(initial=0)):
+        schedule_single_class_batch(schedules, np.nonzero(num_discussions > i)[0], rng)
+
+"""
+Batch version of schedule_sleep.
+
+Takes:
+schedules - 3d numpy array of shape (P, 7, 24)
+rng - numpy Generator to draw random numbers from
+"""
+def schedule_sleep_batch(schedules, rng):
+    num_people = schedules.shape[0]
+    is_class = schedules == state_id_by_name["class"]
+    has_class = is_class.any(axis=2) # (P, 7)
+    first_class_times = np.argmax(is_class, axis=2)
+
+    is_night_owl = rng.integers(0, 2, size=num_people) == 0
+
+    # Night Owl - Wakes up an hour before first class each day. If no class a given day, wakes up between 10am-2pm. 5-9 hours of sleep on school days, 6-10 otherwise
+    owl_sleep_amounts = np.where(has_class, rng.integers(5, 10, size=(num_people, 7)), rng.integers(6, 11, size=(num_people, 7)))
+    owl_wakeup_times = np.where(has_class, first_class_times - 1, rng.integers(10, 15, size=(num_people, 7)))
+
+    # Early bird. Wakes up between 5-9am (at least an hour before their earliest class of the week) at the same time each day. Sleeps 7-9 hours each night
+    earliest_class_times = np.where(has_class, first_class_times, 24).min(axis=1)
+    bird_wakeup_times = np.floor(5 + rng.random(num_people) * (np.minimum(10, earliest_class_times) - 5)).astype(int) # rng.integers(5, min(10, earliest_class_time)) for each Person, as in schedule_sleep
+    bird_sleep_amounts = rng.integers(7, 10, size=(num_people, 7))
+
+    sleep_amounts = np.where(is_night_owl[:, None], owl_sleep_amounts, bird_sleep_amounts)[:, :, None]
+    wakeup_times = np.where(is_night_owl[:, None], owl_wakeup_times, bird_wakeup_times[:, None])[:, :, None]
+    last_sleep_hours = wakeup_times - 1
+
+    # Sleep that starts before midnight spills into the end of the previous day
+    hours = np.arange(24)[None, None, :]
+    starts_previous_day = sleep_amounts > last_sleep_hours
+    is_sleep = np.where(starts_previous_day, hours < wakeup_times, (hours >= last_sleep_hours - sleep_amounts) & (hours < wakeup_times))
+    is_previous_day_sleep = starts_previous_day & (hours >= 24 - (sleep_amounts - last_sleep_hours))
+    is_sleep |= np.roll(is_previous_day_sleep, -1, axis=1)
+
+    schedules[is_sleep] = state_id_by_name["sleep"]
+
+"""
+Batch version of schedule_meals.
+
+Takes:
+schedules - 3d numpy array of shape (P, 7, 24)
+rng - numpy Generator to draw random numbers from
+"""
+def schedule_meals_batch(schedules, rng):
+    people = np.arange(schedules.shape[0])
+    for i in range(schedules.shape[1]):
+        # The latest time a person can wake up is 2pm, i.e. 14
+        is_sleep = schedules[:, i, :15] == state_id_by_name["sleep"]
+        wakeup_times = 15 - np.argmax(is_sleep[:, ::-1], axis=1)
+
+        # Breakfast can happen within the first 3 hours of waking up, lunch within the next 5 hours, dinner within the next 6.
+        breakfast_hours = wakeup_times[:, None] + np.arange(0, 3)[None, :]
+        set_random_free_cells(schedules, people, np.full((len(people),), i), breakfast_hours, state_id_by_name["meal"], rng)
+        lunch_hours = wakeup_times[:, None] + np.arange(3, 8)[None, :]
+        set_random_free_cells(schedules, people, np.full((len(people),), i), lunch_hours, state_id_by_name["meal"], rng)
+
+        # Late night dinners occur in the early AM of the next day
+        dinner_hours = wakeup_times[:, None] + np.arange(8, 14)[None, :]
+        dinner_days = np.where(dinner_hours >= 24, (i + 1) % 7, i)
+        set_random_free_cells(schedules, people, dinner_days, dinner_hours % 24, state_id_by_name["meal"], rng)
+
+"""
+Batch version of schedule_exercise, schedule_shopping, and schedule_chores. On each day, each Person does the activity once with the given probability.
+
+Takes:
+schedules - 3d numpy array of shape (P, 7, N)
+state - integer state id of the activity
+num_choices - integer, the activity happens on a day when a random integer in [0, num_choices) is 0
+rng - numpy Generator to draw random numbers from
+"""
+def schedule_daily_activity_batch(schedules, state, num_choices, rng):
+    people, days = np.nonzero(rng.integers(0, num_choices, size=schedules.shape[:2]) == 0)
+    set_random_free_cells(schedules, people, days, np.broadcast_to(activity_hours, (len(people), len(activity_hours))), state, rng)
+
+"""
+Generates n randomized student schedules at once, using the batch versions of the "schedule_[activity]" functions.
+schedule_study never changes a schedule (it compares instead of assigning), so to keep the same distribution no study blocks are added here either.
+
+Takes:
+n - integer number of schedules to generate
+rng - numpy Generator to draw random numbers from, None to use one seeded from NumPy's global random state
+
+Returns:
+3d numpy int8 array of shape (n, 7, 24), where [i] is a schedule like the ones returned by generate_schedule
+
+Runs in O(n * (H + D * C)) vectorized time, where H is the number of courses, D is the number of days, and C is the number of chunks in a day
+"""
+def generate_schedules(n, rng=None):
+    if rng is None:
+        rng = RandomStreams.get_global_generator()
+    schedules = np.zeros((n, 7, 24), dtype=np.int8) # 24 hours in a day, 7 days a week
+    schedule_class_batch(schedules, rng)
+    schedule_sleep_batch(schedules, rng)
+    schedule_meals_batch(schedules, rng)
+    schedule_daily_activity_batch(schedules, state_id_by_name["exercise"], 4, rng) # 25% chance each day
+    schedule_daily_activity_batch(schedules, state_id_by_name["shop"], 5, rng) # 20% chance each day
+    schedule_daily_activity_batch(schedules, state_id_by_name["chores"], 2, rng) # 50% chance each day
+    return schedules
@@ -1,7 +1,6 @@
 from copy import deepcopy
 import numpy as np
 
-import Schedule
 
 """
 This is the Simulation function heirarchy for the four core Simulation functionalities: handle_state_changes(), update_counters(), handle_new_button_presses(), and update_elevators().
@@ -12,14 +11,15 @@ Entries appear in the order they are located in this file.
     handle_state_change(building, day, person)
 handle_state_changes(building, day, step)
 
-update_counters(building, day)
+increment_counters(building, day)
 
     handle_new_up_button_presses(building)
     handle_new_down_button_presses(building)
 handle_new_button_presses(building)
 
-            handle_onboard(building, elevator)
             handle_offload(building, elevator)
+                handle_left_behind(building, elevator, direction, num_left_behind)
+            handle_onboard(building, elevator)
         update_active_up_elevator(building, elevator)
         update_active_down_elevator(building, elevator)
     update_active_elevators(building, active_elevators)
@@ -38,11 +38,20 @@ floor_id - Integer representing the floor to be updated
 person - Person class
 """
 def state_change_going_down(building, floor_id, person):
-    building.floors[floor_id].people_on_floor.remove(person)
+    person.is_traveling = True
+    person.wait_start_step = building.cur_step
+    building.floors[floor_id].remove_person(person)
     building.floors[floor_id].people_going_down.append(person)
-    if not building.floors[floor_id].is_down_pressed:
+    if building.destination_dispatch is not None:
+        # The Person registers their destination instead of pressing the down button
+        building.destination_dispatch.add_request(person)
+        if building.instrumentation is not None:
+            building.instrumentation.count_event("destination_requests")
+    elif not building.floors[floor_id].is_down_pressed:
         building.floors[floor_id].is_down_pressed = True
         building.floors_new_down_button.append(floor_id)
+        if building.instrumentation is not None:
+            building.instrumentation.count_event("hall_calls")
 """
 Updates a Building when a Person needs to travel up.
 
@@ -52,16 +61,25 @@ floor_id - Integer representing the floor to be updated
 person - Person class
 """
 def state_change_going_up(building, floor_id, person):
-    building.floors[floor_id].people_on_floor.remove(person)
+    person.is_traveling = True
+    person.wait_start_step = building.cur_step
+    building.floors[floor_id].remove_person(person)
     building.floors[floor_id].people_going_up.append(person)
-    if not building.floors[floor_id].is_up_pressed:
+    if building.destination_dispatch is not None:
+        # The Person registers their destination instead of pressing the up button
+        building.destination_dispatch.add_request(person)
+        if building.instrumentation is not None:
+            building.instrumentation.count_event("destination_requests")
+    elif not building.floors[floor_id].is_up_pressed:
         building.floors[floor_id].is_up_pressed = True
         building.floors_new_up_button.append(floor_id)
+        if building.instrumentation is not None:
+            building.instrumentation.count_event("hall_calls")
 
 """
 Handles a scheduled state change for a Person.
 This function is called by update_people when a state change is detected,
-thus the next state change within the Person's schedule is the one to handle (this is the 0th index always because handled data is pop()ed).
+thus the next state change within the Person's schedule is the one to handle (the one at the Person's state change cursor for the day, see Person.pop_state_change).
 
 Takes:
 buidling - Building class
@@ -69,13 +87,11 @@ day - integer representing day of the week (0-6 where 0 corresponds to Sunday an
 person - Person class
 """
 def handle_state_change_scheduled(building, day, person):
-    # Grab the next state and remove old data
-    new_state = person.state_change_ids[day][0, 1]
-    person.state_change_ids[day] = person.state_change_ids[day][1:]
-    person.state_change_steps[day] = person.state_change_steps[day][1:]
+    # Grab the next state and move past it
+    new_state = person.pop_state_change(day)
 
-    # Choose a destination floor based on the Person's dest_floors_by_state_name
-    person.dest_floor = np.random.choice(person.dest_floors_by_state_name[Schedule.state_name_by_id[new_state]])
+    # Choose a destination floor among the Person's (precomputed) choices for the new state
+    person.dest_floor = building.dest_floor_buffer.choose(person.dest_floor_choices[new_state])
 
     # Determine if the Person needs to travel up or down
     cur_floor_id = person.cur_floor
@@ -87,86 +103,155 @@ def handle_state_change_scheduled(building, day, person):
         state_change_going_up(building, cur_floor_id, person)
 
 """
-Checks for and handles scheduled state changes for all Person classes in a Building class. Depends on Schedule generation
+Discards a scheduled state change for a Person who is busy waiting for or riding an Elevator when it comes due.
+Consuming it keeps the Person's state change cursor on their next state change.
 
 Takes:
 building - Building class
 day - integer representing day of the week (0-6 where 0 corresponds to Sunday and 6 corresponds to Saturday)
-step - integer representing the step number of the simulation on the given day
+person - Person class
+"""
+def skip_state_change_scheduled(building, day, person):
+    person.pop_state_change(day)
 
 """
-def handle_state_changes_scheduled(building, day, step):
-    for i in range(len(building.floors)):
-        people = building.floors[i].people_on_floor
-        for person in people:
-            if len(person.state_change_steps[day]) != 0: # Check that there are state changes left (they are popped within handle_state_change)
-                if person.state_change_steps[day][0] == step:
-                    handle_state_change_scheduled(building, day, person)
+Rewinds every Person's state changes on a day of the week to the first one, so Schedules repeat every week in runs longer than 7 days.
+Called by the Engine at the start of each day.
 
+Takes:
+building - Building class
+day - integer representing day of the week (0-6 where 0 corresponds to Sunday and 6 corresponds to Saturday)
 
+Runs in O(P) vectorized time, where P is the number of Persons
 """
-Randomly (based on simulation probabilities) choose Persons to begin waiting for an Elevator at this step, and randomly choose their destination.
+def reset_state_changes(building, day):
+    building.state_changes.reset_day(day)
+
+"""
+Starts residents' random choices for a day from the day's own behavior stream (see RandomStreams), so the day plays out the same however much randomness earlier days used.
+Called by the Engine at the start of each day.
 
 Takes:
 building - Building class
+day - integer representing the day of the simulation (not the day of the week)
 """
-def handle_state_changes_randomly(building, probability):
-    for floor in building.floors:
-        for person in floor.people_on_floor:
-            # With given probability, determine if person will start waiting for an elevator
-            random = np.random.random(None)
-            if random <= probability:
-                dest = np.random.randint(0, len(building.floors))
-                if dest == floor.id:
-                    # Nothing to do, Person is already on destination Floor
-                    continue
-                else: 
-                    person.dest_floor = dest
-                    # Assign person to the correct waiting list
-                    if dest < floor.id:
-                        # Person needs to go down
-                        state_change_going_down(building, floor.id, person)
-                    else:
-                        # Person needs to go up
-                        state_change_going_up(building, floor.id, person)
+def reset_behavior_rng(building, day):
+    building.behavior_rng = building.random_streams.get_day_generator(day)
+    building.dest_floor_buffer.reset(building.behavior_rng)
+
+"""
+Checks for and handles scheduled state changes for all Person classes in a Building class. Depends on Schedule generation
+Only the Persons listed in the Building's state_change_calendar for this day and step are touched.
+If the Building has random traffic enabled (see RandomTraffic), the random trips of this step start first.
+
+Takes:
+building - Building class
+day - integer representing day of the week (0-6 where 0 corresponds to Sunday and 6 corresponds to Saturday)
+step - integer representing the step number of the simulation on the given day
 
+Runs in O(C) time, where C is the number of state changes scheduled at this step
+"""
+def handle_state_changes_scheduled(building, day, step):
+    if building.random_traffic is not None:
+        handle_random_trips(building, step)
 
+    people = building.state_change_calendar[day].get(step)
+    if people is None:
+        return
 
+    for person in people:
+        if person.is_traveling:
+            # Person is waiting for or riding an Elevator, they can't start a new activity until they arrive
+            skip_state_change_scheduled(building, day, person)
+        else:
+            handle_state_change_scheduled(building, day, person)
 
 
 """
-Updates the waiting_counters and riding_counters of all Persons in a Building
+Starts a random trip for a Person on a Floor to a uniformly random Floor (nothing happens if that is the Floor they are on).
 
 Takes:
 building - Building class
-day - integer representing day of the week (0-6 where 0 corresponds to Sunday and 6 corresponds to Saturday)
+floor_id - integer id of the Floor the Person is on
+person - Person class
 """
-def increment_counters(building, day):
-    # Increment all Persons' waiting_counters
-    for i in range(len(building.floors)):
-        for person in building.floors[i].people_going_up:
-            person.waiting_counters += 1
+def start_random_trip(building, floor_id, person):
+    dest = int(building.behavior_rng.integers(0, len(building.floors)))
+    if dest == floor_id:
+        return # Nothing to do, Person is already on destination Floor
+    person.dest_floor = dest
+    # Assign person to the correct waiting list
+    if dest < floor_id:
+        state_change_going_down(building, floor_id, person)
+    else:
+        state_change_going_up(building, floor_id, person)
 
-            #person.daily_steps_waiting += 1
-            #person.hourly_steps_waiting += 1
+"""
+Randomly (based on simulation probabilities) choose Persons to begin waiting for an Elevator at this step, and randomly choose their destination.
+Each Person on a Floor starts a trip with the given probability. Instead of a coin flip per Person, the number of travelers on each Floor is drawn from the binomial distribution
+and that many Persons are chosen uniformly, which gives the same statistics.
 
-        for person in building.floors[i].people_going_down:
-            person.waiting_counters += 1
+Takes:
+building - Building class
+probability - float probability that each Person on a Floor starts a trip at this step
 
-            #person.daily_steps_waiting += 1
-            #person.hourly_steps_waiting += 1
+Runs in O(F + T) time, where F is the number of Floors and T is the number of trips started
+"""
+def handle_state_changes_randomly(building, probability):
+    rng = building.behavior_rng
+    num_travelers = rng.binomial([len(floor.people_on_floor) for floor in building.floors], probability).tolist()
+    for floor, floor_num_travelers in zip(building.floors, num_travelers):
+        if floor_num_travelers == 0:
+            continue
+        travelers = [floor.people_on_floor[i] for i in rng.choice(len(floor.people_on_floor), floor_num_travelers, replace=False).tolist()]
+        for person in travelers:
+            start_random_trip(building, floor.id, person)
 
-    # Increment all Persons' riding_counters and all Elevators' idle_counters, active_counters_loading_counters, returning_counters
-    for i in range(len(building.elevators)):
-        # Increment all Persons' riding_counters that are currently riding an Elevator
-        for key in building.elevators[i].people_by_destination.keys():
-            people = building.elevators[i].people_by_destination[key]
-            for person in people:
-                person.riding_counters += 1
+"""
+Starts the Building's random trips (see RandomTraffic) that happen at this step.
+The next trip step is redrawn when it is stale: the number of Persons on Floors changed since it was drawn, a new hour started, or it was just used.
 
-                #person.daily_steps_traveling += 1
-                #person.hourly_steps_traveling += 1
+Takes:
+building - Building class with random traffic enabled
+step - integer representing the step number of the simulation on the current day
+
+Runs in O(F + T) time, where F is the number of Floors and T is the number of trips started
+"""
+def handle_random_trips(building, step):
+    traffic = building.random_traffic
+    rng = building.behavior_rng
+    floor_counts = [len(floor.people_on_floor) for floor in building.floors]
+    num_present = sum(floor_counts)
+    if num_present != traffic.num_present or building.cur_step >= traffic.redraw_step or building.cur_step > traffic.next_trip_step:
+        traffic.draw_next_trip_step(rng, num_present, building.cur_step, step)
+    if building.cur_step != traffic.next_trip_step:
+        return
+
+    # Every Person on a Floor is equally likely to travel. Travelers are indices into the Floors' people_on_floor lists, one after another
+    num_travelers = traffic.draw_num_travelers(rng, num_present, step)
+    travelers = rng.choice(num_present, num_travelers, replace=False).tolist()
+    people = []
+    for traveler in travelers:
+        floor_id = 0
+        while traveler >= floor_counts[floor_id]:
+            traveler -= floor_counts[floor_id]
+            floor_id += 1
+        people.append((floor_id, building.floors[floor_id].people_on_floor[traveler]))
+    for floor_id, person in people:
+        start_random_trip(building, floor_id, person)
+    traffic.num_present = -1 # Redraw from the next step on
+
+"""
+Updates the idle_counters, active_counters, loading_counters, and returning_counters of all Elevators in a Building.
+Persons are not counted every step, their waiting and riding time is computed by Analytics from the steps recorded when they start waiting, board, and get off.
 
+Takes:
+building - Building class
+day - integer representing day of the week (0-6 where 0 corresponds to Sunday and 6 corresponds to Saturday)
+"""
+def increment_counters(building, day):
+    # Increment all Elevators' idle_counters, active_counters_loading_counters, returning_counters
+    for i in range(len(building.elevators)):
         # Determine if each Elevator is idle, active, loading, or returning and increment respective counters
         if building.elevators[i].is_idle:
             # Elevator is active
@@ -194,19 +279,9 @@ Assigns all Floors within the Building's "floors_new_up_button" list to one of t
 
 Takes:
 building - Building class
-"""            
+"""
 def handle_new_up_button_presses(building):
-    idxs_to_pop = [] # Used to track which up stop idxs have been assigned
-    for i in range(len(building.floors_new_up_button)):
-        requested_floor = building.floors_new_up_button[i]
-        assigned = building.elevator_algorithm.assign_stop(building.elevators, requested_floor, "up") # Attempt to assign stop
-        if assigned:
-            idxs_to_pop.append(i)
-    idxs_to_pop.reverse() # So we pop largest idxs first (popping smallest idxs would mess up larger idxs)
-
-    # Pop assigned up stops
-    for idx in idxs_to_pop:
-        building.floors_new_up_button.pop(idx)
+    building.elevator_algorithm.assign_new_button_presses(building, "up")
 
 """
 Assigns all Floors within the Building's "floors_new_down_button" list to one of the Building's Elevators. Utilizes the ElevatorAlgorithm of the Building.
@@ -215,86 +290,127 @@ Takes:
 building - Building class
 """
 def handle_new_down_button_presses(building):
-    idxs_to_pop = [] # Used to track which down stop idxs have been assigned
-    for i in range(len(building.floors_new_down_button)):
-        requested_floor = building.floors_new_down_button[i]
-        assigned = building.elevator_algorithm.assign_stop(building.elevators, requested_floor, "down") # Attempt to assign stop
-        if assigned:
-            idxs_to_pop.append(i)
-    idxs_to_pop.reverse() # So we pop largest idxs first (popping smallest idxs would mess up larger idxs)
-
-    # Pop assigned down stops
-    for idx in idxs_to_pop:
-        building.floors_new_down_button.pop(idx)
+    building.elevator_algorithm.assign_new_button_presses(building, "down")
 
 """
-Assigns all Floors within the Building's "floors_new_up_button" and "floors_new_down_button" lists to one of the Building's Elevators.
+Assigns all Floors within the Building's "floors_new_up_button" and "floors_new_down_button" lists to the Building's Elevators, as the Building's ElevatorAlgorithm decides.
+With destination dispatch enabled (see DestinationDispatch), the new destination requests are assigned instead.
 
 Takes:
 building - Building class
 """
 def handle_new_button_presses(building):
-    handle_new_up_button_presses(building)
-    handle_new_down_button_presses(building)
+    if building.destination_dispatch is not None:
+        building.destination_dispatch.assign_requests(building)
+    building.elevator_algorithm.assign_hall_calls(building)
     
 """
-Handles Persons onboarding an Elevator to go up at its current floor.
+Handles Persons onboarding an Elevator to go up at its current floor, until the Elevator is full.
+Persons who don't fit stay in line (keeping the step they started waiting at) and the Floor's up call is registered again (see handle_left_behind).
 
 Takes:
 building - Building class
 elevator - Elevator class that is active and onboarding Persons to go up
+
+Runs in O(B) time, where B is the number of Persons boarding (O(W) with destination dispatch, where W is the number of Persons waiting)
 """
 def handle_onboard_up(building, elevator):
-    people_onboarding = building.floors[elevator.cur_floor].people_going_up
-    for person in people_onboarding:
-        # Remove each onboarding person from the people_going_up list on this floor
-        building.floors[elevator.cur_floor].people_going_up.remove(person)
-
-        # Add Person to the list associated with their destination floor
-        if person.dest_floor in elevator.people_by_destination.keys():
-            elevator.people_by_destination[person.dest_floor].append(person)
-        else:
-            elevator.people_by_destination[person.dest_floor] = deepcopy([person])
-        
-        # If their destination floor is not yet in the Elevator's stop list, add it
-        if person.dest_floor not in elevator.up_stops:
-            elevator.up_stops.append(person.dest_floor)
-    # Reset the Floor's up button
-    if building.floors[elevator.cur_floor].is_up_pressed:
-        building.floors[elevator.cur_floor].is_up_pressed = False
+    floor = building.floors[elevator.cur_floor]
+    people_onboarding = floor.people_going_up
+    left_behind = []
+    if building.destination_dispatch is not None:
+        # Only the Persons assigned to this Elevator board
+        people_onboarding, left_behind = building.destination_dispatch.pop_boarding(people_onboarding, elevator, "up", elevator.capacity - elevator.manifest.load)
+    # Persons board first come first served, in the order they started waiting
+    while people_onboarding and elevator.manifest.load < elevator.capacity:
+        person = people_onboarding.popleft()
+        person.board_step = building.cur_step
+        if building.instrumentation is not None:
+            building.instrumentation.count_event("boardings")
+
+        # Add Person to the Elevator's manifest under their destination floor
+        elevator.manifest.add(person)
+
+        # Add their destination floor to the Elevator's stops (nothing happens if it already is one)
+        elevator.up_stops.add(person.dest_floor)
+
+    if building.destination_dispatch is None:
+        left_behind = people_onboarding
+    handle_left_behind(building, elevator, "up", len(left_behind))
+
 """
-Handles Persons onboarding an Elevator to go down at its current floor.
+Handles Persons onboarding an Elevator to go down at its current floor, until the Elevator is full.
+Persons who don't fit stay in line (keeping the step they started waiting at) and the Floor's down call is registered again (see handle_left_behind).
 
 Takes:
 building - Building class
 elevator - Elevator class that is active and onboarding Persons to go down
+
+Runs in O(B) time, where B is the number of Persons boarding (O(W) with destination dispatch, where W is the number of Persons waiting)
 """
 def handle_onboard_down(building, elevator):
-    people_onboarding = building.floors[elevator.cur_floor].people_going_down
-    for person in people_onboarding:
-        # Remove each onboarding person from the people_going_down list on this floor
-        building.floors[elevator.cur_floor].people_going_down.remove(person)
-        
-        # Add Person to the list associated with their destination floor
-        if person.dest_floor in elevator.people_by_destination.keys():
-            elevator.people_by_destination[person.dest_floor].append(person)
-        else:
-            elevator.people_by_destination[person.dest_floor] = deepcopy([person])
-        
-        # If their destination floor is not yet in the Elevator's stop list, add it
-        if person.dest_floor not in elevator.down_stops:
-            elevator.down_stops.append(person.dest_floor)
-        
+    floor = building.floors[elevator.cur_floor]
+    people_onboarding = floor.people_going_down
+    left_behind = []
+    if building.destination_dispatch is not None:
+        # Only the Persons assigned to this Elevator board
+        people_onboarding, left_behind = building.destination_dispatch.pop_boarding(people_onboarding, elevator, "down", elevator.capacity - elevator.manifest.load)
+    # Persons board first come first served, in the order they started waiting
+    while people_onboarding and elevator.manifest.load < elevator.capacity:
+        person = people_onboarding.popleft()
+        person.board_step = building.cur_step
+        if building.instrumentation is not None:
+            building.instrumentation.count_event("boardings")
+
+        # Add Person to the Elevator's manifest under their destination floor
+        elevator.manifest.add(person)
+
+        # Add their destination floor to the Elevator's stops (nothing happens if it already is one)
+        elevator.down_stops.add(person.dest_floor)
+
         # Increment counters tracking how many Persons travel from each Floor
         building.daily_floor_departure_counters[elevator.cur_floor] += 1
         building.hourly_floor_departure_counters[elevator.cur_floor] += 1
 
-    # Reset the Floor's down button
-    if building.floors[elevator.cur_floor].is_down_pressed:
-        building.floors[elevator.cur_floor].is_down_pressed = False
+    if building.destination_dispatch is None:
+        left_behind = people_onboarding
+    handle_left_behind(building, elevator, "down", len(left_behind))
+
+"""
+Records the Persons an Elevator left behind at its current floor because it was full, and registers the Floor's call again for them.
+With destination dispatch, DestinationDispatch.pop_boarding already registered their requests again. Otherwise the Floor's button stays pressed and goes back into the Building's new button list.
+Without anyone left behind, the Floor's button is reset.
+
+Takes:
+building - Building class
+elevator - Elevator class that just onboarded Persons
+direction - String "up" or "down", the direction the Persons onboarded to go
+num_left_behind - integer number of Persons waiting to go direction who didn't fit
+"""
+def handle_left_behind(building, elevator, direction, num_left_behind):
+    floor = building.floors[elevator.cur_floor]
+    if num_left_behind == 0:
+        if direction == "up":
+            floor.is_up_pressed = False
+        else:
+            floor.is_down_pressed = False
+        return
+
+    elevator.num_left_behind += num_left_behind
+    if building.instrumentation is not None:
+        building.instrumentation.count_event("left_behind", num_left_behind)
+    if building.destination_dispatch is not None:
+        return
+    new_button = building.floors_new_up_button if direction == "up" else building.floors_new_down_button
+    if floor.id not in new_button:
+        new_button.append(floor.id)
+    if direction == "up":
+        floor.is_up_pressed = True
+    else:
+        floor.is_down_pressed = True
 
 """
-Handles people onboarding an Elevator at its current floor.
+Handles people onboarding an Elevator at its current floor, and records the Elevator's load as it leaves.
 
 Takes:
 building - Building class
@@ -317,24 +433,33 @@ def handle_onboard(building, elevator):
     else:
         handle_onboard_down(building, elevator)
 
+    elevator.record_departure()
+
 """
 Handles people offloading an Elevator at its current floor.
 
 Takes:
 building - Building class
 elevator - Elevator class that is active
+
+Runs in O(R) time, where R is the number of Persons getting off
 """
 def handle_offload(building, elevator):
-    people_offloading = elevator.people_by_destination[elevator.cur_floor]
+    people_offloading = elevator.manifest.remove_passengers(elevator.cur_floor)
     if len(people_offloading) != 0:
         for person in people_offloading:
-            # Update Person's cur_floor, the Floor's people_on_floor, and the Elevator's people_by_destination
+            # Record the finished trip, then update Person's cur_floor and the Floor's people_on_floor
+            building.trip_records.add(person.id, person.cur_floor, elevator.cur_floor, person.wait_start_step, person.board_step, building.cur_step)
             person.cur_floor = elevator.cur_floor
-            building.floors[elevator.cur_floor].people_on_floor.append(person)
-            elevator.people_by_destination[elevator.cur_floor].remove(person)
-            # Increment counters tracking how many Persons travel to each Floor
-            building.daily_floor_destination_counters[elevator.cur_floor] += 1
-            building.hourly_floor_destination_counters[elevator.cur_floor] += 1
+            person.is_traveling = False
+            person.wait_start_step = -1
+            person.board_step = -1
+            building.floors[elevator.cur_floor].add_person(person)
+        if building.instrumentation is not None:
+            building.instrumentation.count_event("alightings", len(people_offloading))
+        # Increment counters tracking how many Persons travel to each Floor
+        building.daily_floor_destination_counters[elevator.cur_floor] += len(people_offloading)
+        building.hourly_floor_destination_counters[elevator.cur_floor] += len(people_offloading)
 
 """
 Updates all returning Elevators in a Building each tick of simulation.
@@ -345,16 +470,14 @@ returning_elevators - list of Elevators that are returning
 """
 def update_returning_elevators(building, returning_elevators):
     for elevator in returning_elevators:
-        # Check if the Elevator was assigned stops (returning cancelled)
+        # Check if the Elevator was assigned stops (returning cancelled, it starts moving towards them next step)
         if len(elevator.up_stops) != 0:
             elevator.set_state_active(is_moving_up=True)
         elif len(elevator.down_stops) != 0:
             elevator.set_state_active(is_moving_up=False)
-            
-        if elevator.cur_floor == elevator.return_to_floor:
+        elif elevator.cur_floor == elevator.return_to_floor:
             # Elevator should become idle
-            elevator.is_returning = False
-            elevator.is_idle = True
+            elevator.set_state_idle()
         else:
             # Move Elevator one Floor closer to return_to_floor
             if elevator.is_moving_up:
@@ -370,30 +493,14 @@ if frogs_are_cool:
 """
 
 """
-This function is called by update_active_up_elevator and update_active_down_elevator when an Elevator stops being active.
+This function is called by handle_loading_elevator_state_change when an Elevator stops being active. The Building's ElevatorAlgorithm decides if it becomes idle or starts returning.
 
 Takes:
 building - Building class
 elevator - Elevator class that needs to stop being active
 """
 def set_elevator_idle_or_returning(building, elevator):
-    if building.elevator_algorithm.algorithm == "stay_where_stopped":
-        # Elevator becomes idle
-        elevator.set_state_idle()
-
-    elif building.elevator_algorithm.algorithm == "return_to":
-        # Elevator starts returning
-        if elevator.cur_floor == elevator.return_to_floor:
-            # Elevator becomes idle because it's already at its return_to_floor
-            elevator.set_state_idle()
-
-        elif elevator.cur_floor < elevator.return_to_floor:
-            # Elevator is below return_to_floor
-            elevator.set_state_returning(is_moving_up=True)
-
-        else:
-            # Elevator is above return_to_floor
-            elevator.set_state_returning(is_moving_up=False)
+    building.elevator_algorithm.end_route(building, elevator)
 
 """
 Updates an active Elevator travelling up in a Building each tick of simulation.
@@ -412,12 +519,14 @@ def update_active_up_elevator(building, elevator):
     
     if elevator.cur_floor in elevator.up_stops:
         elevator.set_state_loading()
+        if building.instrumentation is not None:
+            building.instrumentation.count_event("stops")
+
+        # Handle people that want to offload first, making room for people that want to onboard
+        handle_offload(building, elevator)
 
         # Handle people that want to onboard
         handle_onboard(building, elevator)
-        
-        # Handle people that want to offload
-        handle_offload(building, elevator)
 
         # Remove the handled floor from up_stops
         elevator.up_stops.remove(elevator.cur_floor)
@@ -449,12 +558,14 @@ def update_active_down_elevator(building, elevator):
     
     if elevator.cur_floor in elevator.down_stops:
         elevator.set_state_loading()
+        if building.instrumentation is not None:
+            building.instrumentation.count_event("stops")
+
+        # Handle people that want to offload first, making room for people that want to onboard
+        handle_offload(building, elevator)
 
         # Handle people that want to onboard
         handle_onboard(building, elevator)
-    
-        # Handle people that want to offload
-        handle_offload(building, elevator)
 
         # Remove the handled floor from down_stops
         elevator.down_stops.remove(elevator.cur_floor)
@@ -561,6 +672,8 @@ Takes:
 building - Building class
 """
 def update_elevators(building):
+    building.elevator_algorithm.update(building)
+
     returning_elevators = []
     active_elevators = []
     loading_elevators = []
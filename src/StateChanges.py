@@ -0,0 +1,169 @@
+import numpy as np
+
+"""
+Stores the weekly state change data of many Persons in flat, offset-indexed (CSR style) arrays shared by all of them.
+Each Person is a row. Row r's state changes on day d are steps[day_starts[r, d]:day_starts[r, d + 1]] (and the same rows of ids), and cursors[r, d] is the index of the next one to handle.
+Handling a state change only moves a cursor, so the weekly data is never copied or destroyed, and rewinding a day's cursors (reset_day) replays the same week again.
+
+generate_state_changes(schedules, rng)
+concatenate_state_changes(people)
+bind_state_changes(people, state_changes)
+"""
+
+class StateChanges:
+    size = 0 # Number of rows (Persons)
+
+    steps = None # Numpy int16 array of shape (C,). Step (within a day) of every state change, ordered by row, then day, then step
+    ids = None # Numpy int8 array of shape (C, 2). (3, 4) means a state change from 3 to 4
+    day_starts = None # Numpy int64 array of shape (P, D+1). Idx of each row's first state change on each day, and of the end of its last day
+    cursors = None # Numpy int64 array of shape (P, D). Idx of each row's next state change to handle on each day (state changes before it were handled or skipped)
+
+    """
+    Takes:
+    steps - numpy array of shape (C,) of steps within a day
+    ids - numpy array of shape (C, 2) of (old state id, new state id)
+    day_starts - numpy array of shape (P, D+1) of offsets into steps and ids (see above)
+    cursors - optional numpy array of shape (P, D) of offsets to start from, None to start from the first state change of every day
+    """
+    def __init__(self, steps, ids, day_starts, cursors=None):
+        self.size = len(day_starts)
+        self.steps = steps
+        self.ids = ids
+        self.day_starts = day_starts
+        if cursors is None:
+            self.cursors = day_starts[:, :-1].copy()
+        else:
+            self.cursors = cursors
+
+    """
+    Returns:
+    Numpy array (view) of the steps of a row's state changes on a day that haven't been handled or skipped yet, in order
+    """
+    def get_steps(self, row, day):
+        return self.steps[self.cursors[row, day]:self.day_starts[row, day + 1]]
+
+    """
+    Returns:
+    Numpy array (view) of shape (C, 2) of a row's state changes on a day that haven't been handled or skipped yet, in order
+    """
+    def get_ids(self, row, day):
+        return self.ids[self.cursors[row, day]:self.day_starts[row, day + 1]]
+
+    """
+    Consumes a row's next state change on a day.
+
+    Returns:
+    Integer state id the row changes to
+    """
+    def pop(self, row, day):
+        cursor = self.cursors[row, day]
+        self.cursors[row, day] = cursor + 1
+        return self.ids[cursor, 1]
+
+    """
+    Rewinds every row's cursor on a day back to its first state change on that day.
+
+    Runs in O(P) vectorized time, where P is the number of rows
+    """
+    def reset_day(self, day):
+        self.cursors[:, day] = self.day_starts[:, day]
+
+    """
+    Returns:
+    Tuple (rows, steps) of numpy arrays with one entry per state change on a day (handled or not), ordered by row, then step
+
+    Runs in O(P + C) vectorized time, where C is the number of state changes on the day
+    """
+    def get_day_state_changes(self, day):
+        starts = self.day_starts[:, day]
+        lengths = self.day_starts[:, day + 1] - starts
+        rows = np.repeat(np.arange(self.size), lengths)
+        # Idx of each state change is its row's start plus its position within the row
+        first_positions = np.cumsum(lengths) - lengths
+        idxs = np.arange(len(rows)) + np.repeat(starts - first_positions, lengths)
+        return rows, self.steps[idxs]
+
+"""
+Computes the state change data of many schedules at once: the exact step number that a Person changes state, as well as what states they change between.
+A state change happens wherever a schedule's state differs from the previous hour's (continuing across days), at a random step up to 20 minutes before or after the hour.
+
+Takes:
+schedules - numpy array of shape (P, D, N) of P weekly schedules, where D is the number of days and N is the number of hours in a day
+rng - numpy Generator to draw the randomized steps from
+
+Returns:
+StateChanges class where row i holds the state changes of schedules[i]
+
+Runs in O(P*D*N) vectorized time
+"""
+def generate_state_changes(schedules, rng):
+    num_people, num_days, num_hours = schedules.shape
+    states = schedules.reshape(num_people, num_days * num_hours)
+    is_change = np.zeros(states.shape, dtype=bool)
+    is_change[:, 1:] = states[:, 1:] != states[:, :-1]
+    idxs = np.flatnonzero(is_change) # Ordered by row, then day, then hour
+
+    flat_states = states.ravel()
+    ids = np.stack((flat_states[idxs - 1], flat_states[idxs]), axis=1).astype(np.int8)
+
+    # Each hour is 1028 steps (1hr = 3600s. 1 step = 3.5s. 3600/3.5 = 1028.5 steps)
+    # 343 is roughly 1/3 of an hour in steps, so people can be up to 20 mins early or late when switching activities.
+    # At hour 0 we can't be early for a state change (since daily step number would be negative, it starts at 0 each day), so people are allowed to be twice as late.
+    hours = idxs % num_hours
+    offsets = rng.integers(0, 686, size=len(idxs), dtype=np.int16)
+    offsets[hours != 0] -= 343
+    steps = (1028 * hours + offsets).astype(np.int16) # Steps within a day are at most 1028 * 23 + 343
+
+    # Offsets of every (row, day) in order, each row's last entry is the next row's first
+    offsets = np.zeros((num_people * num_days + 1,), dtype=np.int64)
+    offsets[1:] = np.cumsum(is_change.reshape(num_people, num_days, num_hours).sum(axis=2).ravel())
+    day_starts = offsets[np.arange(num_people)[:, None] * num_days + np.arange(num_days + 1)[None, :]]
+    return StateChanges(steps, ids, day_starts)
+
+"""
+Builds one StateChanges holding the state change data (and cursors) of several Persons, in order.
+When every Person is already bound to the same StateChanges in order (e.g. every resident of a Building), that StateChanges is returned as is.
+
+Takes:
+people - list of Person classes
+
+Returns:
+StateChanges class where row i holds people[i]'s state change data
+"""
+def concatenate_state_changes(people):
+    if len(people) != 0:
+        shared = people[0].state_changes
+        if shared.size == len(people) and all(person.state_changes is shared and person.state_change_row == i for i, person in enumerate(people)):
+            return shared
+
+    steps = []
+    ids = []
+    day_starts = []
+    cursors = []
+    offset = 0
+    for person in people:
+        state_changes = person.state_changes
+        row = person.state_change_row
+        start = state_changes.day_starts[row, 0]
+        end = state_changes.day_starts[row, -1]
+        steps.append(state_changes.steps[start:end])
+        ids.append(state_changes.ids[start:end])
+        day_starts.append(state_changes.day_starts[row] - start + offset)
+        cursors.append(state_changes.cursors[row] - start + offset)
+        offset += end - start
+
+    if len(people) == 0:
+        return StateChanges(np.zeros((0,), dtype=np.int16), np.zeros((0, 2), dtype=np.int8), np.zeros((0, 8), dtype=np.int64))
+    return StateChanges(np.concatenate(steps).astype(np.int16), np.concatenate(ids).astype(np.int8), np.array(day_starts, dtype=np.int64), np.array(cursors, dtype=np.int64))
+
+"""
+Makes Persons read and consume their state changes from rows of a shared StateChanges.
+
+Takes:
+people - list of Person classes
+state_changes - StateChanges class where row i holds people[i]'s state change data
+"""
+def bind_state_changes(people, state_changes):
+    for i in range(len(people)):
+        people[i].state_changes = state_changes
+        people[i].state_change_row = i
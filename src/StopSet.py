@@ -0,0 +1,132 @@
+"""
+Stop sets of Elevators, stored as integer bitmasks of Floor ids, and a Building wide index of which Elevators have a stop at each Floor in each direction.
+Adding, removing, and checking a stop take O(1) time, and the nearest stop in either direction is found by bit scanning instead of scanning a list.
+
+StopSet(car_id=-1, cars_by_floor=None)
+StopIndex(num_floors)
+"""
+
+class StopSet:
+    mask = 0 # Bit f is set if Floor f is a stop
+    size = 0 # Number of stops (set bits of mask)
+    car_bit = 0 # 1 << id of the Elevator the StopSet belongs to, 0 if it has none
+    cars_by_floor = None # Optional list shared with the Elevators' other StopSets of the same direction (see StopIndex), kept up to date as stops are added and removed
+
+    """
+    Takes:
+    car_id - integer id of the Elevator the StopSet belongs to, -1 if it doesn't belong to one
+    cars_by_floor - optional list of integers (StopIndex.up_cars or StopIndex.down_cars) to record this StopSet's stops in
+    """
+    def __init__(self, car_id=-1, cars_by_floor=None):
+        self.mask = 0
+        self.size = 0
+        self.car_bit = 1 << car_id if car_id >= 0 else 0
+        self.cars_by_floor = cars_by_floor
+
+    """
+    Adds a stop. Nothing happens if it already is one.
+
+    Takes:
+    floor_id - integer Floor id
+
+    Runs in O(1) time
+    """
+    def add(self, floor_id):
+        bit = 1 << floor_id
+        if self.mask & bit:
+            return
+        self.mask |= bit
+        self.size += 1
+        if self.cars_by_floor is not None:
+            self.cars_by_floor[floor_id] |= self.car_bit
+
+    """
+    Removes a stop.
+
+    Takes:
+    floor_id - integer Floor id of a stop, raises ValueError if it isn't one
+
+    Runs in O(1) time
+    """
+    def remove(self, floor_id):
+        bit = 1 << floor_id
+        if not self.mask & bit:
+            raise ValueError("Floor " + str(floor_id) + " is not a stop")
+        self.mask ^= bit
+        self.size -= 1
+        if self.cars_by_floor is not None:
+            self.cars_by_floor[floor_id] &= ~self.car_bit
+
+    """
+    Takes:
+    floor_id - integer Floor id
+
+    Returns:
+    Integer id of the lowest stop at or above floor_id, -1 if there is none
+
+    Runs in O(1) time (a few big integer operations)
+    """
+    def get_next_at_or_above(self, floor_id):
+        mask = self.mask >> floor_id
+        if mask == 0:
+            return -1
+        return floor_id + (mask & -mask).bit_length() - 1
+
+    """
+    Takes:
+    floor_id - integer Floor id
+
+    Returns:
+    Integer id of the highest stop at or below floor_id, -1 if there is none
+
+    Runs in O(1) time (a few big integer operations)
+    """
+    def get_next_at_or_below(self, floor_id):
+        return (self.mask & ((2 << floor_id) - 1)).bit_length() - 1
+
+    def __contains__(self, floor_id):
+        return floor_id >= 0 and (self.mask >> floor_id) & 1 == 1
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.mask != 0
+
+    # Stops in order of Floor id
+    def __iter__(self):
+        mask = self.mask
+        while mask:
+            low_bit = mask & -mask
+            yield low_bit.bit_length() - 1
+            mask ^= low_bit
+
+    def __repr__(self):
+        return "StopSet(" + str(list(self)) + ")"
+
+class StopIndex:
+    # Lists indexed by Floor id of bitmasks of Elevator ids with a stop at that Floor, going up and going down
+    up_cars = []
+    down_cars = []
+
+    """
+    Takes:
+    num_floors - integer number of Floors in the Building
+    """
+    def __init__(self, num_floors):
+        self.up_cars = [0] * num_floors
+        self.down_cars = [0] * num_floors
+
+    """
+    Takes:
+    floor_id - integer Floor id
+    direction - string "up" or "down"
+
+    Returns:
+    Boolean representing whether any Elevator has a stop at floor_id in direction
+
+    Runs in O(1) time
+    """
+    def has_stop(self, floor_id, direction):
+        cars = self.up_cars if direction == "up" else self.down_cars
+        return cars[floor_id] != 0
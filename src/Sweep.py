@@ -0,0 +1,205 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+
+import Config
+import Replication
+
+"""
+Runs a simulation for every configuration in a sweep (and every seed), in parallel, and caches each result on disk.
+Results are stored in cache_dir under a hash of the configuration, seed, and results_version, so rerunning or extending a sweep only simulates the new points.
+
+get_source_version()
+expand_grid(base_config, grid)
+    get_cache_key(config, seed)
+    load_cached_result(cache_dir, key)
+    save_cached_result(cache_dir, key, config, seed, result)
+run_sweep(configs, seeds, cache_dir, max_workers)
+    get_varied_keys(configs)
+get_sweep_table(configs, results)
+write_table_csv(rows, path)
+"""
+
+default_cache_dir = "sweep_cache"
+
+# Configuration keys that change how a simulation runs but not its results, left out of cache keys
+non_result_keys = [
+    "engine", # The tick and event Engines give the same results
+    "instrumentation",
+    "population_cache_dir", # Cached residents are the ones the seed would generate
+    "keep_trip_records", # Trip averages come from running totals
+]
+
+"""
+Returns:
+String hex digest of the source of every module in this directory. Any change to the simulation code changes it, so cached results from older code are never reused.
+"""
+def get_source_version():
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(source_dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode("utf-8"))
+            with open(os.path.join(source_dir, name), "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+# Version of the simulation's results, part of every cache key
+results_version = get_source_version()
+
+"""
+Builds one configuration for every combination of grid values.
+
+Takes:
+base_config - configuration dictionary (see Config) holding the values that aren't swept
+grid - dictionary where keys are configuration keys and values are lists of values to try for that key, e.g. {"elevator_algorithm": ["stay_where_stopped", "return_to_floor"]}.
+       Keys whose values must change together (e.g. all elevator_* lists when sweeping the number of Elevators) can be swept as one tuple key, e.g.
+       {("elevator_starting_floors", "elevator_capacities"): [([0, 0], [10, 10]), ([0, 0, 0], [10, 10, 10])]}
+
+Returns:
+List of configuration dictionaries, the last grid key varying fastest
+"""
+def expand_grid(base_config, grid):
+    configs = []
+    for values in itertools.product(*grid.values()):
+        config = dict(base_config)
+        for key, value in zip(grid.keys(), values):
+            if isinstance(key, tuple):
+                config.update(zip(key, value))
+            else:
+                config[key] = value
+        configs.append(config)
+    return configs
+
+"""
+Takes:
+config - configuration dictionary (see Config)
+seed - integer random seed
+
+Returns:
+String hex digest identifying the configuration and seed under the current results_version. Key order in config and non_result_keys don't matter.
+"""
+def get_cache_key(config, seed):
+    result_config = {key: value for key, value in config.items() if key not in non_result_keys}
+    text = json.dumps({"config": result_config, "seed": seed, "results_version": results_version}, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+"""
+Returns:
+Dictionary from Replication.run_replication, or None if no result is cached under key
+"""
+def load_cached_result(cache_dir, key):
+    path = os.path.join(cache_dir, key + ".json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)["result"]
+
+"""
+Stores a result along with the configuration and seed it came from, so the cache can be inspected by hand.
+Results are written to a temporary file first, so an interrupted sweep never leaves a partial result behind.
+"""
+def save_cached_result(cache_dir, key, config, seed, result):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, key + ".json")
+    with open(path + ".tmp", "w") as file:
+        json.dump({"config": config, "seed": seed, "results_version": results_version, "result": result}, file)
+    os.replace(path + ".tmp", path)
+
+"""
+Runs every configuration with every seed, reusing cached results and simulating the rest across a pool of worker processes.
+
+Takes:
+configs - list of configuration dictionaries (see Config and expand_grid)
+seeds - list of integer random seeds
+cache_dir - string path of the directory results are cached in, None to disable caching
+max_workers - integer maximum number of worker processes, None to use one per CPU
+
+Returns:
+List (one per configuration) of lists (one per seed) of dictionaries from Replication.run_replication
+"""
+def run_sweep(configs, seeds, cache_dir=default_cache_dir, max_workers=None):
+    results = [[None] * len(seeds) for _ in configs]
+
+    pending = [] # (config index, seed index, cache key) of points that must be simulated
+    for i in range(len(configs)):
+        for j in range(len(seeds)):
+            key = get_cache_key(configs[i], seeds[j])
+            if cache_dir is not None:
+                results[i][j] = load_cached_result(cache_dir, key)
+            if results[i][j] is None:
+                pending.append((i, j, key))
+
+    if len(pending) != 0:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending_results = executor.map(Replication.run_replication, [configs[i] for i, _, _ in pending], [seeds[j] for _, j, _ in pending])
+            for (i, j, key), result in zip(pending, pending_results):
+                results[i][j] = result
+                if cache_dir is not None:
+                    save_cached_result(cache_dir, key, configs[i], seeds[j], result)
+
+    return results
+
+"""
+Returns:
+List of configuration keys whose values differ between configs, in the order they appear in the first configuration
+"""
+def get_varied_keys(configs):
+    return [key for key in configs[0] if any(config.get(key) != configs[0][key] for config in configs)]
+
+"""
+Flattens sweep results into one table with a row per configuration.
+Each row holds the swept configuration values followed by the mean and 95% confidence interval of every metric across seeds (see Replication.summarize_replications).
+
+Takes:
+configs - list of configuration dictionaries passed to run_sweep
+results - list of lists returned by run_sweep
+
+Returns:
+List of dictionaries (rows) with the same keys in the same order
+"""
+def get_sweep_table(configs, results):
+    varied_keys = get_varied_keys(configs)
+
+    rows = []
+    for config, config_results in zip(configs, results):
+        row = {key: config[key] for key in varied_keys}
+        for name, stats in Replication.summarize_replications(config_results).items():
+            row[name] = stats["mean"]
+            row[name + " CI Low"] = stats["ci_low"]
+            row[name + " CI High"] = stats["ci_high"]
+        rows.append(row)
+
+    # Metrics missing from some configurations (e.g. trip metrics when no trip finished) are left empty
+    columns = []
+    for row in rows:
+        columns += [column for column in row if column not in columns]
+    return [{column: row.get(column, "") for column in columns} for row in rows]
+
+def write_table_csv(rows, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep elevator parameters of Config.HERE_config and write one table of results.")
+    parser.add_argument("grid", help="JSON object mapping configuration keys to lists of values, e.g. '{\"elevator_algorithm\": [\"stay_where_stopped\", \"return_to_floor\"]}'")
+    parser.add_argument("-n", "--num-seeds", type=int, default=5)
+    parser.add_argument("-s", "--base-seed", type=int, default=0)
+    parser.add_argument("-w", "--max-workers", type=int, default=None)
+    parser.add_argument("-c", "--cache-dir", default=default_cache_dir)
+    parser.add_argument("-o", "--output", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    configs = expand_grid(Config.HERE_config, json.loads(args.grid))
+    seeds = [args.base_seed + i for i in range(args.num_seeds)]
+
+    results = run_sweep(configs, seeds, args.cache_dir, args.max_workers)
+    write_table_csv(get_sweep_table(configs, results), args.output)
+    print("Wrote", len(configs), "configurations x", len(seeds), "seeds to", args.output)
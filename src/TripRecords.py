@@ -0,0 +1,124 @@
+import numpy as np
+
+"""
+Records of every finished trip, stored in a growable int64 NumPy array instead of a list of tuples, plus running totals of trip wait and ride steps.
+Averages and percentiles over all trips are computed from the running totals, so they don't scan the records and still cover trips whose records were dropped.
+
+TripRecords(keep_all=True)
+"""
+
+# Columns of a record
+person_id_column = 0
+origin_column = 1
+dest_column = 2
+wait_start_column = 3
+board_column = 4
+arrival_column = 5
+num_columns = 6
+
+class TripRecords:
+    # Rows [0, size) are records (person id, origin Floor id, destination Floor id, wait start step, board step, arrival step) in the order trips finished, rows past size are unused capacity
+    records = None
+    size = 0
+
+    # Number of trips finished before the first kept record, whose records were dropped (see release)
+    first_kept = 0
+
+    # Whether every record is kept, False to drop records Analytics has reported on
+    keep_all = True
+
+    # Running totals over every finished trip, including dropped records
+    num_trips = 0
+    wait_steps_sum = 0
+    ride_steps_sum = 0
+    wait_step_counts = None # numpy int64 array, element i is the number of trips that waited i steps
+
+    """
+    Takes:
+    keep_all - boolean, False to drop records once they're released
+    """
+    def __init__(self, keep_all=True):
+        self.records = np.zeros((1024, num_columns), dtype=np.int64)
+        self.size = 0
+        self.first_kept = 0
+        self.keep_all = keep_all
+        self.num_trips = 0
+        self.wait_steps_sum = 0
+        self.ride_steps_sum = 0
+        self.wait_step_counts = np.zeros(1024, dtype=np.int64)
+
+    """
+    Records a finished trip, doubling the capacity of the records when it runs out.
+
+    Runs in amortized O(1) time
+    """
+    def add(self, person_id, origin, dest, wait_start_step, board_step, arrival_step):
+        if self.size == len(self.records):
+            self.records = np.concatenate([self.records, np.zeros((max(len(self.records), 1024), num_columns), dtype=np.int64)])
+        self.records[self.size] = (person_id, origin, dest, wait_start_step, board_step, arrival_step)
+        self.size += 1
+
+        wait_steps = board_step - wait_start_step
+        if wait_steps >= len(self.wait_step_counts):
+            self.wait_step_counts = np.concatenate([self.wait_step_counts, np.zeros(max(wait_steps + 1, 2 * len(self.wait_step_counts)) - len(self.wait_step_counts), dtype=np.int64)])
+        self.wait_step_counts[wait_steps] += 1
+        self.num_trips += 1
+        self.wait_steps_sum += wait_steps
+        self.ride_steps_sum += arrival_step - board_step
+
+    # Number of trips finished, including dropped records
+    def __len__(self):
+        return self.num_trips
+
+    """
+    Takes:
+    start - integer index (counted over every finished trip) of the first record to return, records before first_kept are dropped and skipped
+
+    Returns:
+    (N, 6) numpy int64 array view of the kept records from start on, only valid until the next add
+    """
+    def get_records(self, start=0):
+        return self.records[max(start - self.first_kept, 0):self.size]
+
+    """
+    Returns:
+    List of tuples of the kept records
+    """
+    def get_tuples(self):
+        return [tuple(record) for record in self.get_records().tolist()]
+
+    """
+    Marks the records before an index as no longer needed. They are dropped unless keep_all is set.
+
+    Takes:
+    index - integer index (counted over every finished trip) of the first record still needed
+    """
+    def release(self, index):
+        if self.keep_all or index <= self.first_kept:
+            return
+        num_dropped = min(index - self.first_kept, self.size)
+        self.records[:self.size - num_dropped] = self.records[num_dropped:self.size]
+        self.size -= num_dropped
+        self.first_kept += num_dropped
+
+    """
+    Takes:
+    q - float percentile in [0, 100]
+
+    Returns:
+    Float percentile of every finished trip's wait steps, equal to np.percentile of them (linear interpolation)
+
+    Runs in O(W) time, where W is the longest wait in steps
+    """
+    def get_wait_percentile(self, q):
+        position = q / 100 * (self.num_trips - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, self.num_trips - 1)
+        # Wait steps of the trips at sorted positions lower and upper
+        cumulative_counts = np.cumsum(self.wait_step_counts)
+        a, b = np.searchsorted(cumulative_counts, [lower + 1, upper + 1])
+        t = position - lower
+        # Same formula as np.percentile, so results match to the last bit
+        if t >= 0.5:
+            return float(b - (b - a) * (1 - t))
+        return float(a + (b - a) * t)
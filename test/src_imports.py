@@ -2,11 +2,28 @@
 import sys, os
 sys.path.append(os.path.join(os.path.dirname(sys.path[0]),'src')) # If src code is moved, the path input must be changed here
 
+from Analytics import Analytics
 from Building import Building
+from DestinationDispatch import DestinationDispatch, enable_destination_dispatch
 from Elevator import Elevator
-from ElevatorAlgorithm import ElevatorAlgorithm
-from Floor import Floor
+from ElevatorAlgorithm import ElevatorAlgorithm, ReturnTo, StayWhereStopped, elevator_algorithms, get_elevator_algorithm, has_stop, register_elevator_algorithm
+from ETAAlgorithm import BatchETAAlgorithm, ElevatorStates, ETAAlgorithm
+from Floor import Floor, generate_residents
+from Manifest import Manifest
 from Person import Person
+from RandomBuffer import RandomBuffer
+from RandomStreams import RandomStreams
+from StopSet import StopIndex, StopSet
+from TripRecords import TripRecords
+import Checkpoint
+import Config
+import Engine
+import Instrumentation
+import PopulationArtifact
+import RandomTraffic
+import Replication
 import Schedule
 import Simulation
+import StateChanges
+import Sweep
 import constants
\ No newline at end of file
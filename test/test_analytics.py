@@ -0,0 +1,90 @@
+import unittest
+
+from src_imports import Analytics
+from src_imports import Building
+from src_imports import Simulation
+
+simple_floor_populations = [1, 1] # Two floor building with one resident on each floor
+simple_dest_floors_by_state_name = {
+    "freetime": [0, 1], # Person can go anywhere during freetime
+    "class": [0], # Must go to ground floor for in person class
+    "sleep": [], # Sleep only happens at person's home floor
+    "meal": [0], # Must go to ground floor to eat out / pickup food
+    "exercise": [0], # Send to ground floor
+    "shop": [0], # Must go to ground floor to go to store
+    "chores": [], # Chores only happen at person's home floor
+    "study": [0], # Send to ground floor
+}
+simple_elevator_algorithm = "stay_where_stopped"
+simple_elevator_starting_floors = [0, 0] # Two elevators, both starting at ground floor
+simple_elevator_capacities = [10, 10]
+simple_elevator_steps_per_loads = [5, 5] # Num simulation steps an elevator must pass (doing nothing) each time it stops to onload or offload passengers
+simple_elevator_return_to_floors = [1, 1]
+
+class TestAnalytics(unittest.TestCase):
+    """
+    Helpers moving a Person through the stages of a trip from Floor 0 to Floor 1 on Elevator 0, setting the Building's cur_step before each stage.
+    """
+    def start_trip(self, building, person, wait_start_step):
+        building.cur_step = wait_start_step
+        person.dest_floor = 1
+        Simulation.state_change_going_up(building, 0, person)
+
+    def board_trip(self, building, board_step):
+        building.cur_step = board_step
+        building.elevators[0].cur_floor = 0
+        Simulation.handle_onboard_up(building, building.elevators[0])
+
+    def finish_trip(self, building, arrival_step):
+        building.cur_step = arrival_step
+        building.elevators[0].cur_floor = 1
+        Simulation.handle_offload(building, building.elevators[0])
+
+    """
+    Asserts that hourly averages split waiting and riding intervals that cross an hour boundary between both hours, for finished trips and trips in progress.
+    """
+    def test_compute_hourly_step_averages(self):
+        building = Building(simple_floor_populations, simple_dest_floors_by_state_name, simple_elevator_algorithm, simple_elevator_starting_floors, simple_elevator_capacities, simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
+        analytics = Analytics()
+        finished_person = building.floors[0].people_on_floor[0]
+        traveling_person = building.floors[1].people_on_floor[0]
+
+        # finished_person waits [990, 1000), rides [1000, 1040). traveling_person waits from 1020 and is still waiting at the end
+        self.start_trip(building, finished_person, 990)
+        self.board_trip(building, 1000)
+        building.cur_step = 1020
+        traveling_person.dest_floor = 0
+        Simulation.state_change_going_down(building, 1, traveling_person)
+
+        building.cur_step = 1028
+        analytics.compute_hourly_step_averages(building)
+        self.finish_trip(building, 1040)
+        building.cur_step = 1100
+        analytics.compute_hourly_step_averages(building)
+
+        # First hour: 10 + 8 steps waiting, 28 steps riding. Second hour: 72 steps waiting, 12 steps riding. Averaged over 2 Persons
+        self.assertEqual([9.0, 36.0], analytics.hourly_avg_person_waiting_steps)
+        self.assertEqual([14.0, 6.0], analytics.hourly_avg_person_riding_steps)
+        return
+
+    """
+    Asserts that daily averages cover every step since the previous day change.
+    """
+    def test_compute_daily_step_averages(self):
+        building = Building(simple_floor_populations, simple_dest_floors_by_state_name, simple_elevator_algorithm, simple_elevator_starting_floors, simple_elevator_capacities, simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
+        analytics = Analytics()
+        person = building.floors[0].people_on_floor[0]
+
+        # Person waits [24680, 24690) and rides [24690, 24700), across the first day change
+        self.start_trip(building, person, 24680)
+        building.cur_step = 24685
+        analytics.compute_daily_step_averages(building)
+        self.board_trip(building, 24690)
+        self.finish_trip(building, 24700)
+        building.cur_step = 2 * 24685
+        analytics.compute_daily_step_averages(building)
+
+        self.assertEqual([2.5, 2.5], analytics.daily_avg_person_waiting_steps)
+        self.assertEqual([0.0, 5.0], analytics.daily_avg_person_riding_steps)
+        self.assertEqual([(person.id, 0, 1, 24680, 24690, 24700)], building.trip_records.get_tuples())
+        return
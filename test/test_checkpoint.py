@@ -0,0 +1,97 @@
+import unittest
+import io, contextlib
+import numpy as np
+
+from src_imports import Analytics
+from src_imports import Building
+from src_imports import Checkpoint
+from src_imports import Engine
+from src_imports import constants
+
+simple_floor_populations = [0, 3, 3, 3, 3]
+simple_dest_floors_by_state_name = {
+    "freetime": [0, 1, 2, 3, 4], # Person can go anywhere during freetime
+    "class": [0], # Must go to ground floor for in person class
+    "sleep": [], # Sleep only happens at person's home floor
+    "meal": [0], # Must go to ground floor to eat out / pickup food
+    "exercise": [1], # Send to second floor
+    "shop": [0], # Must go to ground floor to go to store
+    "chores": [], # Chores only happen at person's home floor
+    "study": [0], # Send to ground floor
+}
+simple_elevator_starting_floors = [0, 0]
+simple_elevator_capacities = [10, 10]
+simple_elevator_steps_per_loads = [2, 2] # Num simulation steps an elevator must pass (doing nothing) each time it stops to onload or offload passengers
+simple_elevator_return_to_floors = [0, 2]
+
+class TestCheckpoint(unittest.TestCase):
+    def build(self):
+        np.random.seed(0)
+        with contextlib.redirect_stdout(io.StringIO()): # Silence debug prints
+            building = Building(simple_floor_populations, simple_dest_floors_by_state_name, "stay_where_stopped", simple_elevator_starting_floors, simple_elevator_capacities,
+                                simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
+        return building, Analytics()
+
+    def finish(self, building, analytics, engine):
+        with contextlib.redirect_stdout(io.StringIO()):
+            Engine.run_simulation(building, analytics, num_days=2, engine=engine, progress=False)
+            analytics.compute_daily_step_averages(building)
+            analytics.compute_hourly_step_averages(building)
+        return analytics.get_defining_averages(building), building.trip_records.get_tuples()
+
+    """
+    A simulation stopped part way through a day, checkpointed, and restored finishes exactly like one that was never stopped.
+    """
+    def test_restore_matches_uninterrupted(self):
+        stop_step = int(constants.steps_per_day) + 12 * int(constants.steps_per_hour) + 7 # Noon on the second day
+        for engine in ["tick", "event"]:
+            building, analytics = self.build()
+            expected = self.finish(building, analytics, engine)
+
+            building, analytics = self.build()
+            with contextlib.redirect_stdout(io.StringIO()):
+                Engine.run_simulation(building, analytics, num_days=2, engine=engine, progress=False, stop_step=stop_step)
+            self.assertEqual(building.cur_step, stop_step)
+            data = Checkpoint.save_checkpoint(building, analytics)
+
+            # Forks are independent of each other and of the original
+            for fork in range(2):
+                restored_building, restored_analytics = Checkpoint.restore_checkpoint(data)
+                self.assertEqual(restored_building.cur_step, stop_step)
+                self.assertEqual(self.finish(restored_building, restored_analytics, engine), expected)
+
+    """
+    A restored checkpoint can continue with a different scheduling algorithm.
+    """
+    def test_restore_elevator_algorithm(self):
+        building, analytics = self.build()
+        data = Checkpoint.save_checkpoint(building, analytics)
+
+        restored_building, restored_analytics = Checkpoint.restore_checkpoint(data, elevator_algorithm="return_to")
+        self.assertEqual(restored_building.elevator_algorithm.algorithm, "return_to")
+        self.assertEqual(restored_building.population, building.population)
+        people = Checkpoint.get_people(restored_building)
+        self.assertEqual(list(range(building.population)), [person.id for person in people])
+        for person in people:
+            self.assertIn(person, restored_building.floors[person.home_floor].people_on_floor)
+
+    """
+    A restored checkpoint continues every random stream where it left off, including the dispatch stream no built-in policy draws from.
+    """
+    def test_restore_random_streams(self):
+        building, analytics = self.build()
+        building.random_streams.dispatch.random(3)
+        data = Checkpoint.save_checkpoint(building, analytics)
+        restored_building, restored_analytics = Checkpoint.restore_checkpoint(data)
+        self.assertEqual(building.random_streams.dispatch.random(5).tolist(), restored_building.random_streams.dispatch.random(5).tolist())
+        self.assertEqual(building.random_streams.population.random(5).tolist(), restored_building.random_streams.population.random(5).tolist())
+
+    def test_pack_lists(self):
+        lists = [[1, 2], [], [3]]
+        lengths, members = Checkpoint.pack_lists(lists)
+        self.assertEqual(lengths.tolist(), [2, 0, 1])
+        self.assertEqual(members.tolist(), [1, 2, 3])
+        self.assertEqual(Checkpoint.unpack_lists(lengths, members), lists)
+
+if __name__ == '__main__':
+    unittest.main()
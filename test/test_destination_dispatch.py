@@ -0,0 +1,122 @@
+import unittest
+
+from src_imports import Analytics
+from src_imports import Building
+from src_imports import Checkpoint
+from src_imports import Config
+from src_imports import ElevatorStates
+from src_imports import Engine
+from src_imports import Simulation
+from src_imports import enable_destination_dispatch
+
+
+simple_floor_populations = [0, 2, 2, 2, 2, 2, 2, 2, 2, 2]
+simple_dest_floors_by_state_name = {
+    "freetime": list(range(10)),
+    "class": [0],
+    "sleep": [],
+    "meal": [0],
+    "exercise": [0],
+    "shop": [0],
+    "chores": [],
+    "study": [0],
+}
+
+class TestDestinationDispatch(unittest.TestCase):
+    """
+    Builds a ten Floor Building with two Elevators of capacity 2 on the ground floor, with destination dispatch enabled.
+    """
+    def get_building(self):
+        building = Building(simple_floor_populations, simple_dest_floors_by_state_name, "stay_where_stopped", [0, 0], [2, 2], [2, 2], [0, 0], seed=0)
+        enable_destination_dispatch(building)
+        return building
+
+    """
+    Moves residents to the ground floor and has them start waiting to go to dest_floors, in order.
+
+    Returns:
+    List of the Persons
+    """
+    def start_rush(self, building, dest_floors):
+        people = []
+        for dest_floor in dest_floors:
+            person = building.floors[dest_floor].people_on_floor[0]
+            building.floors[dest_floor].remove_person(person)
+            person.cur_floor = 0
+            person.dest_floor = dest_floor
+            building.floors[0].add_person(person)
+            Simulation.state_change_going_up(building, 0, person)
+            people.append(person)
+        return people
+
+    """
+    Assert requests register instead of pressing buttons, and Persons going to the same Floor share an Elevator.
+    """
+    def test_assign_requests(self):
+        building = self.get_building()
+        people = self.start_rush(building, [5, 8, 5, 8])
+        self.assertEqual([], building.floors_new_up_button)
+        self.assertEqual(people, building.destination_dispatch.new_requests)
+
+        Simulation.handle_new_button_presses(building)
+        self.assertEqual([], building.destination_dispatch.new_requests)
+        self.assertEqual(people[0].elevator_id, people[2].elevator_id)
+        self.assertEqual(people[1].elevator_id, people[3].elevator_id)
+        self.assertNotEqual(people[0].elevator_id, people[1].elevator_id)
+        self.assertEqual([2, 2], building.destination_dispatch.num_waiting.tolist())
+        elevator = building.elevators[people[0].elevator_id]
+
+        # Each Elevator only boards its own Persons, and only stops at their destination
+        for i in range(4):
+            Simulation.update_elevators(building)
+            building.cur_step += 1
+        self.assertEqual([people[0], people[2]], elevator.manifest.get_passengers(5))
+        self.assertEqual([5], list(elevator.up_stops))
+        self.assertEqual([0, 0], building.destination_dispatch.num_waiting.tolist())
+        self.assertEqual(0, len(building.floors[0].people_going_up))
+        self.assertEqual([-1] * 4, [person.elevator_id for person in people])
+
+    """
+    Assert Persons assigned to a full Elevator stay in line with their original wait start step, and register their request again.
+    """
+    def test_left_behind(self):
+        building = self.get_building()
+        people = self.start_rush(building, [5, 5, 8])
+        dd = building.destination_dispatch
+        states = ElevatorStates(building.elevators, len(building.floors))
+        for person in people:
+            dd.assign_request(states, person, 0)
+        dd.new_requests = []
+        elevator = building.elevators[0]
+
+        Simulation.handle_onboard_up(building, elevator)
+        self.assertEqual([people[0], people[1]], elevator.manifest.get_passengers(5))
+        self.assertEqual([people[2]], list(building.floors[0].people_going_up))
+        self.assertEqual(0, people[2].wait_start_step)
+        self.assertEqual([people[2]], dd.new_requests)
+        self.assertEqual(-1, people[2].elevator_id)
+        self.assertEqual([0, 0], dd.num_waiting.tolist())
+        self.assertEqual(0, dd.num_waiting_by_dest.sum())
+        self.assertEqual(1, elevator.num_left_behind)
+
+        # The request goes to the Elevator with room
+        Simulation.handle_new_button_presses(building)
+        self.assertEqual(1, people[2].elevator_id)
+
+    """
+    Assert a week runs with destination dispatch, and a checkpoint taken part way through continues exactly like the original.
+    """
+    def test_simulation(self):
+        config = dict(Config.HERE_config, floor_populations=simple_floor_populations, dest_floors_by_state_name=simple_dest_floors_by_state_name,
+                      elevator_starting_floors=[0, 0], elevator_capacities=[10, 10], elevator_steps_per_loads=[2, 2], elevator_return_to_floors=[0, 0], destination_dispatch=True)
+        building = Config.build_building(config, seed=2)
+        analytics = Analytics()
+        Engine.run_simulation(building, analytics, num_days=1, engine="event", progress=False, stop_step=12345)
+        checkpoint = Checkpoint.save_checkpoint(building, analytics)
+        Engine.run_simulation(building, analytics, num_days=2, engine="event", progress=False)
+
+        restored, restored_analytics = Checkpoint.restore_checkpoint(checkpoint)
+        Engine.run_simulation(restored, restored_analytics, num_days=2, engine="event", progress=False)
+        self.assertIsNotNone(restored.destination_dispatch)
+        self.assertGreater(len(building.trip_records), 0)
+        self.assertEqual(building.trip_records.get_tuples(), restored.trip_records.get_tuples())
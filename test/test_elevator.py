@@ -9,7 +9,7 @@ class TestElevator(unittest.TestCase):
     def setUpClass(self):
         self.elevators = []
         for i in range(10):
-            self.elevators.append(Elevator(id=i, capacity=i, starting_floor=i, steps_per_load=i, return_to_floor=0))
+            self.elevators.append(Elevator(id=i, capacity=i, starting_floor=i, steps_per_load=i, return_to_floor=0, num_floors=10))
         return
 
     """
@@ -24,18 +24,16 @@ class TestElevator(unittest.TestCase):
             self.assertEqual(i, self.elevators[i].steps_per_load)
 
     """
-    Asserts that people_by_destination, up_stops, down_stops, idle_counters, active_counters, loading_counters, and returning_counters use unique memory for each Elevator
+    Asserts that manifest, up_stops, down_stops, idle_counters, active_counters, loading_counters, and returning_counters use unique memory for each Elevator
     """
     def test_unique_memory(self):
         for i in range(len(self.elevators)):
-            # Check that people_by_destination is unique for each Elevator (adding a key in one won't add it to another)
-            self.elevators[i].people_by_destination[0] = 0
-            self.assertFalse("test" in self.elevators[i-1].people_by_destination.keys())
-            self.elevators[i].people_by_destination.pop(0) # Revert for next iteration
+            # Check that manifest is unique for each Elevator
+            self.assertIsNot(self.elevators[i].manifest, self.elevators[i-1].manifest)
 
             # Check that up_stops, down_stops, idle_counters, active_counters, loading_counters, and returning_counters are unique for each Elevator
-            self.elevators[i].up_stops.append(i)
-            self.elevators[i].down_stops.append(i)
+            self.elevators[i].up_stops.add(i)
+            self.elevators[i].down_stops.add(i)
             self.elevators[i].idle_counters[0] = 1
             self.elevators[i].active_counters[0] = 1
             self.elevators[i].loading_counters[0] = 1
@@ -49,8 +47,8 @@ class TestElevator(unittest.TestCase):
             self.assertNotEqual(self.elevators[i].returning_counters[0], self.elevators[i-1].returning_counters[0])
 
             # Revert for next iteration
-            self.elevators[i].up_stops.pop(0)
-            self.elevators[i].down_stops.pop(0)
+            self.elevators[i].up_stops.remove(i)
+            self.elevators[i].down_stops.remove(i)
             self.elevators[i].idle_counters[0] -= 1
             self.elevators[i].active_counters[0] -= 1
             self.elevators[i].loading_counters[0] -= 1
@@ -1,6 +1,9 @@
 import unittest
 
+from src_imports import Analytics
 from src_imports import Building
+from src_imports import ElevatorAlgorithm, ReturnTo, StayWhereStopped, elevator_algorithms, get_elevator_algorithm, has_stop, register_elevator_algorithm
+from src_imports import Engine
 
 
 simple_floor_populations = [1, 1, 1] # Two floor building with one resident on each floor
@@ -36,9 +39,9 @@ class TestElevatorAlgorithm(unittest.TestCase):
         building.elevator_algorithm.assign_stop(building.elevators, 1, "down")
         
         self.assertEqual(1, len(building.elevators[0].up_stops))
-        self.assertEqual(0, building.elevators[0].up_stops[0])
+        self.assertEqual(0, building.elevators[0].up_stops.get_next_at_or_above(0))
         self.assertEqual(1, len(building.elevators[1].down_stops))
-        self.assertEqual(1, building.elevators[1].down_stops[0])
+        self.assertEqual(1, building.elevators[1].down_stops.get_next_at_or_above(0))
 
         # Test that closest active Elevator moving towards gets assigned the stop (if Elevator on requested floor is moving, it won't get assigned because the request was "too late")
         building = Building(simple_floor_populations, simple_dest_floors_by_state_name, simple_elevator_algorithm, simple_elevator_starting_floors, simple_elevator_capacities, simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
@@ -51,7 +54,7 @@ class TestElevatorAlgorithm(unittest.TestCase):
         building.elevators[1].is_moving_up = True
         building.elevator_algorithm.assign_stop(building.elevators, 1, "up")
         self.assertEqual(1, len(building.elevators[0].up_stops))
-        self.assertEqual(1, building.elevators[0].up_stops[0])
+        self.assertEqual(1, building.elevators[0].up_stops.get_next_at_or_above(0))
 
         return
     
@@ -59,4 +62,55 @@ class TestElevatorAlgorithm(unittest.TestCase):
     Assert the "return_to_ground" scheduling algorithm behaves as expected.
     """
     def test_assign_stop_RTG(self):
-        return
\ No newline at end of file
+        return
+
+    """
+    Assert Buildings resolve their algorithm by name from the registry, and unknown names are rejected.
+    """
+    def test_get_elevator_algorithm(self):
+        self.assertIsInstance(get_elevator_algorithm("stay_where_stopped"), StayWhereStopped)
+        self.assertIsInstance(get_elevator_algorithm("return_to"), ReturnTo)
+        self.assertEqual("return_to", get_elevator_algorithm("return_to").algorithm)
+        with self.assertRaises(ValueError):
+            Building(simple_floor_populations, simple_dest_floors_by_state_name, "no_such_algorithm", simple_elevator_starting_floors, simple_elevator_capacities, simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
+
+    """
+    Assert a registered third-party algorithm gets its hooks called by the simulation.
+    """
+    def test_register_elevator_algorithm(self):
+        class CountingAlgorithm(ElevatorAlgorithm):
+            num_updates = 0
+            num_route_ends = 0
+
+            def update(self, building):
+                self.num_updates += 1
+
+            def end_route(self, building, elevator):
+                self.num_route_ends += 1
+                elevator.set_state_idle()
+
+        register_elevator_algorithm("counting", CountingAlgorithm)
+        try:
+            building = Building(simple_floor_populations, simple_dest_floors_by_state_name, "counting", simple_elevator_starting_floors, simple_elevator_capacities, simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
+            Engine.run_simulation(building, Analytics(), num_days=1, engine="tick", progress=False)
+        finally:
+            del elevator_algorithms["counting"]
+
+        self.assertIsInstance(building.elevator_algorithm, CountingAlgorithm)
+        self.assertEqual(int(building.cur_step), building.elevator_algorithm.num_updates)
+        self.assertGreater(building.elevator_algorithm.num_route_ends, 0)
+        self.assertGreater(len(building.trip_records), 0)
+
+    """
+    Assert an idle Elevator sent to pick up Persons going down doesn't count as an up stop, although the Floor is in its up_stops (it is below the Floor).
+    """
+    def test_has_stop_deidled(self):
+        building = Building(simple_floor_populations, simple_dest_floors_by_state_name, simple_elevator_algorithm, [0, 0, 0], simple_elevator_capacities, simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
+        building.elevator_algorithm.assign_stop(building.elevators, 2, "down", building.stop_index)
+        self.assertEqual([2], list(building.elevators[0].up_stops))
+        for stop_index in [None, building.stop_index]:
+            self.assertFalse(has_stop(building.elevators, 2, "up", stop_index))
+
+        # An up call on the same Floor gets its own Elevator
+        building.elevator_algorithm.assign_stop(building.elevators, 2, "up", building.stop_index)
+        self.assertEqual([2], list(building.elevators[1].up_stops))
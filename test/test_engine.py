@@ -0,0 +1,106 @@
+import unittest
+import io, contextlib
+import numpy as np
+
+from src_imports import Analytics
+from src_imports import Building
+from src_imports import Engine
+from src_imports import constants
+
+simple_floor_populations = [0, 3, 3, 3, 3]
+simple_dest_floors_by_state_name = {
+    "freetime": [0, 1, 2, 3, 4], # Person can go anywhere during freetime
+    "class": [0], # Must go to ground floor for in person class
+    "sleep": [], # Sleep only happens at person's home floor
+    "meal": [0], # Must go to ground floor to eat out / pickup food
+    "exercise": [1], # Send to second floor
+    "shop": [0], # Must go to ground floor to go to store
+    "chores": [], # Chores only happen at person's home floor
+    "study": [0], # Send to ground floor
+}
+simple_elevator_starting_floors = [0, 0]
+simple_elevator_capacities = [10, 10]
+simple_elevator_steps_per_loads = [2, 2] # Num simulation steps an elevator must pass (doing nothing) each time it stops to onload or offload passengers
+simple_elevator_return_to_floors = [0, 2]
+
+class TestEngine(unittest.TestCase):
+    """
+    Runs one day of simulation with the given engine and algorithm from a fixed seed, and returns the resulting Building and Analytics.
+    """
+    def run_day(self, engine, elevator_algorithm):
+        np.random.seed(0)
+        with contextlib.redirect_stdout(io.StringIO()): # Silence debug prints
+            building = Building(simple_floor_populations, simple_dest_floors_by_state_name, elevator_algorithm, simple_elevator_starting_floors, simple_elevator_capacities, simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
+            analytics = Analytics()
+            Engine.run_simulation(building, analytics, num_days=1, engine=engine, progress=False)
+            analytics.compute_daily_step_averages(building)
+            analytics.compute_hourly_step_averages(building)
+        return building, analytics
+
+    """
+    Asserts that the event engine produces exactly the same results as the tick engine.
+    """
+    def test_event_engine_matches_tick_engine(self):
+        for elevator_algorithm in ["stay_where_stopped", "return_to"]:
+            tick_building, tick_analytics = self.run_day("tick", elevator_algorithm)
+            event_building, event_analytics = self.run_day("event", elevator_algorithm)
+
+            self.assertEqual(tick_analytics.daily_avg_person_waiting_steps, event_analytics.daily_avg_person_waiting_steps)
+            self.assertEqual(tick_analytics.daily_avg_person_riding_steps, event_analytics.daily_avg_person_riding_steps)
+            self.assertEqual(tick_analytics.hourly_avg_person_waiting_steps, event_analytics.hourly_avg_person_waiting_steps)
+            self.assertEqual(tick_analytics.hourly_avg_elevator_idle_steps, event_analytics.hourly_avg_elevator_idle_steps)
+            self.assertEqual(tick_analytics.hourly_avg_elevator_active_steps, event_analytics.hourly_avg_elevator_active_steps)
+            self.assertEqual(tick_analytics.hourly_avg_elevator_loading_steps, event_analytics.hourly_avg_elevator_loading_steps)
+            self.assertEqual(tick_analytics.hourly_avg_elevator_returning_steps, event_analytics.hourly_avg_elevator_returning_steps)
+            for i in range(len(tick_building.elevators)):
+                self.assertEqual(tick_building.elevators[i].cur_floor, event_building.elevators[i].cur_floor)
+
+    """
+    Asserts that get_skippable_steps never skips past a scheduled state change or an hour change.
+    """
+    def test_get_skippable_steps(self):
+        building, analytics = self.run_day("tick", "stay_where_stopped")
+        # All Elevators idle and nobody waiting, so only the next event or hour change limits the jump
+        for elevator in building.elevators:
+            elevator.set_state_idle()
+            for floor_id in list(elevator.up_stops):
+                elevator.up_stops.remove(floor_id)
+            for floor_id in list(elevator.down_stops):
+                elevator.down_stops.remove(floor_id)
+        self.assertEqual(99, Engine.get_skippable_steps(building, 0, 100, [50, 200, 300]))
+        self.assertEqual(927, Engine.get_skippable_steps(building, 0, 100, []))
+
+        # An Elevator moving up towards a stop 3 Floors away can only be skipped until it reaches that Floor
+        building.elevators[0].set_state_active(is_moving_up=True)
+        building.elevators[0].cur_floor = 1
+        building.elevators[0].up_stops.add(4)
+        self.assertEqual(3, Engine.get_skippable_steps(building, 0, 100, []))
+        return
+
+    """
+    Asserts that run_simulation rejects unknown engine names.
+    """
+    def test_run_simulation_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            Engine.run_simulation(None, None, num_days=1, engine="unknown", progress=False)
+
+    """
+    Asserts that Schedules repeat every week in runs longer than 7 days, without changing the weekly state change data.
+    """
+    def test_multi_week_run(self):
+        steps_per_week = 7 * int(constants.steps_per_day)
+        np.random.seed(0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            building = Building(simple_floor_populations, simple_dest_floors_by_state_name, "stay_where_stopped", simple_elevator_starting_floors, simple_elevator_capacities,
+                                simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
+            steps = building.state_changes.steps.copy()
+            Engine.run_simulation(building, Analytics(), num_days=14, engine="event", progress=False)
+
+        num_first_week_trips = len([record for record in building.trip_records.get_tuples() if record[5] < steps_per_week])
+        num_second_week_trips = len(building.trip_records) - num_first_week_trips
+        self.assertNotEqual(num_first_week_trips, 0)
+        self.assertGreater(num_second_week_trips, num_first_week_trips // 2)
+        self.assertTrue(np.array_equal(steps, building.state_changes.steps))
+
+        # Every state change of the second week was handled (or skipped)
+        self.assertTrue(np.array_equal(building.state_changes.cursors, building.state_changes.day_starts[:, 1:]))
@@ -0,0 +1,107 @@
+import unittest
+
+import numpy as np
+
+from src_imports import Analytics
+from src_imports import Building
+from src_imports import Elevator
+from src_imports import BatchETAAlgorithm, ElevatorStates, ETAAlgorithm, get_elevator_algorithm
+from src_imports import Engine
+from src_imports import StopIndex
+
+
+simple_floor_populations = [0, 5, 5, 5, 5]
+simple_dest_floors_by_state_name = {
+    "freetime": [0, 1, 2, 3, 4],
+    "class": [0],
+    "sleep": [],
+    "meal": [0],
+    "exercise": [0],
+    "shop": [0],
+    "chores": [],
+    "study": [0],
+}
+
+class TestETAAlgorithm(unittest.TestCase):
+    """
+    Builds three Elevators in a ten Floor Building: idle on Floor 0, moving up from Floor 2 with up stops on Floors 4 and 6, and moving down from Floor 9.
+    """
+    def get_elevators(self):
+        stop_index = StopIndex(10)
+        elevators = [Elevator(i, 10, starting_floor, 2, 0, 10, stop_index) for i, starting_floor in enumerate([0, 2, 9])]
+        elevators[1].set_state_active(is_moving_up=True)
+        elevators[1].up_stops.add(4)
+        elevators[1].up_stops.add(6)
+        elevators[2].set_state_active(is_moving_up=False)
+        elevators[2].down_stops.add(1)
+        return elevators, stop_index
+
+    """
+    Assert pickup times count travel, and a stop of steps_per_load + 1 steps for every stop on the way.
+    """
+    def test_get_eta_steps(self):
+        elevators, stop_index = self.get_elevators()
+        states = ElevatorStates(elevators, 10)
+        eta_steps = states.get_eta_steps([8, 5, 3], [True, False, False])
+
+        # Up call on Floor 8: the down Elevator can't take it
+        self.assertEqual([8, 6 + 2 * 3, np.inf], list(eta_steps[0]))
+        # Down calls below the down Elevator: the up Elevator can't take them
+        self.assertEqual([5, np.inf, 4], list(eta_steps[1]))
+        self.assertEqual([3, np.inf, 6], list(eta_steps[2]))
+
+    """
+    Assert calls go to the Elevator with the lowest cost, and calls no Elevator can take stay unassigned.
+    """
+    def test_assign_stop(self):
+        elevators, stop_index = self.get_elevators()
+        eta = get_elevator_algorithm("eta", 10)
+        self.assertIsInstance(eta, ETAAlgorithm)
+        self.assertEqual(10, eta.num_floors)
+
+        # The up Elevator reaches Floor 5 in 3 + 3 steps, sooner than the idle one plus its reserve cost
+        self.assertTrue(eta.assign_stop(elevators, 5, "up", stop_index))
+        self.assertEqual([4, 5, 6], list(elevators[1].up_stops))
+        self.assertTrue(elevators[0].is_idle)
+
+        # Only the idle Elevator can take an up call below the up Elevator
+        self.assertTrue(eta.assign_stop(elevators, 1, "up", stop_index))
+        self.assertEqual([1], list(elevators[0].up_stops))
+        self.assertEqual(1, elevators[0].deidled_floor)
+
+        # No Elevator is idle or moving up from below Floor 0
+        self.assertFalse(eta.assign_stop(elevators, 0, "up", stop_index))
+
+        # Already scheduled stops are assigned
+        self.assertTrue(eta.assign_stop(elevators, 6, "up", stop_index))
+        self.assertEqual([4, 5, 6], list(elevators[1].up_stops))
+
+    """
+    Assert a simulation runs with the "eta" algorithm, and both Engines give the same trips.
+    """
+    def test_simulation(self):
+        trip_records = []
+        for engine in ["tick", "event"]:
+            building = Building(simple_floor_populations, simple_dest_floors_by_state_name, "eta", [0, 0], [10, 10], [2, 2], [0, 0], seed=1)
+            Engine.run_simulation(building, Analytics(), num_days=1, engine=engine, progress=False)
+            trip_records.append(building.trip_records.get_tuples())
+
+        self.assertGreater(len(trip_records[0]), 0)
+        self.assertEqual(trip_records[0], trip_records[1])
+
+    """
+    Assert the batch algorithm assigns a step's calls together: two up calls, where the Elevator nearest the first call is much nearer the second.
+    One at a time in list order, the first call takes it.
+    """
+    def test_batch_assign_hall_calls(self):
+        stop_lists = {}
+        for algorithm in ["eta", "batch_eta"]:
+            building = Building([0] + [1] * 12, dict(simple_dest_floors_by_state_name, freetime=list(range(13))), algorithm, [4, 1, 12], [10, 10, 10], [2, 2, 2], [0, 0, 0], seed=0)
+            building.floors_new_up_button[:] = [9, 11]
+            building.elevator_algorithm.assign_hall_calls(building)
+            self.assertEqual([], building.floors_new_up_button)
+            stop_lists[algorithm] = [(list(elevator.up_stops), list(elevator.down_stops)) for elevator in building.elevators]
+
+        self.assertIsInstance(building.elevator_algorithm, BatchETAAlgorithm)
+        self.assertEqual([([11], []), ([], []), ([], [9])], stop_lists["eta"])
+        self.assertEqual([([9], []), ([], []), ([], [11])], stop_lists["batch_eta"])
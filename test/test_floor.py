@@ -3,6 +3,7 @@ import numpy as np
 from tqdm import tqdm
 
 from src_imports import Floor
+from src_imports import generate_residents
 
 test_dest_floors_by_state_name = {
     "freetime": [],
@@ -55,7 +56,7 @@ class TestSchedule(unittest.TestCase):
             self.assertNotEqual(len(self.floors[i].people_going_up), len(self.floors[i-1].people_going_up))
             # Revert to original state for next iteration
             self.floors[i].people_on_floor.append(person)
-            self.floors[i].people_going_up.pop(0)
+            self.floors[i].people_going_up.popleft()
 
             # Ensure updating people_going_down on one floor didn't update it for other floors
             person = self.floors[i].people_on_floor[0]
@@ -65,4 +66,64 @@ class TestSchedule(unittest.TestCase):
             self.assertNotEqual(len(self.floors[i].people_going_down), len(self.floors[i-1].people_going_down))
             # Revert to original state for next iteration
             self.floors[i].people_on_floor.append(person)
-            self.floors[i].people_going_down.pop(0)
+            self.floors[i].people_going_down.popleft()
+
+    """
+    Asserts residents of a Floor share one table of destination floor choices that includes their home floor, and that different Floors don't share tables
+    """
+    def test_shared_dest_floor_choices(self):
+        for i in range(len(self.floors)):
+            table = self.floors[i].people_on_floor[0].dest_floor_choices
+            for person in self.floors[i].people_on_floor:
+                self.assertIs(table, person.dest_floor_choices)
+                self.assertFalse(hasattr(person, "__dict__")) # Persons only store their __slots__
+            self.assertEqual((i,), table[2]) # Sleep
+            self.assertEqual((), table[0]) # Freetime, no choices in test_dest_floors_by_state_name
+            self.assertIsNot(table, self.floors[i-1].people_on_floor[0].dest_floor_choices)
+        self.assertEqual([], test_dest_floors_by_state_name["sleep"]) # The Building's table is untouched
+
+    """
+    Asserts that bulk generated residents get unique consecutive ids in Floor order, share one StateChanges, and share one destination table per Floor
+    """
+    def test_generate_residents(self):
+        floor_populations = [0, 12, 3, 11]
+        people_by_floor = generate_residents(floor_populations, test_dest_floors_by_state_name, np.random.default_rng(0))
+        self.assertEqual(floor_populations, [len(people) for people in people_by_floor])
+
+        people = [person for people in people_by_floor for person in people]
+        self.assertEqual(list(range(26)), [person.id for person in people])
+        for floor_id in range(len(floor_populations)):
+            for person in people_by_floor[floor_id]:
+                self.assertEqual(floor_id, person.home_floor)
+                self.assertEqual(floor_id, person.cur_floor)
+                self.assertIs(people_by_floor[floor_id][0].dest_floor_choices, person.dest_floor_choices)
+        for i in range(len(people)):
+            self.assertIs(people[0].state_changes, people[i].state_changes)
+            self.assertEqual(i, people[i].state_change_row)
+
+        # Floors number their own residents from first_person_id
+        floor = Floor(id=1, num_residents=3, building_dest_floors_by_state_name=test_dest_floors_by_state_name, first_person_id=12)
+        self.assertEqual([12, 13, 14], [person.id for person in floor.people_on_floor])
+
+    """
+    Asserts remove_person swaps the last Person on the Floor into the removed Person's place and keeps every floor_idx up to date
+    """
+    def test_add_remove_person(self):
+        floor = Floor(id=3, num_residents=4, building_dest_floors_by_state_name=test_dest_floors_by_state_name)
+        first, second, last = floor.people_on_floor[0], floor.people_on_floor[1], floor.people_on_floor[-1]
+        floor.remove_person(first)
+        self.assertEqual(3, len(floor.people_on_floor))
+        self.assertIs(last, floor.people_on_floor[0])
+        self.assertEqual(-1, first.floor_idx)
+        for i in range(len(floor.people_on_floor)):
+            self.assertEqual(i, floor.people_on_floor[i].floor_idx)
+
+        floor.add_person(first)
+        self.assertIs(first, floor.people_on_floor[3])
+        self.assertEqual(3, first.floor_idx)
+
+        # Still works after people_on_floor was changed directly
+        floor.people_on_floor.remove(last)
+        floor.remove_person(second)
+        self.assertNotIn(second, floor.people_on_floor)
+        self.assertEqual(2, len(floor.people_on_floor))
@@ -0,0 +1,90 @@
+import unittest
+import io, contextlib
+import numpy as np
+
+from src_imports import Analytics
+from src_imports import Building
+from src_imports import Engine
+from src_imports import Instrumentation
+from src_imports import enable_destination_dispatch
+from src_imports import constants
+
+simple_floor_populations = [0, 3, 3, 3, 3]
+simple_dest_floors_by_state_name = {
+    "freetime": [0, 1, 2, 3, 4], # Person can go anywhere during freetime
+    "class": [0], # Must go to ground floor for in person class
+    "sleep": [], # Sleep only happens at person's home floor
+    "meal": [0], # Must go to ground floor to eat out / pickup food
+    "exercise": [1], # Send to second floor
+    "shop": [0], # Must go to ground floor to go to store
+    "chores": [], # Chores only happen at person's home floor
+    "study": [0], # Send to ground floor
+}
+simple_elevator_starting_floors = [0, 0]
+simple_elevator_capacities = [10, 10]
+simple_elevator_steps_per_loads = [2, 2] # Num simulation steps an elevator must pass (doing nothing) each time it stops to onload or offload passengers
+simple_elevator_return_to_floors = [0, 2]
+
+class TestInstrumentation(unittest.TestCase):
+    def run_day(self, engine, instrumented, destination_dispatch=False):
+        np.random.seed(0)
+        with contextlib.redirect_stdout(io.StringIO()): # Silence debug prints
+            building = Building(simple_floor_populations, simple_dest_floors_by_state_name, "stay_where_stopped", simple_elevator_starting_floors, simple_elevator_capacities, simple_elevator_steps_per_loads, simple_elevator_return_to_floors)
+            if destination_dispatch:
+                enable_destination_dispatch(building)
+            if instrumented:
+                Instrumentation.enable_instrumentation(building)
+            analytics = Analytics()
+            Engine.run_simulation(building, analytics, num_days=1, engine=engine, progress=False)
+        return building, analytics
+
+    """
+    Instrumentation only observes, the simulation results don't change.
+    """
+    def test_results_unchanged(self):
+        for engine in ["tick", "event"]:
+            building, analytics = self.run_day(engine, False)
+            instrumented_building, instrumented_analytics = self.run_day(engine, True)
+
+            self.assertIsNone(building.instrumentation)
+            self.assertEqual(building.trip_records.get_tuples(), instrumented_building.trip_records.get_tuples())
+            self.assertEqual(analytics.hourly_avg_person_waiting_steps, instrumented_analytics.hourly_avg_person_waiting_steps)
+
+    def test_phase_calls(self):
+        building, analytics = self.run_day("tick", True)
+        report = building.instrumentation.get_report()
+        for name in ["evaluate_simulation", "handle_state_changes_scheduled", "handle_new_button_presses", "update_elevators", "increment_counters"]:
+            self.assertEqual(report["phases"][name]["calls"], int(constants.steps_per_day))
+        self.assertGreater(report["phases"]["assign_stop"]["calls"], 0)
+        self.assertEqual(report["phases"]["skip_steps"]["calls"], 0) # Only the event engine skips steps
+
+        building, analytics = self.run_day("event", True)
+        report = building.instrumentation.get_report()
+        self.assertLess(report["phases"]["update_elevators"]["calls"], int(constants.steps_per_day))
+        self.assertGreater(report["phases"]["skip_steps"]["calls"], 0)
+
+    def test_event_counts(self):
+        for engine in ["tick", "event"]:
+            building, analytics = self.run_day(engine, True)
+            events = building.instrumentation.event_counts
+            riding = sum(elevator.manifest.load for elevator in building.elevators)
+
+            self.assertEqual(events["alightings"], len(building.trip_records))
+            self.assertEqual(events["boardings"], events["alightings"] + riding)
+            self.assertGreater(events["hall_calls"], 0)
+            self.assertGreaterEqual(events["stops"], events["hall_calls"])
+            self.assertEqual(0, events["destination_requests"])
+
+    """
+    Under destination dispatch there are no buttons, every Person who starts waiting registers a request instead.
+    """
+    def test_destination_request_counts(self):
+        building, analytics = self.run_day("event", True, destination_dispatch=True)
+        events = building.instrumentation.event_counts
+        waiting = sum(len(floor.people_going_up) + len(floor.people_going_down) for floor in building.floors)
+        self.assertEqual(0, events["hall_calls"])
+        self.assertGreater(events["destination_requests"], 0)
+        self.assertEqual(events["destination_requests"], events["boardings"] + waiting)
+
+if __name__ == '__main__':
+    unittest.main()
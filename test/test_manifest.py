@@ -0,0 +1,59 @@
+import unittest
+
+from src_imports import Manifest
+from src_imports import Person
+
+test_dest_floors_by_state_name = {
+    "freetime": [],
+    "class": [],
+    "sleep": [],
+    "meal": [],
+    "exercise": [],
+    "shop": [],
+    "chores": [],
+    "study": [],
+}
+
+class TestManifest(unittest.TestCase):
+    """
+    Generate 5 Persons before each test.
+    """
+    def setUp(self):
+        self.people = [Person(id=i, home_floor=0, prob_having_visitors=0.0, avg_num_visitors=0, building_dest_floors_by_state_name=test_dest_floors_by_state_name) for i in range(5)]
+
+    """
+    Asserts passengers are grouped by destination Floor in boarding order, and load counts all of them
+    """
+    def test_add(self):
+        manifest = Manifest(num_floors=4, capacity=2)
+        for person, dest_floor in zip(self.people, [3, 1, 3, 3, 2]):
+            person.dest_floor = dest_floor
+            manifest.add(person) # The third Person getting off at Floor 3 goes past the capacity of 2
+        self.assertEqual(5, manifest.load)
+        self.assertEqual([0, 1, 1, 3], manifest.counts.tolist())
+        self.assertEqual([self.people[0], self.people[2], self.people[3]], manifest.get_passengers(3))
+        self.assertEqual([], manifest.get_passengers(0))
+        self.assertEqual([self.people[1], self.people[4], self.people[0], self.people[2], self.people[3]], manifest.get_all_passengers())
+
+    """
+    Asserts remove_passengers empties one Floor and leaves the others
+    """
+    def test_remove_passengers(self):
+        manifest = Manifest(num_floors=3, capacity=4)
+        for person, dest_floor in zip(self.people, [1, 2, 1, 2, 1]):
+            person.dest_floor = dest_floor
+            manifest.add(person)
+        self.assertEqual([self.people[0], self.people[2], self.people[4]], manifest.remove_passengers(1))
+        self.assertEqual(2, manifest.load)
+        self.assertEqual([], manifest.remove_passengers(1))
+        self.assertEqual([self.people[1], self.people[3]], manifest.get_all_passengers())
+
+    """
+    Asserts a Manifest can't be built without Floors
+    """
+    def test_no_floors(self):
+        with self.assertRaises(ValueError):
+            Manifest(num_floors=0, capacity=2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ import unittest
 import numpy as np
 from tqdm import tqdm
 from src_imports import Person
+from src_imports import Schedule
 
 test_dest_floors_by_state_name = {
     "freetime": [],
@@ -27,8 +28,8 @@ class TestSchedule(unittest.TestCase):
         self.people = []
         for i in (range(10)):
             person = Person(id=i, home_floor=i, prob_having_visitors=0, avg_num_visitors=0, building_dest_floors_by_state_name=test_dest_floors_by_state_name)
-            person.waiting_counters[:,] = i
-            person.riding_counters[:,] = i
+            person.wait_start_step = i
+            person.board_step = i
         return
 
     """
@@ -70,14 +71,14 @@ class TestSchedule(unittest.TestCase):
         person.generate_state_change_data()
 
         # Ensure the first day has one generated state_change_steps and state_change_ids
-        self.assertEqual(1, len(person.state_change_steps[0]))
-        self.assertEqual(1, len(person.state_change_ids[0]))
+        self.assertEqual(1, len(person.get_state_change_steps(0)))
+        self.assertEqual(1, len(person.get_state_change_ids(0)))
         # Ensure the state_change_ids are correct, i.e. the state changes from 1 to 0
-        self.assertEqual(1, person.state_change_ids[0][0][0])
-        self.assertEqual(0, person.state_change_ids[0][0][1])
+        self.assertEqual(1, person.get_state_change_ids(0)[0][0])
+        self.assertEqual(0, person.get_state_change_ids(0)[0][1])
         # Ensure the second day has zero generated state_change_steps and state_change_ids
-        self.assertEqual(0, len(person.state_change_steps[1]))
-        self.assertEqual(0, len(person.state_change_ids[1]))
+        self.assertEqual(0, len(person.get_state_change_steps(1)))
+        self.assertEqual(0, len(person.get_state_change_ids(1)))
 
 
         # Test a normally generated Schedule case
@@ -91,8 +92,8 @@ class TestSchedule(unittest.TestCase):
                     cur_state = person.schedule[day, chunk]
                     num_state_changes += 1
 
-            self.assertEqual(num_state_changes, len(person.state_change_steps[day]))
-            self.assertEqual(num_state_changes, len(person.state_change_ids[day]))
+            self.assertEqual(num_state_changes, len(person.get_state_change_steps(day)))
+            self.assertEqual(num_state_changes, len(person.get_state_change_ids(day)))
 
         # Now we know the number of generated state changes is correct, let's ensure the content is accurate too
         cur_state = person.schedule[0,0]
@@ -100,8 +101,8 @@ class TestSchedule(unittest.TestCase):
             num_state_changes = 0
             for chunk in range(person.schedule.shape[1]):
                 if person.schedule[day, chunk] != cur_state:
-                    self.assertEqual(cur_state, person.state_change_ids[day][num_state_changes][0])
-                    self.assertEqual(person.schedule[day, chunk], person.state_change_ids[day][num_state_changes][1])
+                    self.assertEqual(cur_state, person.get_state_change_ids(day)[num_state_changes][0])
+                    self.assertEqual(person.schedule[day, chunk], person.get_state_change_ids(day)[num_state_changes][1])
 
                     cur_state = person.schedule[day, chunk]
                     num_state_changes += 1
@@ -109,15 +110,15 @@ class TestSchedule(unittest.TestCase):
         return
     
     """
-    Assert that generate_dest_floors_by_state_name performs as expected.
+    Assert that generate_dest_floor_choices performs as expected.
     """
-    def test_generate_dest_floors_by_state_name(self):
+    def test_generate_dest_floor_choices(self):
         for i in range(len(self.people)):
             # Tests that a Person's home floor is one of the destinations for various states
-            self.assertEqual(self.people[i].home_floor, self.people[i].dest_floors_by_state_name["class"])
-            self.assertEqual(self.people[i].home_floor, self.people[i].dest_floors_by_state_name["sleep"])
-            self.assertEqual(self.people[i].home_floor, self.people[i].dest_floors_by_state_name["meal"])
-            self.assertEqual(self.people[i].home_floor, self.people[i].dest_floors_by_state_name["exercise"])
-            self.assertEqual(self.people[i].home_floor, self.people[i].dest_floors_by_state_name["chores"])
-            self.assertEqual(self.people[i].home_floor, self.people[i].dest_floors_by_state_name["study"])
+            self.assertEqual((self.people[i].home_floor,), self.people[i].dest_floor_choices[Schedule.state_id_by_name["class"]])
+            self.assertEqual((self.people[i].home_floor,), self.people[i].dest_floor_choices[Schedule.state_id_by_name["sleep"]])
+            self.assertEqual((self.people[i].home_floor,), self.people[i].dest_floor_choices[Schedule.state_id_by_name["meal"]])
+            self.assertEqual((self.people[i].home_floor,), self.people[i].dest_floor_choices[Schedule.state_id_by_name["exercise"]])
+            self.assertEqual((self.people[i].home_floor,), self.people[i].dest_floor_choices[Schedule.state_id_by_name["chores"]])
+            self.assertEqual((self.people[i].home_floor,), self.people[i].dest_floor_choices[Schedule.state_id_by_name["study"]])
         return
\ No newline at end of file
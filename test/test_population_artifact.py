@@ -0,0 +1,67 @@
+import unittest
+import io, contextlib, os, tempfile
+
+from src_imports import Analytics
+from src_imports import Config
+from src_imports import Engine
+from src_imports import PopulationArtifact
+
+simple_config = {
+    "floor_populations": [0, 3, 3, 3, 3],
+    "dest_floors_by_state_name": {
+        "freetime": [0, 1, 2, 3, 4], # Person can go anywhere during freetime
+        "class": [0], # Must go to ground floor for in person class
+        "sleep": [], # Sleep only happens at person's home floor
+        "meal": [0], # Must go to ground floor to eat out / pickup food
+        "exercise": [1], # Send to second floor
+        "shop": [0], # Must go to ground floor to go to store
+        "chores": [], # Chores only happen at person's home floor
+        "study": [0], # Send to ground floor
+    },
+    "elevator_algorithm": "stay_where_stopped",
+    "elevator_starting_floors": [0, 0],
+    "elevator_capacities": [10, 10],
+    "elevator_steps_per_loads": [2, 2],
+    "elevator_return_to_floors": [0, 2],
+    "engine": "event",
+    "num_days": 1,
+}
+
+class TestPopulationArtifact(unittest.TestCase):
+    def simulate(self, config, seed):
+        with contextlib.redirect_stdout(io.StringIO()): # Silence debug prints
+            building = Config.build_building(config, seed)
+            Engine.run_simulation(building, Analytics(), num_days=config["num_days"], engine=config["engine"], progress=False)
+        return building.trip_records.get_tuples()
+
+    """
+    A Building loaded from an artifact simulates exactly like one generated from the same seed, the first time (artifact created) and after (artifact reused).
+    """
+    def test_loaded_matches_generated(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for use_batch_schedules in [False, True]:
+                config = dict(simple_config, use_batch_schedules=use_batch_schedules)
+                cached_config = dict(config, population_cache_dir=cache_dir)
+
+                expected = self.simulate(config, 7)
+                self.assertNotEqual(len(expected), 0)
+                self.assertEqual(self.simulate(cached_config, 7), expected)
+                self.assertEqual(self.simulate(cached_config, 7), expected)
+
+            # One artifact per seed and schedule generator, shared by every Elevator configuration
+            self.simulate(dict(simple_config, population_cache_dir=cache_dir, elevator_algorithm="return_to_floor"), 7)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_artifact_key(self):
+        key = PopulationArtifact.get_artifact_key(0, simple_config["floor_populations"], simple_config["dest_floors_by_state_name"], False)
+        self.assertEqual(key, PopulationArtifact.get_artifact_key(0, list(simple_config["floor_populations"]), dict(simple_config["dest_floors_by_state_name"]), False))
+        self.assertNotEqual(key, PopulationArtifact.get_artifact_key(1, simple_config["floor_populations"], simple_config["dest_floors_by_state_name"], False))
+        self.assertNotEqual(key, PopulationArtifact.get_artifact_key(0, [0, 3, 3, 3, 4], simple_config["dest_floors_by_state_name"], False))
+        self.assertNotEqual(key, PopulationArtifact.get_artifact_key(0, simple_config["floor_populations"], simple_config["dest_floors_by_state_name"], True))
+
+    def test_mismatched_floor_populations(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with contextlib.redirect_stdout(io.StringIO()):
+                path = PopulationArtifact.get_population_artifact(cache_dir, 0, simple_config["floor_populations"], simple_config["dest_floors_by_state_name"], False)
+            with self.assertRaises(ValueError):
+                PopulationArtifact.load_population_artifact(path, [0, 3, 3, 3, 4])
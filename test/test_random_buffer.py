@@ -0,0 +1,27 @@
+import unittest
+import numpy as np
+
+from src_imports import RandomBuffer
+
+class TestRandomBuffer(unittest.TestCase):
+    """
+    Asserts that choices are uniform, and that values are generated lazily in blocks of size
+    """
+    def test_choose(self):
+        np.random.seed(0)
+        buffer = RandomBuffer(size=100)
+        self.assertEqual([], buffer.values)
+
+        choices = (3, 5, 7, 9)
+        counts = {choice: 0 for choice in choices}
+        for i in range(4000):
+            counts[buffer.choose(choices)] += 1
+        self.assertEqual(100, len(buffer.values))
+        for choice in choices:
+            self.assertAlmostEqual(1000, counts[choice], delta=150)
+
+        self.assertEqual(4, buffer.choose((4,)))
+
+    def test_choose_empty(self):
+        with self.assertRaises(ValueError):
+            RandomBuffer().choose(())
@@ -0,0 +1,81 @@
+import contextlib
+import io
+import unittest
+import numpy as np
+
+from src_imports import Analytics
+from src_imports import Config
+from src_imports import Engine
+from src_imports import RandomStreams
+from src_imports import constants
+
+simple_config = {
+    "floor_populations": [0, 3, 3, 3, 3],
+    "dest_floors_by_state_name": {
+        "freetime": [0, 1, 2, 3, 4], # Person can go anywhere during freetime
+        "class": [0], # Must go to ground floor for in person class
+        "sleep": [], # Sleep only happens at person's home floor
+        "meal": [0], # Must go to ground floor to eat out / pickup food
+        "exercise": [1], # Send to second floor
+        "shop": [0], # Must go to ground floor to go to store
+        "chores": [], # Chores only happen at person's home floor
+        "study": [0], # Send to ground floor
+    },
+    "elevator_algorithm": "stay_where_stopped",
+    "elevator_starting_floors": [0, 0],
+    "elevator_capacities": [10, 10],
+    "elevator_steps_per_loads": [2, 2],
+    "elevator_return_to_floors": [0, 2],
+    "use_batch_schedules": True,
+}
+
+"""
+Returns:
+Building's trip_records after simulating num_days days of a Building built from seed
+"""
+def simulate(seed, num_days):
+    with contextlib.redirect_stdout(io.StringIO()):
+        building = Config.build_building(simple_config, seed)
+        Engine.run_simulation(building, Analytics(), num_days=num_days, engine="event", progress=False)
+    return building.trip_records.get_tuples()
+
+class TestRandomStreams(unittest.TestCase):
+    """
+    Asserts that streams only depend on the seed, and that the population, dispatch, and per-day behavior streams differ from each other
+    """
+    def test_streams(self):
+        streams = RandomStreams(3)
+        same_streams = RandomStreams(3)
+        np.random.seed(0)
+        self.assertEqual(streams.population.random(5).tolist(), same_streams.population.random(5).tolist())
+        self.assertEqual(streams.dispatch.random(5).tolist(), same_streams.dispatch.random(5).tolist())
+
+        # A day's Generator starts in the same state however many times (and in whatever order) days are requested
+        day_values = [streams.get_day_generator(day).random(5).tolist() for day in range(3)]
+        self.assertEqual(day_values[2], same_streams.get_day_generator(2).random(5).tolist())
+        self.assertEqual(day_values[0], streams.get_day_generator(0).random(5).tolist())
+        self.assertNotEqual(day_values[0], day_values[1])
+        self.assertNotEqual(RandomStreams(3).population.random(5).tolist(), RandomStreams(3).get_day_generator(0).random(5).tolist())
+        self.assertNotEqual(RandomStreams(3).population.random(5).tolist(), RandomStreams(3).dispatch.random(5).tolist())
+        self.assertNotEqual(RandomStreams(3).dispatch.random(5).tolist(), RandomStreams(3).get_day_generator(0).random(5).tolist())
+        self.assertNotEqual(RandomStreams(3).population.random(5).tolist(), RandomStreams(4).population.random(5).tolist())
+
+    def test_global_seed(self):
+        np.random.seed(0)
+        seed = RandomStreams().seed
+        np.random.seed(0)
+        self.assertEqual(seed, RandomStreams().seed)
+
+    """
+    Asserts that a seeded simulation is bit-reproducible, whatever NumPy's global random state is
+    """
+    def test_reproducible_simulation(self):
+        np.random.seed(0)
+        trip_records = simulate(5, 2)
+        np.random.seed(1)
+        self.assertEqual(trip_records, simulate(5, 2))
+        self.assertNotEqual(trip_records, simulate(6, 2))
+
+        # The first day doesn't depend on how many days are simulated
+        steps_per_day = int(constants.steps_per_day)
+        self.assertEqual(simulate(5, 1), [record for record in trip_records if record[5] < steps_per_day])
@@ -0,0 +1,98 @@
+import unittest
+import io, contextlib
+import math
+import numpy as np
+
+from src_imports import Analytics
+from src_imports import Building
+from src_imports import Engine
+from src_imports import RandomTraffic
+from src_imports import Simulation
+from src_imports import constants
+
+simple_floor_populations = [0, 3, 3, 3, 3]
+simple_dest_floors_by_state_name = {
+    "freetime": [0, 1, 2, 3, 4], # Person can go anywhere during freetime
+    "class": [0], # Must go to ground floor for in person class
+    "sleep": [], # Sleep only happens at person's home floor
+    "meal": [0], # Must go to ground floor to eat out / pickup food
+    "exercise": [1], # Send to second floor
+    "shop": [0], # Must go to ground floor to go to store
+    "chores": [], # Chores only happen at person's home floor
+    "study": [0], # Send to ground floor
+}
+
+# More random trips in the evening than at night
+hourly_trip_rates = [0.1] * 8 + [1.0] * 10 + [3.0] * 6
+
+class TestRandomTraffic(unittest.TestCase):
+    def build(self):
+        with contextlib.redirect_stdout(io.StringIO()): # Silence debug prints
+            building = Building(simple_floor_populations, simple_dest_floors_by_state_name, "stay_where_stopped", [0, 0], [10, 10], [2, 2], [0, 2], seed=3)
+        RandomTraffic.enable_random_traffic(building, hourly_trip_rates)
+        return building
+
+    """
+    Asserts that the event engine jumps to random trips and produces exactly the same trips as the tick engine
+    """
+    def test_event_engine_matches_tick_engine(self):
+        trip_records = {}
+        for engine in Engine.engine_names:
+            building = self.build()
+            with contextlib.redirect_stdout(io.StringIO()):
+                Engine.run_simulation(building, Analytics(), num_days=1, engine=engine, progress=False)
+            trip_records[engine] = building.trip_records.get_tuples()
+        self.assertEqual(trip_records["tick"], trip_records["event"])
+
+        # Random trips happen on top of the scheduled ones
+        without_traffic = self.build()
+        without_traffic.random_traffic = None
+        with contextlib.redirect_stdout(io.StringIO()):
+            Engine.run_simulation(without_traffic, Analytics(), num_days=1, engine="event", progress=False)
+        self.assertGreater(len(trip_records["event"]), len(without_traffic.trip_records))
+
+    """
+    Asserts that the geometric next trip step and the number of travelers have the means of per-resident coin flips
+    """
+    def test_draw_statistics(self):
+        rng = np.random.default_rng(0)
+        traffic = RandomTraffic.RandomTraffic([0.5] * 24)
+        probability = 0.5 / constants.steps_per_hour
+        num_present = 200
+        any_probability = 1 - (1 - probability) ** num_present
+
+        gaps = []
+        num_travelers = []
+        for i in range(4000):
+            traffic.draw_next_trip_step(rng, num_present, 0, 0)
+            if traffic.next_trip_step != float("inf"):
+                gaps.append(traffic.next_trip_step + 1)
+            num_travelers.append(traffic.draw_num_travelers(rng, num_present, 0))
+        self.assertAlmostEqual(1 / any_probability, np.mean(gaps), delta=0.15 / any_probability)
+        self.assertAlmostEqual(num_present * probability / any_probability, np.mean(num_travelers), delta=0.02)
+        self.assertEqual(int(constants.steps_per_hour), traffic.redraw_step)
+
+        # Nobody on a Floor, or nobody travels in an hour
+        traffic.draw_next_trip_step(rng, 0, 0, 0)
+        self.assertEqual(float("inf"), traffic.next_trip_step)
+        with self.assertRaises(ValueError):
+            RandomTraffic.RandomTraffic([0.5] * 23)
+
+    """
+    Asserts that per-Floor binomial trips start about probability * residents trips per step
+    """
+    def test_handle_state_changes_randomly(self):
+        building = self.build()
+        num_people = sum(simple_floor_populations)
+        num_trips = 0
+        for i in range(200):
+            for floor in building.floors:
+                for person in floor.people_going_up + floor.people_going_down:
+                    floor.add_person(person)
+                floor.people_going_up.clear()
+                floor.people_going_down.clear()
+            Simulation.handle_state_changes_randomly(building, 0.5)
+            num_trips += sum(len(floor.people_going_up) + len(floor.people_going_down) for floor in building.floors)
+        # Trips to the Floor a Person is on don't start
+        expected = 200 * num_people * 0.5 * (1 - 1 / len(building.floors))
+        self.assertAlmostEqual(expected, num_trips, delta=0.1 * expected)
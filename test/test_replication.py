@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+
+from src_imports import Replication
+
+simple_config = {
+    "floor_populations": [0, 3, 3, 3, 3],
+    "dest_floors_by_state_name": {
+        "freetime": [0, 1, 2, 3, 4], # Person can go anywhere during freetime
+        "class": [0], # Must go to ground floor for in person class
+        "sleep": [], # Sleep only happens at person's home floor
+        "meal": [0], # Must go to ground floor to eat out / pickup food
+        "exercise": [1], # Send to second floor
+        "shop": [0], # Must go to ground floor to go to store
+        "chores": [], # Chores only happen at person's home floor
+        "study": [0], # Send to ground floor
+    },
+    "elevator_algorithm": "stay_where_stopped",
+    "elevator_starting_floors": [0, 0],
+    "elevator_capacities": [10, 10],
+    "elevator_steps_per_loads": [2, 2],
+    "elevator_return_to_floors": [0, 2],
+    "engine": "event",
+    "num_days": 1,
+}
+
+class TestReplication(unittest.TestCase):
+    """
+    Replications only depend on their seed, whether they run in this process or in worker processes.
+    """
+    def test_run_replications(self):
+        serial_results = Replication.run_replications(simple_config, 3, base_seed=5, max_workers=1)
+        parallel_results = Replication.run_replications(simple_config, 3, base_seed=5, max_workers=2)
+
+        self.assertEqual(serial_results, parallel_results)
+        self.assertEqual([result["Seed"] for result in serial_results], [5, 6, 7])
+        self.assertNotEqual(serial_results[0], serial_results[1])
+
+    def test_summarize_replications(self):
+        results = [{"Seed": 0, "a": 1.0, "b": 4.0}, {"Seed": 1, "a": 2.0}, {"Seed": 2, "a": 3.0}]
+        summary = Replication.summarize_replications(results)
+
+        self.assertEqual(list(summary.keys()), ["a", "b"])
+        self.assertEqual(summary["a"]["n"], 3)
+        self.assertAlmostEqual(summary["a"]["mean"], 2.0)
+        self.assertAlmostEqual(summary["a"]["std"], 1.0)
+        self.assertAlmostEqual(summary["a"]["ci_low"], 2.0 - 4.303 / np.sqrt(3))
+        self.assertAlmostEqual(summary["a"]["ci_high"], 2.0 + 4.303 / np.sqrt(3))
+
+        # A single value has no spread
+        self.assertEqual(summary["b"], {"mean": 4.0, "std": 0.0, "n": 1, "ci_low": 4.0, "ci_high": 4.0})
+
+    def test_get_t_critical_value(self):
+        self.assertEqual(Replication.get_t_critical_value(1), 12.706)
+        self.assertEqual(Replication.get_t_critical_value(30), 2.042)
+        self.assertEqual(Replication.get_t_critical_value(1000), 1.96)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@ class TestSchedule(unittest.TestCase):
         self.schedules = []
         for i in (range(1000)):
             self.schedules.append(Schedule.generate_schedule())
+        self.batch_schedules = Schedule.generate_schedules(1000)
     
     """
     Asserts that each Schedule has a total number of class hours that falls between min_total_course_hours and max_total_course_hours
@@ -26,6 +27,31 @@ class TestSchedule(unittest.TestCase):
             self.assertGreaterEqual(total_class_hours, constants.min_total_course_hours)
             self.assertLessEqual(total_class_hours, constants.max_total_course_hours)
 
+    """
+    Asserts that batch generated schedules follow the same rules as individually generated ones
+    """
+    def test_generate_schedules(self):
+        self.assertEqual((1000, 7, 24), self.batch_schedules.shape)
+        for schedule in self.batch_schedules:
+            total_class_hours = len(np.where(schedule == 1)[0])
+            self.assertGreaterEqual(total_class_hours, constants.min_total_course_hours)
+            self.assertLessEqual(total_class_hours, constants.max_total_course_hours)
+            self.assertEqual(0, np.sum(schedule[[0, 6]] == 1)) # No classes on weekends
+            for day in range(7):
+                self.assertIn(Schedule.state_id_by_name["sleep"], schedule[day, :15]) # Everybody wakes up by 2pm
+                # Nobody sleeps through their first class of the day
+                class_hours = np.where(schedule[day] == 1)[0]
+                if len(class_hours) != 0:
+                    self.assertNotEqual(Schedule.state_id_by_name["sleep"], schedule[day, class_hours[0] - 1])
+
+    """
+    Asserts that batch generated schedules spend the same share of the week in each state as individually generated ones
+    """
+    def test_generate_schedules_distribution(self):
+        schedules = np.array(self.schedules)
+        for state in Schedule.state_name_by_id.keys():
+            self.assertAlmostEqual(np.mean(schedules == state), np.mean(self.batch_schedules == state), delta=0.01)
+
     # Covered by test_total_course_hours
     def test_schedule_4CR_lectures(self):
         return
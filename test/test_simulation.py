@@ -72,13 +72,15 @@ class TestSimulation(unittest.TestCase):
         day = 0
         home_floor_id = 1
         person = self.building.floors[home_floor_id].people_on_floor[0] # Only person on 2nd floor
-        person.state_change_ids[day][0] = (2, 1) # Set first state change to change from sleep to class
-        person.dest_floors_by_state_name["class"] = [0] # Ensure that the only dest floor for class for this person is 1st floor
+        person.state_changes.ids[person.state_changes.cursors[person.state_change_row, day]] = (2, 1) # Set first state change to change from sleep to class
+        dest_floor_choices = list(person.dest_floor_choices)
+        dest_floor_choices[1] = (0,) # Ensure that the only dest floor for class for this person is 1st floor
+        person.dest_floor_choices = tuple(dest_floor_choices)
         
         # Ensure the test data we just set is properly reflected within the Building
-        self.assertEqual(2, self.building.floors[home_floor_id].people_on_floor[0].state_change_ids[day][0, 0])
-        self.assertEqual(1, self.building.floors[home_floor_id].people_on_floor[0].state_change_ids[day][0, 1])
-        self.assertEqual([0], self.building.floors[home_floor_id].people_on_floor[0].dest_floors_by_state_name["class"])
+        self.assertEqual(2, self.building.floors[home_floor_id].people_on_floor[0].get_state_change_ids(day)[0, 0])
+        self.assertEqual(1, self.building.floors[home_floor_id].people_on_floor[0].get_state_change_ids(day)[0, 1])
+        self.assertEqual((0,), self.building.floors[home_floor_id].people_on_floor[0].dest_floor_choices[1])
 
         Simulation.handle_state_change_scheduled(self.building, day, person) # The function we are testing
         # What should happen: Person needs to travel down to first floor. Person should be removed from people_on_floor and added to people_going_down on the same floor.
@@ -91,8 +93,39 @@ class TestSimulation(unittest.TestCase):
         
         return 
 
-    # Covered by test above
+    """
+    Asserts that handle_state_changes_scheduled uses the Building's state_change_calendar to handle exactly the Persons scheduled at a step.
+    """
     def test_handle_state_changes_scheduled(self):
+        # Every scheduled state change in the Building should appear in the calendar under its day and step
+        for floor in self.building.floors:
+            for person in floor.people_on_floor:
+                for day in range(7):
+                    for step in person.get_state_change_steps(day):
+                        self.assertIn(person, self.building.state_change_calendar[day][step])
+
+        day = 1
+        person = self.building.floors[1].people_on_floor[0]
+        step = person.get_state_change_steps(day)[0]
+        num_state_changes = len(person.get_state_change_steps(day))
+
+        # Nothing is scheduled a step early, so the Person's state change data should be untouched
+        Simulation.handle_state_changes_scheduled(self.building, day, step - 1)
+        self.assertEqual(num_state_changes, len(person.get_state_change_steps(day)))
+
+        # At the scheduled step the state change is consumed
+        Simulation.handle_state_changes_scheduled(self.building, day, step)
+        self.assertEqual(num_state_changes - 1, len(person.get_state_change_steps(day)))
+        self.assertEqual(num_state_changes - 1, len(person.get_state_change_ids(day)))
+
+        # A Person waiting for an Elevator has their state change skipped, but still consumed
+        person = self.building.floors[0].people_on_floor[0]
+        Simulation.state_change_going_up(self.building, 0, person)
+        step = person.get_state_change_steps(day)[0]
+        num_state_changes = len(person.get_state_change_steps(day))
+        Simulation.handle_state_changes_scheduled(self.building, day, step)
+        self.assertEqual(num_state_changes - 1, len(person.get_state_change_steps(day)))
+        self.assertEqual(person, self.building.floors[0].people_going_up[0])
         return
 
     def test_handle_state_changes_randomly(self):
@@ -101,25 +134,13 @@ class TestSimulation(unittest.TestCase):
     """
     increment_counters(building, day):
 
-    Ensures that increment_counters increments the waiting_counters, riding_counters for applicable Persons and increments active_counters, idle_counters for applicable Elevators. 
+    Ensures that increment_counters increments active_counters, idle_counters for applicable Elevators, and leaves Persons alone (their time is recorded as timestamps).
     """
     def test_increment_counters(self):
         day = 0 # increment_counters takes a day argument so it can store different counters for each day of the week
-        person_waiting_floor = 0
-        person_riding_floor = 1
         active_elevator = 0
         idle_elevator = 1
 
-        # Set one person to be waiting for an elevator
-        person = self.building.floors[person_waiting_floor].people_on_floor[0]
-        self.building.floors[person_waiting_floor].people_going_up.append(person)
-        self.building.floors[person_waiting_floor].people_on_floor.remove(person)
-
-        # Set one person to be riding on an elevator
-        person = self.building.floors[person_riding_floor].people_on_floor[0]
-        self.building.elevators[active_elevator].people_by_destination[person_waiting_floor] = [person]
-        self.building.floors[person_riding_floor].people_on_floor.remove(person)
-        
         # Set one elevator to be active
         self.building.elevators[active_elevator].is_active = True
         self.building.elevators[active_elevator].is_idle = False
@@ -129,15 +150,36 @@ class TestSimulation(unittest.TestCase):
 
         Simulation.increment_counters(self.building, day)
 
-        # Check all four counters got incremented where applicable
-        person_waiting = self.building.floors[person_waiting_floor].people_going_up[0]
-        self.assertTrue(([1, 1] == person_waiting.waiting_counters).all())
-
-        person_riding = self.building.elevators[active_elevator].people_by_destination[person_waiting_floor][0]
-        self.assertTrue(([1, 1] == person_riding.riding_counters).all())
-
+        # Check both counters got incremented where applicable
         self.assertTrue(([1, 1] == self.building.elevators[idle_elevator].idle_counters).all())
         self.assertTrue(([1, 1] == self.building.elevators[active_elevator].active_counters).all())
+        self.assertTrue(([0, 0] == self.building.elevators[active_elevator].idle_counters).all())
+        return
+
+    """
+    Ensures that a Person's trip is timestamped when they start waiting, board, and get off, and recorded in the Building's trip_records.
+    """
+    def test_trip_timestamps(self):
+        person = self.building.floors[0].people_on_floor[0]
+        person.dest_floor = 1
+        elevator = self.building.elevators[0]
+
+        self.building.cur_step = 10
+        Simulation.state_change_going_up(self.building, 0, person)
+        self.assertEqual(10, person.wait_start_step)
+
+        self.building.cur_step = 14
+        elevator.cur_floor = 0
+        Simulation.handle_onboard_up(self.building, elevator)
+        self.assertEqual(14, person.board_step)
+
+        self.building.cur_step = 20
+        elevator.cur_floor = 1
+        Simulation.handle_offload(self.building, elevator)
+        self.assertEqual([(person.id, 0, 1, 10, 14, 20)], self.building.trip_records.get_tuples())
+        self.assertEqual(-1, person.wait_start_step)
+        self.assertEqual(-1, person.board_step)
+        self.assertFalse(person.is_traveling)
         return
 
     """
@@ -152,7 +194,7 @@ class TestSimulation(unittest.TestCase):
         self.building.floors_new_up_button.append(0)
         Simulation.handle_new_up_button_presses(self.building)
         
-        self.assertEqual(0, self.building.elevators[0].up_stops[0])
+        self.assertEqual(0, self.building.elevators[0].up_stops.get_next_at_or_above(0))
         return
 
     """
@@ -167,7 +209,7 @@ class TestSimulation(unittest.TestCase):
         self.building.floors_new_down_button.append(1)
         Simulation.handle_new_down_button_presses(self.building)
         
-        self.assertEqual(1, self.building.elevators[1].down_stops[0])
+        self.assertEqual(1, self.building.elevators[1].down_stops.get_next_at_or_above(0))
         return
     """
     handle_new_button_presses(building):
@@ -186,7 +228,7 @@ class TestSimulation(unittest.TestCase):
     """
     handle_onboard(building, elevator):
 
-    Moves people from people_going_up and people_going_down lists to an Elevator's people_by_destination dictionary.
+    Moves people from people_going_up and people_going_down lists to an Elevator's manifest.
     Also updates the Elevator's up_stops or down_stops to include the destinations of the people onboarding.
     """
     def test_handle_onboard(self):
@@ -212,53 +254,178 @@ class TestSimulation(unittest.TestCase):
         Simulation.handle_onboard(self.building, self.building.elevators[0])
         Simulation.handle_onboard(self.building, self.building.elevators[1])
 
-        # 1st floor people_going_up should be empty since Elevator 0 picked them up (moved into Elevator's people_by_destination dictionary)
+        # 1st floor people_going_up should be empty since Elevator 0 picked them up (moved into Elevator's manifest)
         self.assertEqual(0, len(self.building.floors[0].people_going_up))
-        self.assertEqual(person_going_up, self.building.elevators[0].people_by_destination[person_going_up.dest_floor][0])
+        self.assertEqual([person_going_up], self.building.elevators[0].manifest.get_passengers(person_going_up.dest_floor))
         # The Person's destination floor should have been added to Elevator 0's up_stops
         self.assertEqual(1, len(self.building.elevators[0].up_stops))
-        self.assertEqual(person_going_up.dest_floor, self.building.elevators[0].up_stops[0])
+        self.assertEqual(person_going_up.dest_floor, self.building.elevators[0].up_stops.get_next_at_or_above(0))
         # 2nd floor people_going_down should be empty since Elevator 1 picked them up
         self.assertEqual(0, len(self.building.floors[1].people_going_down))
-        self.assertEqual(person_going_down, self.building.elevators[1].people_by_destination[person_going_down.dest_floor][0])
+        self.assertEqual([person_going_down], self.building.elevators[1].manifest.get_passengers(person_going_down.dest_floor))
         # The Person's destination floor should have been added to Elevator 1's down_stops
         self.assertEqual(1, len(self.building.elevators[1].down_stops))
-        self.assertEqual(person_going_down.dest_floor, self.building.elevators[1].down_stops[0])
+        self.assertEqual(person_going_down.dest_floor, self.building.elevators[1].down_stops.get_next_at_or_above(0))
 
 
         return
     
+    """
+    Asserts every waiting Person boards, in the order they started waiting
+    """
+    def test_handle_onboard_first_come_first_served(self):
+        first = self.building.floors[1].people_on_floor[0]
+        second = self.building.floors[0].people_on_floor[0]
+        first.dest_floor = 0
+        second.dest_floor = 0
+        # Both Persons wait on the 2nd floor to go down
+        self.building.floors[1].remove_person(first)
+        self.building.floors[1].people_going_down.append(first)
+        self.building.floors[0].remove_person(second)
+        self.building.floors[1].people_going_down.append(second)
+        self.building.elevators[0].cur_floor = 1
+        self.building.elevators[0].is_moving_up = False
+
+        Simulation.handle_onboard(self.building, self.building.elevators[0])
+        self.assertEqual(0, len(self.building.floors[1].people_going_down))
+        self.assertEqual([first, second], self.building.elevators[0].manifest.get_passengers(0))
+        self.assertEqual(2, self.building.elevators[0].manifest.load)
+
+        # Both get off together
+        self.building.elevators[0].cur_floor = 0
+        Simulation.handle_offload(self.building, self.building.elevators[0])
+        self.assertEqual(0, self.building.elevators[0].manifest.load)
+        self.assertEqual([first, second], self.building.floors[0].people_on_floor)
+
+    """
+    Asserts Persons who don't fit in a full Elevator stay in line with their original wait start step, and their Floor's call is registered again
+    """
+    def test_handle_onboard_capacity(self):
+        first = self.building.floors[1].people_on_floor[0]
+        second = self.building.floors[0].people_on_floor[0]
+        first.dest_floor = 0
+        second.dest_floor = 0
+        self.building.floors[0].remove_person(second)
+        self.building.floors[1].add_person(second)
+        second.cur_floor = 1
+        elevator = self.building.elevators[0]
+        elevator.capacity = 1
+        elevator.cur_floor = 1
+
+        # Both Persons start waiting on the 2nd floor to go down, and the call is assigned to the idle Elevator there
+        self.building.cur_step = 10
+        Simulation.state_change_going_down(self.building, 1, first)
+        self.building.cur_step = 12
+        Simulation.state_change_going_down(self.building, 1, second)
+        Simulation.handle_new_button_presses(self.building)
+        self.assertEqual([], self.building.floors_new_down_button)
+        self.assertEqual([1], list(elevator.down_stops))
+
+        self.building.cur_step = 15
+        Simulation.handle_onboard(self.building, elevator)
+        self.assertEqual([first], elevator.manifest.get_passengers(0))
+        self.assertEqual([second], list(self.building.floors[1].people_going_down))
+        self.assertEqual(12, second.wait_start_step)
+        self.assertEqual(-1, second.board_step)
+        self.assertTrue(self.building.floors[1].is_down_pressed)
+        self.assertEqual([1], self.building.floors_new_down_button)
+
+        # Load counters
+        self.assertEqual(1, elevator.num_left_behind)
+        self.assertEqual(1, elevator.num_departures)
+        self.assertEqual(1, elevator.max_load)
+        self.assertEqual(1.0, elevator.get_load_factor())
+
+        # Once there is room, the Person left behind boards and the button is reset
+        elevator.cur_floor = 0
+        Simulation.handle_offload(self.building, elevator)
+        elevator.cur_floor = 1
+        Simulation.handle_onboard(self.building, elevator)
+        self.assertEqual([second], elevator.manifest.get_passengers(0))
+        self.assertFalse(self.building.floors[1].is_down_pressed)
+        self.assertEqual(1, elevator.num_left_behind)
+        self.assertEqual(2, elevator.num_departures)
+        self.assertEqual(1.0, elevator.get_load_factor())
+
     """
     handle_offload(building, elevator):
 
-    Moves people from an Elevator's people_by_destination dictionary to the Elevator's current Floor's people_on_floor list.
+    Moves people from an Elevator's manifest to the Elevator's current Floor's people_on_floor list.
     """
     def test_handle_offload(self):
         # Person wanting to offload on 1st Floor and Elevator currently on 1st Floor
         person1 = self.building.floors[0].people_on_floor[0]
         self.building.floors[0].people_on_floor.remove(person1)
         self.building.elevators[0].cur_floor = 0
-        self.building.elevators[0].people_by_destination[0] = [person1]
+        person1.dest_floor = 0
+        self.building.elevators[0].manifest.add(person1)
         # Person wanting to offload on 2nd Floor and Elevator currently on 2nd Floor
         person2 = self.building.floors[1].people_on_floor[0]
         self.building.floors[1].people_on_floor.remove(person2)
         self.building.elevators[1].cur_floor = 1
-        self.building.elevators[1].people_by_destination[1] = [person2]
+        person2.dest_floor = 1
+        self.building.elevators[1].manifest.add(person2)
 
         Simulation.handle_offload(self.building, self.building.elevators[0])
         Simulation.handle_offload(self.building, self.building.elevators[1])
-        # Person should have been removed from 1st Floor Elevator's people_by_destination dictionary and added to the 1st Floor's people_on_floor list
-        self.assertEqual(0, len(self.building.elevators[0].people_by_destination[0]))
+        # Person should have been removed from 1st Floor Elevator's manifest and added to the 1st Floor's people_on_floor list
+        self.assertEqual(0, self.building.elevators[0].manifest.load)
         self.assertEqual(person1, self.building.floors[0].people_on_floor[0])
-        # Person should have been removed from 2nd Floor Elevator's people_by_destination dictionary and added to the 2nd Floor's people_on_floor list
-        self.assertEqual(0, len(self.building.elevators[1].people_by_destination[1]))
+        # Person should have been removed from 2nd Floor Elevator's manifest and added to the 2nd Floor's people_on_floor list
+        self.assertEqual(0, self.building.elevators[1].manifest.load)
         self.assertEqual(person2, self.building.floors[1].people_on_floor[0])
         return
 
     def test_update_returning_elevators(self):
         self.assertEqual("not", "implemented")
         return
-    
+
+    """
+    Asserts a returning Elevator that is assigned a stop on the step it reaches its return_to_floor becomes active, and not idle as well
+    """
+    def test_update_returning_elevator_assigned_at_return_to_floor(self):
+        elevator = self.building.elevators[0]
+        elevator.return_to_floor = 0
+        elevator.cur_floor = 0
+        elevator.set_state_returning(is_moving_up=True)
+        elevator.up_stops.add(1)
+
+        Simulation.update_returning_elevators(self.building, [elevator])
+        self.assertTrue(elevator.is_active)
+        self.assertTrue(elevator.is_moving_up)
+        self.assertFalse(elevator.is_idle)
+        self.assertFalse(elevator.is_returning)
+        self.assertEqual(0, elevator.cur_floor)
+
+    """
+    Asserts every Person is delivered under return_to when Elevators are too small to take everyone waiting, and some Persons are left behind
+    """
+    def test_return_to_delivers_left_behind(self):
+        floor_populations = [0] + [3] * 7
+        dest_floors_by_state_name = dict(simple_dest_floors_by_state_name, freetime=list(range(8)))
+        building = Building(floor_populations, dest_floors_by_state_name, "return_to", [0, 0], [2, 2], [2, 2], [4, 4], seed=0)
+
+        # Half of the residents head to the ground floor, the other half head home from it, all at once
+        people = [person for floor in building.floors[1:] for person in floor.people_on_floor]
+        for i, person in enumerate(people):
+            if i % 2 == 0:
+                person.dest_floor = 0
+                Simulation.state_change_going_down(building, person.cur_floor, person)
+            else:
+                building.floors[person.cur_floor].remove_person(person)
+                person.cur_floor = 0
+                person.dest_floor = person.home_floor
+                building.floors[0].add_person(person)
+                Simulation.state_change_going_up(building, 0, person)
+
+        while len(building.trip_records) < len(people) and building.cur_step < 2000:
+            Simulation.handle_new_button_presses(building)
+            Simulation.update_elevators(building)
+            building.cur_step += 1
+        self.assertEqual(len(people), len(building.trip_records))
+        self.assertGreater(sum(elevator.num_left_behind for elevator in building.elevators), 0)
+        self.assertEqual(0, sum(len(floor.people_going_up) + len(floor.people_going_down) for floor in building.floors))
+
     def test_handle_active_elevator_state_change(self):
         self.assertEqual("not", "implemented")
         return
@@ -276,11 +443,11 @@ class TestSimulation(unittest.TestCase):
         up_elevator.is_returning = False
         
         up_elevator.cur_floor = 0
-        up_elevator.up_stops.append(1)
+        up_elevator.up_stops.add(1)
 
         Simulation.update_active_up_elevator(self.building, up_elevator) # This should move the elevator from 1st to 2nd floor (0 to 1 idxs)
         self.assertEqual(1, up_elevator.cur_floor) # Elevator's cur_floor should be the 2nd floor
-        self.assertEqual(1, up_elevator.up_stops[0]) # 2nd floor should still be in up_stops
+        self.assertEqual(1, up_elevator.up_stops.get_next_at_or_above(0)) # 2nd floor should still be in up_stops
 
         Simulation.update_active_up_elevator(self.building, up_elevator) # This should handle and remove 2nd floor from up_stops (register that the Elevator has loading on the Floor)
         self.assertTrue(up_elevator.is_loading)
@@ -304,11 +471,11 @@ class TestSimulation(unittest.TestCase):
         down_elevator.is_moving_up = False
 
         down_elevator.cur_floor = 1
-        down_elevator.down_stops.append(0)
+        down_elevator.down_stops.add(0)
 
         Simulation.update_active_down_elevator(self.building, down_elevator) # This should move the elevator from 2nd to 1st floor (1 to 0 idxs)
         self.assertEqual(0, down_elevator.cur_floor) # Elevator's cur_floor should be the 1st floor
-        self.assertEqual(0, down_elevator.down_stops[0]) # 1st floor should still be in down_stops
+        self.assertEqual(0, down_elevator.down_stops.get_next_at_or_above(0)) # 1st floor should still be in down_stops
 
         Simulation.update_active_down_elevator(self.building, down_elevator) # This should set state of Elevator to loading and handle and remove 1st floor from down_stops
         self.assertTrue(down_elevator.is_loading)
@@ -329,8 +496,8 @@ class TestSimulation(unittest.TestCase):
         up_elevator = self.building.elevators[0]
         down_elevator = self.building.elevators[1]
 
-        up_elevator.up_stops.append(1)
-        down_elevator.down_stops.append(0)
+        up_elevator.up_stops.add(1)
+        down_elevator.down_stops.add(0)
 
         Simulation.update_idle_elevators(self.building, self.building.elevators)
 
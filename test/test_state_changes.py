@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+
+from src_imports import Person
+from src_imports import StateChanges
+
+test_dest_floors_by_state_name = {
+    "freetime": [],
+    "class": [],
+    "sleep": [],
+    "meal": [],
+    "exercise": [],
+    "shop": [],
+    "chores": [],
+    "study": [],
+}
+
+class TestStateChanges(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.people = [Person(id=i, home_floor=i, prob_having_visitors=0, avg_num_visitors=0, building_dest_floors_by_state_name=test_dest_floors_by_state_name) for i in range(5)]
+
+    """
+    Asserts that merging Persons' state change data into one StateChanges keeps every Person's data and handled state changes
+    """
+    def test_concatenate_state_changes(self):
+        expected_steps = [[self.people[i].get_state_change_steps(day).tolist() for day in range(7)] for i in range(5)]
+        expected_ids = [[self.people[i].get_state_change_ids(day).tolist() for day in range(7)] for i in range(5)]
+        self.people[2].pop_state_change(3)
+        expected_steps[2][3] = expected_steps[2][3][1:]
+        expected_ids[2][3] = expected_ids[2][3][1:]
+
+        state_changes = StateChanges.concatenate_state_changes(self.people)
+        StateChanges.bind_state_changes(self.people, state_changes)
+        self.assertEqual(5, state_changes.size)
+        for i in range(5):
+            self.assertIs(state_changes, self.people[i].state_changes)
+            for day in range(7):
+                self.assertEqual(expected_steps[i][day], self.people[i].get_state_change_steps(day).tolist())
+                self.assertEqual(expected_ids[i][day], self.people[i].get_state_change_ids(day).tolist())
+
+        # Already merged Persons are returned as is
+        self.assertIs(state_changes, StateChanges.concatenate_state_changes(self.people))
+
+    """
+    Asserts that handling state changes only moves cursors, and reset_day replays a day
+    """
+    def test_pop_and_reset_day(self):
+        state_changes = StateChanges.concatenate_state_changes(self.people)
+        StateChanges.bind_state_changes(self.people, state_changes)
+        person = self.people[0]
+        day = int(np.argmax(np.diff(state_changes.day_starts[0]))) # Day with the most state changes
+        ids = person.get_state_change_ids(day).tolist()
+
+        for i in range(len(ids)):
+            self.assertEqual(ids[i][1], person.pop_state_change(day))
+        self.assertEqual(0, len(person.get_state_change_steps(day)))
+
+        state_changes.reset_day(day)
+        self.assertEqual(ids, person.get_state_change_ids(day).tolist())
+
+    def test_get_day_state_changes(self):
+        state_changes = StateChanges.concatenate_state_changes(self.people)
+        for day in range(7):
+            rows, steps = state_changes.get_day_state_changes(day)
+            expected_rows = [i for i in range(5) for step in self.people[i].get_state_change_steps(day)]
+            expected_steps = [step for i in range(5) for step in self.people[i].get_state_change_steps(day).tolist()]
+            self.assertEqual(expected_rows, rows.tolist())
+            self.assertEqual(expected_steps, steps.tolist())
+
+    """
+    Asserts that bulk generated state changes hold every change of state (continuing across days) at a step near its hour
+    """
+    def test_generate_state_changes(self):
+        rng = np.random.default_rng(0)
+        schedules = rng.integers(0, 3, size=(4, 7, 24)).astype(np.int8)
+        state_changes = StateChanges.generate_state_changes(schedules, rng)
+        self.assertEqual(4, state_changes.size)
+
+        for row in range(4):
+            states = schedules[row].ravel().tolist()
+            for day in range(7):
+                expected_ids = [[states[day * 24 + hour - 1], states[day * 24 + hour]] for hour in range(24) if day * 24 + hour != 0 and states[day * 24 + hour - 1] != states[day * 24 + hour]]
+                expected_hours = [hour for hour in range(24) if day * 24 + hour != 0 and states[day * 24 + hour - 1] != states[day * 24 + hour]]
+                self.assertEqual(expected_ids, state_changes.get_ids(row, day).tolist())
+                for hour, step in zip(expected_hours, state_changes.get_steps(row, day).tolist()):
+                    if hour == 0:
+                        self.assertTrue(0 <= step < 686)
+                    else:
+                        self.assertTrue(1028 * hour - 343 <= step < 1028 * hour + 343)
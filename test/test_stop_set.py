@@ -0,0 +1,65 @@
+import unittest
+
+from src_imports import StopIndex
+from src_imports import StopSet
+
+class TestStopSet(unittest.TestCase):
+    """
+    Asserts stops can be added, checked, and removed, and iterate in Floor order
+    """
+    def test_add_remove(self):
+        stops = StopSet()
+        for floor_id in [7, 2, 70, 2]:
+            stops.add(floor_id)
+        self.assertEqual(3, len(stops))
+        self.assertEqual([2, 7, 70], list(stops))
+        self.assertIn(70, stops)
+        self.assertNotIn(3, stops)
+        self.assertNotIn(-1, stops)
+        self.assertEqual(2, stops.get_next_at_or_above(0))
+
+        stops.remove(7)
+        self.assertEqual([2, 70], list(stops))
+        self.assertRaises(ValueError, stops.remove, 7)
+        stops.remove(2)
+        stops.remove(70)
+        self.assertEqual(0, len(stops))
+        self.assertFalse(stops)
+
+    """
+    Asserts the nearest stop in each direction is found, including a stop on the given Floor
+    """
+    def test_get_next(self):
+        stops = StopSet()
+        for floor_id in [0, 5, 64, 100]:
+            stops.add(floor_id)
+        self.assertEqual(5, stops.get_next_at_or_above(1))
+        self.assertEqual(5, stops.get_next_at_or_above(5))
+        self.assertEqual(100, stops.get_next_at_or_above(65))
+        self.assertEqual(-1, stops.get_next_at_or_above(101))
+        self.assertEqual(64, stops.get_next_at_or_below(99))
+        self.assertEqual(0, stops.get_next_at_or_below(0))
+        stops.remove(0)
+        self.assertEqual(-1, stops.get_next_at_or_below(4))
+
+    """
+    Asserts a StopIndex records which StopSets have a stop at each Floor
+    """
+    def test_stop_index(self):
+        index = StopIndex(10)
+        car_0_up, car_3_up, car_3_down = StopSet(0, index.up_cars), StopSet(3, index.up_cars), StopSet(3, index.down_cars)
+        car_3_up.add(4)
+        car_0_up.add(4)
+        car_3_down.add(9)
+        self.assertTrue(index.has_stop(4, "up"))
+        self.assertFalse(index.has_stop(4, "down"))
+        self.assertTrue(index.has_stop(9, "down"))
+        self.assertEqual(0b1001, index.up_cars[4])
+
+        car_0_up.remove(4)
+        self.assertTrue(index.has_stop(4, "up"))
+        car_3_up.remove(4)
+        self.assertFalse(index.has_stop(4, "up"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import os, tempfile
+
+from src_imports import Sweep
+
+simple_config = {
+    "floor_populations": [0, 3, 3, 3, 3],
+    "dest_floors_by_state_name": {
+        "freetime": [0, 1, 2, 3, 4], # Person can go anywhere during freetime
+        "class": [0], # Must go to ground floor for in person class
+        "sleep": [], # Sleep only happens at person's home floor
+        "meal": [0], # Must go to ground floor to eat out / pickup food
+        "exercise": [1], # Send to second floor
+        "shop": [0], # Must go to ground floor to go to store
+        "chores": [], # Chores only happen at person's home floor
+        "study": [0], # Send to ground floor
+    },
+    "elevator_algorithm": "stay_where_stopped",
+    "elevator_starting_floors": [0, 0],
+    "elevator_capacities": [10, 10],
+    "elevator_steps_per_loads": [2, 2],
+    "elevator_return_to_floors": [0, 2],
+    "engine": "event",
+    "num_days": 1,
+}
+
+class TestSweep(unittest.TestCase):
+    def test_expand_grid(self):
+        configs = Sweep.expand_grid(simple_config, {
+            "elevator_algorithm": ["stay_where_stopped", "return_to_floor"],
+            ("elevator_starting_floors", "elevator_capacities"): [([0], [10]), ([0, 0], [5, 5])],
+        })
+
+        self.assertEqual(len(configs), 4)
+        self.assertEqual([config["elevator_algorithm"] for config in configs], ["stay_where_stopped", "stay_where_stopped", "return_to_floor", "return_to_floor"])
+        self.assertEqual([config["elevator_capacities"] for config in configs], [[10], [5, 5], [10], [5, 5]])
+        self.assertEqual(configs[1]["elevator_starting_floors"], [0, 0])
+        self.assertEqual(simple_config["elevator_capacities"], [10, 10]) # Base configuration is untouched
+        self.assertEqual(Sweep.get_varied_keys(configs), ["elevator_algorithm", "elevator_starting_floors", "elevator_capacities"])
+
+    def test_get_cache_key(self):
+        reordered_config = dict(reversed(list(simple_config.items())))
+
+        self.assertEqual(Sweep.get_cache_key(simple_config, 0), Sweep.get_cache_key(reordered_config, 0))
+        self.assertNotEqual(Sweep.get_cache_key(simple_config, 0), Sweep.get_cache_key(simple_config, 1))
+        self.assertNotEqual(Sweep.get_cache_key(simple_config, 0), Sweep.get_cache_key(dict(simple_config, elevator_algorithm="return_to_floor"), 0))
+
+        # Keys that don't change results don't change the cache key
+        self.assertEqual(Sweep.get_cache_key(simple_config, 0), Sweep.get_cache_key(dict(simple_config, engine="tick", instrumentation=True, population_cache_dir="cache"), 0))
+
+        # Results cached by older simulation code aren't reused
+        key = Sweep.get_cache_key(simple_config, 0)
+        results_version = Sweep.results_version
+        self.assertEqual(Sweep.results_version, Sweep.get_source_version())
+        try:
+            Sweep.results_version += "0"
+            self.assertNotEqual(key, Sweep.get_cache_key(simple_config, 0))
+        finally:
+            Sweep.results_version = results_version
+
+    """
+    Cached points are loaded instead of simulated, and new points are added to the cache.
+    """
+    def test_run_sweep(self):
+        configs = Sweep.expand_grid(simple_config, {"elevator_algorithm": ["stay_where_stopped", "return_to_floor"]})
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fake_result = {"Avg Hourly Person Wait Time (minutes)": -1.0, "Seed": 0}
+            Sweep.save_cached_result(cache_dir, Sweep.get_cache_key(configs[0], 0), configs[0], 0, fake_result)
+
+            results = Sweep.run_sweep(configs, [0, 1], cache_dir=cache_dir, max_workers=2)
+            self.assertEqual(results[0][0], fake_result)
+            self.assertEqual(results[1][1]["Seed"], 1)
+            self.assertEqual(len(os.listdir(cache_dir)), 4)
+
+            self.assertEqual(Sweep.run_sweep(configs, [0, 1], cache_dir=cache_dir), results)
+
+            rows = Sweep.get_sweep_table(configs, results)
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(list(rows[0].keys())[:2], ["elevator_algorithm", "Avg Hourly Person Wait Time (minutes)"])
+            self.assertEqual(list(rows[0].keys()), list(rows[1].keys()))
+            self.assertEqual(rows[1]["elevator_algorithm"], "return_to_floor")
+
+if __name__ == '__main__':
+    unittest.main()
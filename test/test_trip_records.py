@@ -0,0 +1,71 @@
+import unittest
+import io, contextlib
+import numpy as np
+
+from src_imports import Analytics
+from src_imports import Config
+from src_imports import Engine
+from src_imports import TripRecords
+
+simple_config = dict(Config.HERE_config, floor_populations=[0, 3, 3, 3, 3], dest_floors_by_state_name={
+    "freetime": [0, 1, 2, 3, 4], # Person can go anywhere during freetime
+    "class": [0], # Must go to ground floor for in person class
+    "sleep": [], # Sleep only happens at person's home floor
+    "meal": [0], # Must go to ground floor to eat out / pickup food
+    "exercise": [1], # Send to second floor
+    "shop": [0], # Must go to ground floor to go to store
+    "chores": [], # Chores only happen at person's home floor
+    "study": [0], # Send to ground floor
+}, elevator_starting_floors=[0, 0], elevator_capacities=[10, 10], elevator_steps_per_loads=[2, 2], elevator_return_to_floors=[0, 2])
+
+class TestTripRecords(unittest.TestCase):
+    """
+    Asserts records grow past their initial capacity, and the running totals and percentiles match the records
+    """
+    def test_add(self):
+        trip_records = TripRecords()
+        rng = np.random.default_rng(0)
+        wait_steps = rng.integers(0, 3000, 5000).tolist()
+        for i in range(len(wait_steps)):
+            trip_records.add(i, 0, 1, i, i + wait_steps[i], i + wait_steps[i] + 7)
+
+        self.assertEqual(5000, len(trip_records))
+        self.assertEqual((5000, 6), trip_records.get_records().shape)
+        self.assertEqual((4990, 0, 1, 4990, 4990 + wait_steps[4990], 4997 + wait_steps[4990]), trip_records.get_tuples()[4990])
+        self.assertEqual(10, len(trip_records.get_records(4990)))
+        self.assertEqual(sum(wait_steps), trip_records.wait_steps_sum)
+        self.assertEqual(7 * 5000, trip_records.ride_steps_sum)
+        for q in [0, 50, 95, 99.9, 100]:
+            self.assertEqual(float(np.percentile(wait_steps, q)), trip_records.get_wait_percentile(q))
+
+    """
+    Asserts released records are only dropped without keep_all, and indices still count every finished trip
+    """
+    def test_release(self):
+        for keep_all in [True, False]:
+            trip_records = TripRecords(keep_all)
+            for i in range(10):
+                trip_records.add(i, 0, 1, i, i + 1, i + 2)
+            trip_records.release(4)
+            self.assertEqual(10, len(trip_records))
+            self.assertEqual(list(range(6, 10)), trip_records.get_records(6)[:, 0].tolist())
+            self.assertEqual(10 if keep_all else 6, len(trip_records.get_records()))
+
+    """
+    Asserts a simulation that drops reported records computes the same averages as one that keeps them
+    """
+    def test_keep_trip_records(self):
+        averages = []
+        for keep_trip_records in [True, False]:
+            building = Config.build_building(dict(simple_config, keep_trip_records=keep_trip_records), seed=0)
+            analytics = Analytics()
+            with contextlib.redirect_stdout(io.StringIO()):
+                Engine.run_simulation(building, analytics, num_days=2, engine="event", progress=False)
+                analytics.compute_daily_step_averages(building)
+                analytics.compute_hourly_step_averages(building)
+            averages.append((analytics.get_defining_averages(building), analytics.hourly_avg_person_waiting_steps, analytics.daily_avg_person_riding_steps))
+        self.assertLess(len(building.trip_records.get_records()), len(building.trip_records))
+        self.assertEqual(averages[0], averages[1])
+
+if __name__ == '__main__':
+    unittest.main()